@@ -1,40 +1,128 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, make_response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event, func, inspect, text, update
+from sqlalchemy.exc import IntegrityError
 from flask_cors import CORS
 from datetime import datetime, timedelta
-import math
+from functools import wraps
+import atexit
+import hashlib
+import json
+import os
+import random
+import secrets
 import threading
+import time
 # Otomata sistemi için import ekleyelim
 from automata.automata_loader import AutomataLoader
 from automata.engine import AutomataEngine
+from automata.history import HistorySpillWriter
+from automata.reloader import AutomataReloader
 from automata.conditions import register_condition_handlers
 from automata.actions import register_action_handlers
-
-app = Flask(__name__)
+from services.row_reader import RowReader
+from services.vehicle_catalog import VehicleCatalog, VEHICLE_CATALOG_FIELDS
+from services.station_counters import StationStatusCounters
+from services.station_status_cache import StationStatusCache, MISSING
+from services.idempotency import (IdempotencyStore, StoredResponse, PENDING_STATUS,
+                                  CLAIMED, IN_PROGRESS, MISMATCH)
+from services.auth_service import AuthService, AuthServiceBusy, SessionTokens
+from services.geo import decode_polyline, simple_distance
+from services.energy import VehicleEfficiencyModel, calculate_charge_time, calculate_range, is_station_reachable
+from services.station_arrays import StationArrays, to_epoch
+from services.scoring import KERNELS, ScoringPool
+from services.station_grid import StationGrid
+from services.trip_planner import TripPlanner
+from services.station_distances import StationDistanceStore
+from services.isochrones import IsochroneCache
+from services.station_clusters import StationClusterIndex
+from services.station_snapshot import SnapshotStore
+from services.compression import compress_body, compress_stream, negotiate_encoding
+from services.json_stream import iter_json_array
+
+# Veritabanı ve önbellek dosyaları instance klasöründedir; testler geçici bir klasör verir
+app = Flask(__name__, instance_path=os.environ.get('VOLTRIX_INSTANCE_PATH'))
 CORS(app)
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# İşçi süreçleri arasında paylaşılan istasyon durum önbelleği
+app.config['STATION_STATUS_CACHE_PATH'] = os.path.join(app.instance_path, 'station_status.cache')
+app.config['STATION_STATUS_CACHE_CAPACITY'] = 65536
+# Önbellek her süreçte ilk kullanımda ve bu aralıkla (saniye) veritabanıyla uzlaştırılır
+app.config['STATION_STATUS_RECONCILE_INTERVAL'] = 60
+# İstasyon başına en yakın k komşunun önceden hesaplandığı paylaşımlı mesafe deposu
+app.config['STATION_DISTANCE_PATH'] = os.path.join(app.instance_path, 'station_distances.cache')
+app.config['STATION_DISTANCE_K'] = 16
+# Oturum jetonlarının imza anahtarı: birden fazla işçi süreci varsa ortam değişkeniyle ortak verilmeli
+app.config['SECRET_KEY'] = os.environ.get('VOLTRIX_SECRET_KEY') or secrets.token_hex(32)
+app.config['SESSION_TOKEN_MAX_AGE'] = 900  # saniye
+# Parola özetleme maliyeti (ör. 'scrypt:32768:8:1' veya 'pbkdf2:sha256:600000')
+app.config['PASSWORD_HASH_METHOD'] = os.environ.get('VOLTRIX_PASSWORD_HASH_METHOD', 'scrypt')
+app.config['AUTH_WORKERS'] = 4
+app.config['AUTH_QUEUE_SIZE'] = 64
+# Öneri puanlaması: 'inline' (istek iş parçacığında) veya 'process' (süreç havuzunda)
+app.config['SCORING_BACKEND'] = os.environ.get('VOLTRIX_SCORING_BACKEND', 'inline')
+app.config['SCORING_PROCESSES'] = 2
+app.config['SCORING_POOL_MIN_STATIONS'] = 2000  # Daha az istasyonda havuz maliyetine değmez
+# Rota koridoru araması: ızgara hücre boyutu (derece, ~11 km) ve izin verilen en geniş koridor
+app.config['STATION_GRID_CELL_DEG'] = 0.1
+app.config['ROUTE_MAX_BUFFER_KM'] = 50
+# Yolculuk planlayıcı: SOC adımı, hiç altına inilmeyecek SOC, durakta en fazla şarj ve durak başına sabit süre
+app.config['TRIP_SOC_STEP'] = 10
+app.config['TRIP_RESERVE_SOC'] = 10
+app.config['TRIP_MAX_CHARGE_SOC'] = 80
+app.config['TRIP_STOP_OVERHEAD_MIN'] = 5
+# Erişilebilirlik izokronları: (araç modeli, SOC aralığı, hücre) başına LRU önbellek
+app.config['ISOCHRONE_CACHE_SIZE'] = 1024
+app.config['ISOCHRONE_SOC_BUCKET'] = 5  # yüzde
+# Harita kümeleri: en yüksek kümeleme zoom seviyesi ve küme hücresinin ekrandaki boyutu (piksel)
+app.config['STATION_CLUSTER_MAX_ZOOM'] = 16
+app.config['STATION_CLUSTER_CELL_PX'] = 64
+# Mobil çevrimdışı önbellek: yama üretilebilecek eski anlık görüntü sayısı
+app.config['STATION_SNAPSHOT_HISTORY'] = 8
+# Yanıt sıkıştırma (gzip/deflate): bu boyutun altındaki gövdeler sıkıştırılmaz; akışlı yanıtlar her zaman sıkıştırılır
+app.config['COMPRESSION_MIN_BYTES'] = 1024
+app.config['COMPRESSION_LEVEL'] = 6
+app.config['COMPRESSION_MIMETYPES'] = ('application/json', 'application/octet-stream', 'text/plain', 'text/html')
+# Otomata geçmişi: motor başına bellekte tutulan geçiş sayısı ve taşan geçişlerin (isteğe bağlı) gzip günlüğü
+app.config['AUTOMATA_HISTORY_SIZE'] = 256
+app.config['AUTOMATA_HISTORY_LOG'] = os.environ.get('VOLTRIX_AUTOMATA_HISTORY_LOG')
+# Ayrıştırılmış otomata tanımlarının önbelleği (XML yalnızca değiştiğinde yeniden ayrıştırılır)
+app.config['AUTOMATA_CACHE_PATH'] = os.path.join(app.instance_path, 'automata_definitions.cache')
+# Otomata XML dosyaları bu aralıkla (saniye) denetlenir ve değişince yeniden yüklenir; 0 izlemeyi kapatır
+app.config['AUTOMATA_WATCH_INTERVAL'] = float(os.environ.get('VOLTRIX_AUTOMATA_WATCH_INTERVAL', '2'))
 db = SQLAlchemy(app)
 
 # Otomata sistemini yükle
-automata_loader = AutomataLoader()
+automata_loader = AutomataLoader(cache_path=app.config['AUTOMATA_CACHE_PATH'], minimize=True)
 # Sadece gerekli olan otomataları yükleyelim
-automata_definitions = automata_loader.load_automatas([
+AUTOMATA_XML_PATHS = [
     "automata/dfa/smart_suggestion_dfa.xml",
     "automata/dfa/charge_station_dfa.xml"
-])
+]
+automata_definitions = automata_loader.load_automatas(AUTOMATA_XML_PATHS)
 
 # Otomata motorlarını oluştur
+automata_history_spill = None
+if app.config['AUTOMATA_HISTORY_LOG']:
+    automata_history_spill = HistorySpillWriter(app.config['AUTOMATA_HISTORY_LOG'])
+    atexit.register(automata_history_spill.close)  # Bekleyen geçişler çıkışta yazılır
+
 automatas = {}
 for automata_id, automata_def in automata_definitions.items():
     try:
-        engine = AutomataEngine(automata_def)
+        engine = AutomataEngine(automata_def, history_size=app.config['AUTOMATA_HISTORY_SIZE'],
+                                history_spill=automata_history_spill)
         automatas[automata_id] = engine
         print(f"✅ {automata_id} otomatası başarıyla başlatıldı")
     except Exception as e:
         print(f"❌ {automata_id} otomatası oluşturulurken hata: {str(e)}")
 
+# Değişen XML tanımları arka planda doğrulanıp motorlara atomik olarak uygulanır
+automata_reloader = AutomataReloader(automata_loader, automatas, AUTOMATA_XML_PATHS)
+if app.config['AUTOMATA_WATCH_INTERVAL'] > 0:
+    automata_reloader.start(app.config['AUTOMATA_WATCH_INTERVAL'])
+
 # Desteklenen istasyon durumları
 VALID_STATUSES = ['available', 'occupied', 'reserved', 'unavailable', 'faulted']
 
@@ -66,6 +154,7 @@ class ChargingStation(db.Model):
     model = db.Column(db.String(100), nullable=True)
     vendor = db.Column(db.String(100), nullable=True)
     max_power_kW = db.Column(db.Float, nullable=True)  # ✅ Yeni eklenen alan
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # İyimser eşzamanlılık sürümü
 
 class UserVehicle(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -90,15 +179,437 @@ class Reservation(db.Model):
     start_time = db.Column(db.DateTime, default=datetime.utcnow)
     expected_end_time = db.Column(db.DateTime, nullable=False)
 
+# Tekrarlanan POST isteklerinin yanıtları (Idempotency-Key); status_code=0 sahiplenilmiş, yanıtı henüz yok
+class IdempotencyRecord(db.Model):
+    key = db.Column(db.String(300), primary_key=True)
+    status_code = db.Column(db.Integer, nullable=False)
+    body = db.Column(db.LargeBinary, nullable=False)
+    mimetype = db.Column(db.String(100), nullable=False)
+    expires_at = db.Column(db.Float, nullable=False)  # Unix zaman damgası
+    request_hash = db.Column(db.String(64), nullable=False, default='', server_default='')  # Kullanıcı + gövde özeti
+
+# Liste endpoint'leri için ORM'siz okuyucular (yalnızca gereken kolonlar)
+VEHICLE_LIST_FIELDS = ("id", "brand", "model", "year", "battery_capacity_kWh",
+                       "charge_power_kW", "latitude", "longitude")
+STATION_LIST_FIELDS = ("id", "name", "latitude", "longitude", "status", "brand", "model", "vendor")
+
+vehicle_reader = RowReader(Vehicle, VEHICLE_LIST_FIELDS)
+station_reader = RowReader(ChargingStation, STATION_LIST_FIELDS)
+user_vehicle_reader = RowReader(UserVehicle, VEHICLE_LIST_FIELDS)
+
+# Durum bazında istasyon sayaçları (dashboard özeti için)
+station_counters = StationStatusCounters(reconcile_interval=60)
+
+# Durum yazmaları hem veritabanına hem bu paylaşımlı önbelleğe gider
+station_status_cache = StationStatusCache(app.config['STATION_STATUS_CACHE_PATH'],
+                                          capacity=app.config['STATION_STATUS_CACHE_CAPACITY'],
+                                          reconcile_interval=app.config['STATION_STATUS_RECONCILE_INTERVAL'])
+
+# Araç kataloğu: ilk erişimde yüklenir, Vehicle tablosu değişince sürümü artırılır.
+# Sürüm, durum önbelleği başlığındaki paylaşımlı sayaçtadır; tüm işçiler değişikliği görür.
+VEHICLE_CATALOG_COUNTER = 0
+vehicle_catalog_reader = RowReader(Vehicle, VEHICLE_CATALOG_FIELDS)
+vehicle_catalog = VehicleCatalog(
+    lambda: vehicle_catalog_reader.rows(db.session),
+    version_source=lambda: station_status_cache.counter(VEHICLE_CATALOG_COUNTER),
+    version_bump=lambda: station_status_cache.bump_counter(VEHICLE_CATALOG_COUNTER)
+)
+
+# İstasyonlar arası komşu mesafeleri: işçiler dosyayı salt okunur eşler, ekleme/silmede artımlı güncellenir
+station_distances = StationDistanceStore(app.config['STATION_DISTANCE_PATH'],
+                                         capacity=app.config['STATION_STATUS_CACHE_CAPACITY'],
+                                         k=app.config['STATION_DISTANCE_K'])
+
+def set_station_status(station, new_status):
+    """İstasyon durumunu değiştirir; değişiklik commit sonrası sayaçlara işlenir"""
+    old_status = station.status
+    station.status = new_status
+    station.version = (station.version or 0) + 1
+    db.session.info.setdefault('station_status_changes', []).append((station.id, old_status, new_status))
+
+def apply_station_status_change(station_id, old_status, new_status):
+    """Kaydedilmiş bir istasyon durum değişikliğini bellek içi yapılara yansıtır"""
+    station_counters.apply(old_status, new_status)
+    station_status_cache.set(station_id, new_status)
+
+# Koşullu durum güncellemesinde yarış kaybedilirse en fazla bu kadar yeniden denenir
+STATION_CAS_MAX_RETRIES = 5
+
+def compare_and_set_station_status(station_id, expected_status, new_status):
+    """
+    İstasyon durumunu yalnızca beklenen durumdaysa değiştirir (compare-and-swap).
+
+    Sürüm kolonu üzerinden koşullu UPDATE yapılır; başka bir istek araya
+    girip sürümü değiştirdiyse durum yeniden okunur ve sınırlı sayıda
+    tekrar denenir.
+
+    Returns:
+        'ok' (güncellendi), 'missing' (istasyon yok) veya 'conflict' (durum uygun değil)
+    """
+    for attempt in range(STATION_CAS_MAX_RETRIES):
+        row = db.session.query(ChargingStation.status, ChargingStation.version).filter_by(id=station_id).first()
+        if row is None:
+            return 'missing'
+
+        status, version = row
+        if status != expected_status:
+            return 'conflict'
+
+        result = db.session.execute(
+            update(ChargingStation)
+            .where(ChargingStation.id == station_id, ChargingStation.version == version)
+            .values(status=new_status, version=version + 1)
+        )
+        if result.rowcount == 1:
+            db.session.info.setdefault('station_status_changes', []).append((station_id, status, new_status))
+            return 'ok'
+
+        # Yarış kaybedildi: kısa ve rastgele bir beklemeden sonra tekrar dene
+        time.sleep(random.uniform(0, 0.005 * (attempt + 1)))
+
+    return 'conflict'
+
+@event.listens_for(db.session, 'after_commit')
+def _apply_committed_station_changes(session):
+    for change in session.info.pop('station_status_changes', ()):
+        apply_station_status_change(*change)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_station_changes(session):
+    session.info.pop('station_status_changes', None)
+
+def reconcile_station_counters():
+    """Sayaçları veritabanındaki gerçek durum sayılarıyla eşitler"""
+    rows = db.session.query(ChargingStation.status, func.count(ChargingStation.id)).group_by(ChargingStation.status).all()
+    station_counters.reconcile(rows)
+
+def reconcile_station_status_cache():
+    """Paylaşımlı durum önbelleğini veritabanıyla uzlaştırır (uygulama dışı değişiklikler dahil)"""
+    version = station_status_cache.version
+    # Parmak izi, istasyon dizilerine giren tüm kolonları kapsar
+    rows = db.session.query(
+        ChargingStation.id, ChargingStation.status, ChargingStation.name,
+        ChargingStation.latitude, ChargingStation.longitude, ChargingStation.max_power_kW
+    ).order_by(ChargingStation.id).all()
+    station_status_cache.reconcile(((row[0], row[1]) for row in rows), version,
+                                   fingerprint=StationStatusCache.fingerprint(rows))
+    # Kurulu mesafe deposu da aynı satırlarla denetlenir (uygulama dışında eklenen/silinen istasyonlar)
+    if station_distances.is_built():
+        station_distances.sync((row[0], row[3], row[4]) for row in rows)
+
+def sync_station_distances():
+    """Mesafe deposunu veritabanındaki istasyonlarla karşılaştırır; kurulmamışsa veya farklıysa yeniden kurar"""
+    rows = db.session.query(ChargingStation.id, ChargingStation.latitude, ChargingStation.longitude).all()
+    station_distances.sync(rows)
+
+def get_station_status(station_id):
+    """İstasyon durumunu paylaşımlı önbellekten okur; istasyon yoksa None döner"""
+    try:
+        station_id = int(station_id)
+    except (TypeError, ValueError):
+        return None
+
+    if station_status_cache.needs_reconcile():
+        reconcile_station_status_cache()
+
+    status = station_status_cache.get(station_id)
+    if status is MISSING:
+        return None
+    if status is None:
+        # Önbellekte olmayan (kapasite dışı vb.) istasyonlar için veritabanına bak
+        status = db.session.query(ChargingStation.status).filter_by(id=station_id).scalar()
+    return status
+
+def _load_idempotent_response(key):
+    record = IdempotencyRecord.query.get(key)
+    if record is None:
+        return None
+    return StoredResponse(record.status_code, record.body, record.mimetype, record.expires_at, record.request_hash)
+
+def _save_idempotent_response(key, stored):
+    db.session.merge(IdempotencyRecord(
+        key=key,
+        status_code=stored.status_code,
+        body=stored.body,
+        mimetype=stored.mimetype,
+        expires_at=stored.expires_at,
+        request_hash=stored.request_hash
+    ))
+    db.session.commit()
+
+def _claim_idempotency_key(key, pending):
+    """Anahtarı bekleyen bir kayıt ekleyerek sahiplenir; birincil anahtar çakışırsa başka bir işçi almıştır"""
+    # Süresi dolmuş kayıt (ör. çöken bir işçinin yarım kalan sahiplenmesi) anahtarı bırakır
+    IdempotencyRecord.query.filter(IdempotencyRecord.key == key,
+                                   IdempotencyRecord.expires_at <= time.time()).delete()
+    db.session.add(IdempotencyRecord(
+        key=key,
+        status_code=pending.status_code,
+        body=pending.body,
+        mimetype=pending.mimetype,
+        expires_at=pending.expires_at,
+        request_hash=pending.request_hash
+    ))
+    try:
+        db.session.commit()
+        return True
+    except IntegrityError:
+        db.session.rollback()
+        return False
+
+def _release_idempotency_key(key):
+    # Görünüm hata verdiyse oturum geri alınmamış olabilir
+    db.session.rollback()
+    IdempotencyRecord.query.filter_by(key=key, status_code=PENDING_STATUS).delete()
+    db.session.commit()
+
+# Bellekte sınırlı sayıda anahtar tutulur, bulunamayanlar veritabanından okunur.
+# Anahtar işten önce veritabanında sahiplenilir; farklı işçilere düşen tekrarlar işi iki kez yapmaz.
+idempotency_store = IdempotencyStore(
+    max_entries=10000,
+    ttl_seconds=24 * 3600,
+    load_fallback=_load_idempotent_response,
+    save_fallback=_save_idempotent_response,
+    claim_fallback=_claim_idempotency_key,
+    release_fallback=_release_idempotency_key,
+    lease_seconds=60
+)
+
+def _request_fingerprint():
+    """İsteği yapan kullanıcı ve istek gövdesinin özeti (JSON anahtar sırası ve boşluklardan bağımsız)"""
+    data = request.get_json(silent=True)
+    body = json.dumps(data, sort_keys=True, separators=(",", ":")).encode() if data is not None else request.get_data()
+    digest = hashlib.sha256(f"{current_user_id()}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+def idempotent(scope):
+    """Idempotency-Key başlıklı isteklerde ilk yanıtı saklar, tekrarlarda işi yapmadan onu döndürür"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.headers.get('Idempotency-Key')
+            if not key:
+                return view(*args, **kwargs)
+            if len(key) > 255:
+                return jsonify({"error": "Idempotency-Key en fazla 255 karakter olabilir."}), 400
+
+            store_key = f"{scope}:{key}"
+            request_hash = _request_fingerprint()
+            outcome, stored = idempotency_store.claim(store_key, request_hash)
+            if outcome == MISMATCH:
+                return jsonify({"error": "Idempotency-Key farklı bir istekle kullanılmış."}), 422
+            if outcome == IN_PROGRESS:
+                return jsonify({"error": "Aynı Idempotency-Key ile bir istek hâlâ işleniyor."}), 409
+            if outcome == CLAIMED:
+                try:
+                    response = app.make_response(view(*args, **kwargs))
+                except Exception:
+                    idempotency_store.release(store_key)
+                    raise
+                # Sunucu hataları saklanmaz, istemci yeniden deneyebilir
+                if response.status_code < 500:
+                    idempotency_store.put(store_key, response.status_code, response.get_data(),
+                                          response.mimetype, request_hash)
+                else:
+                    idempotency_store.release(store_key)
+                return response
+
+            replay = app.response_class(stored.body, status=stored.status_code, mimetype=stored.mimetype)
+            replay.headers['Idempotent-Replayed'] = 'true'
+            return replay
+        return wrapper
+    return decorator
+
+# Parola özetleme istek iş parçacığında değil, sınırlı kuyruklu havuzda çalışır
+auth_service = AuthService(
+    max_workers=app.config['AUTH_WORKERS'],
+    max_queue=app.config['AUTH_QUEUE_SIZE'],
+    hash_method=app.config['PASSWORD_HASH_METHOD']
+)
+session_tokens = SessionTokens(app.config['SECRET_KEY'], max_age=app.config['SESSION_TOKEN_MAX_AGE'])
+
+def _auth_busy_response():
+    response = jsonify({"error": "Sunucu yoğun, lütfen tekrar deneyin."})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+def current_user_id():
+    """Authorization: Bearer başlığındaki oturum jetonundan kullanıcı ID'sini döndürür"""
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        return None
+    return session_tokens.verify(header[len('Bearer '):].strip())
+
+def resolve_user_id(supplied_user_id=None):
+    """
+    İsteği yapan kullanıcının ID'sini belirler.
+
+    Oturum jetonu gönderildiyse kullanıcı jetondan okunur, parola yeniden
+    doğrulanmaz; gövdede veya sorguda farklı bir user_id verilmişse istek
+    reddedilir. Jeton yoksa verilen user_id olduğu gibi kullanılır.
+
+    Returns:
+        (user_id, hata yanıtı): hata yoksa ikinci eleman None
+    """
+    if not request.headers.get('Authorization', '').startswith('Bearer '):
+        return supplied_user_id, None
+    user_id = current_user_id()
+    if user_id is None:
+        return None, (jsonify({"error": "Oturum jetonu geçersiz veya süresi dolmuş."}), 401)
+    if supplied_user_id not in (None, '') and str(supplied_user_id) != str(user_id):
+        return None, (jsonify({"error": "user_id oturum jetonundaki kullanıcıyla eşleşmiyor."}), 403)
+    return user_id, None
+
+def check_owner(owner_id):
+    """Oturum jetonu varsa kaydın jetondaki kullanıcıya ait olduğunu denetler; değilse hata yanıtı döndürür"""
+    user_id, error = resolve_user_id()
+    if error is not None:
+        return error
+    if user_id is not None and owner_id != user_id:
+        return jsonify({"error": "Bu kayıt üzerinde yetkiniz yok."}), 403
+    return None
+
+# Puanlama için kolon bazlı istasyon dizileri; durum önbelleğinin sürümü değişince yeniden oluşturulur
+STATION_ARRAY_FIELDS = ("id", "name", "latitude", "longitude", "status", "max_power_kW")
+station_array_reader = RowReader(ChargingStation, STATION_ARRAY_FIELDS)
+_station_arrays = None
+_station_arrays_lock = threading.Lock()
+
+def get_station_arrays():
+    """Güncel istasyon dizilerini döndürür (gerekirse veritabanından oluşturur)"""
+    global _station_arrays
+    if station_status_cache.needs_reconcile():
+        reconcile_station_status_cache()
+    version = station_status_cache.version
+    arrays = _station_arrays
+    if arrays is not None and arrays.version == version:
+        return arrays
+
+    with _station_arrays_lock:
+        arrays = _station_arrays
+        if arrays is not None and arrays.version == version:
+            return arrays
+        rows = station_array_reader.rows(db.session, order_by=ChargingStation.id)
+        # Her istasyonun en geç biten aktif rezervasyonu (tek sorgu)
+        reservation_ends = dict(
+            db.session.query(Reservation.station_id, func.max(Reservation.expected_end_time))
+            .filter(Reservation.expected_end_time > datetime.utcnow())
+            .group_by(Reservation.station_id)
+            .all()
+        )
+        arrays = StationArrays.from_rows(version, rows, reservation_ends)
+        _station_arrays = arrays
+        return arrays
+
+_station_grid = None
+
+def get_station_grid(arrays):
+    """
+    İstasyon dizileri için uzamsal ızgarayı döndürür.
+
+    Izgara yalnızca istasyon eklenince, taşınınca veya silinince yeniden kurulur;
+    durum değişiklikleri ızgarayı (ve izokron önbelleğini) geçersiz kılmaz.
+    """
+    global _station_grid
+    grid = _station_grid
+    if grid is None or grid.version != arrays.positions_key:
+        grid = StationGrid(arrays.latitudes, arrays.longitudes,
+                           cell_deg=app.config['STATION_GRID_CELL_DEG'], version=arrays.positions_key)
+        _station_grid = grid
+    return grid
+
+_isochrone_cache = None
+
+def get_isochrone_cache(arrays):
+    """İstasyon ızgarası için izokron önbelleğini döndürür (ızgara değişince boşaltılır)"""
+    global _isochrone_cache
+    grid = get_station_grid(arrays)
+    cache = _isochrone_cache
+    if cache is None or cache.grid is not grid:
+        cache = IsochroneCache(grid, arrays.ids,
+                               max_entries=app.config['ISOCHRONE_CACHE_SIZE'],
+                               soc_bucket=app.config['ISOCHRONE_SOC_BUCKET'])
+        _isochrone_cache = cache
+    return cache
+
+# Zoom seviyelerine göre hiyerarşik istasyon kümeleri
+station_clusters = StationClusterIndex(max_zoom=app.config['STATION_CLUSTER_MAX_ZOOM'],
+                                       cell_px=app.config['STATION_CLUSTER_CELL_PX'])
+
+def get_station_clusters():
+    """Küme indeksini güncel istasyon dizileriyle eşitleyip döndürür (yalnızca değişen istasyonlar güncellenir)"""
+    arrays = get_station_arrays()
+    station_clusters.sync(arrays.version, arrays.ids, arrays.latitudes, arrays.longitudes, arrays.statuses)
+    return station_clusters
+
+def _dumps_compact(value):
+    # jsonify ile aynı çıktı (sıralı anahtarlar, sıkışık ayırıcılar)
+    return app.json.dumps(value, separators=(",", ":"))
+
+def json_array_response(items):
+    """Elemanları kodlandıkça gönderen akışlı JSON dizisi yanıtı oluşturur"""
+    return Response(stream_with_context(iter_json_array(items, dumps=_dumps_compact)),
+                    mimetype='application/json')
+
+@app.after_request
+def compress_response(response):
+    """İstemci destekliyorsa yanıtı gzip/deflate ile sıkıştırır"""
+    if (request.method == 'HEAD' or not 200 <= response.status_code < 300 or response.status_code == 204
+            or 'Content-Encoding' in response.headers or response.direct_passthrough
+            or response.mimetype not in app.config['COMPRESSION_MIMETYPES']):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    level = app.config['COMPRESSION_LEVEL']
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < app.config['COMPRESSION_MIN_BYTES']:
+            return response
+        response.set_data(compress_body(body, encoding, level))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+# Mobil uygulama için ikili istasyon anlık görüntüleri ve yamaları
+station_snapshots = SnapshotStore(history=app.config['STATION_SNAPSHOT_HISTORY'])
+
+# Araç modeline göre verim (km/kWh)
+efficiency_model = VehicleEfficiencyModel()
+
+scoring_pool = None
+if app.config['SCORING_BACKEND'] == 'process':
+    scoring_pool = ScoringPool(processes=app.config['SCORING_PROCESSES'])
+    atexit.register(scoring_pool.shutdown)  # Paylaşılan bellek blokları çıkışta silinir
+
+def score_stations(kind, arrays, **params):
+    """Puanlama çekirdeğini (yapılandırmaya göre) süreç havuzunda veya satır içinde çalıştırır"""
+    if scoring_pool is not None and len(arrays) >= app.config['SCORING_POOL_MIN_STATIONS']:
+        try:
+            return scoring_pool.rank(arrays, kind, params)
+        except Exception as e:
+            print(f"⚠️ Puanlama havuzu kullanılamadı, satır içi puanlanıyor: {str(e)}")
+    return KERNELS[kind](arrays, **params)
+
 @app.route('/register', methods=['POST'])
 def register():
     data = request.get_json()
     if User.query.filter_by(email=data['email']).first():
         return jsonify({"error": "Email zaten kayıtlı"}), 400
+    try:
+        password_hash = auth_service.hash_password(data['password'])
+    except AuthServiceBusy:
+        return _auth_busy_response()
     user = User(
         name=data['name'],
         email=data['email'],
-        password_hash=generate_password_hash(data['password'])
+        password_hash=password_hash
     )
     db.session.add(user)
     db.session.commit()
@@ -106,51 +617,32 @@ def register():
 
 @app.route('/login', methods=['POST'])
 def login():
+    # Giriş her zaman email ve parolayla yapılır; dönen jeton diğer endpoint'lerde kullanılır
     data = request.get_json()
     user = User.query.filter_by(email=data['email']).first()
-    if user and check_password_hash(user.password_hash, data['password']):
-        return jsonify({"message": "Giriş başarılı", "user_id": user.id}), 200
+    try:
+        verified = user is not None and auth_service.verify_password(user.password_hash, data['password'])
+    except AuthServiceBusy:
+        return _auth_busy_response()
+    if verified:
+        return jsonify({
+            "message": "Giriş başarılı",
+            "user_id": user.id,
+            "token": session_tokens.issue(user.id),
+            "expires_in": session_tokens.max_age
+        }), 200
     return jsonify({"error": "Geçersiz email ya da şifre"}), 401
 
 # Tüm araçları listeleme endpoint'i
 @app.route('/vehicles', methods=['GET'])
 def get_vehicles():
-    vehicles = Vehicle.query.all()
-    vehicles_list = []
-
-    for v in vehicles:
-        vehicles_list.append({
-            "id": v.id,
-            "brand": v.brand,
-            "model": v.model,
-            "year": v.year,
-            "battery_capacity_kWh": v.battery_capacity_kWh,
-            "charge_power_kW": v.charge_power_kW,
-            "latitude": v.latitude,    # ✅ yeni eklendi
-            "longitude": v.longitude   # ✅ yeni eklendi
-        })
-
-    return jsonify(vehicles_list), 200
+    # Katalog kayıtlarının ilk kolonları VEHICLE_LIST_FIELDS ile aynı sıradadır
+    return json_array_response(map(vehicle_reader.serialize, vehicle_catalog.all()))
 
 # Şarj istasyonlarını listeleme endpoint'i
 @app.route('/stations', methods=['GET'])
 def get_stations():
-    stations = ChargingStation.query.all()
-    station_list = []
-
-    for station in stations:
-        station_list.append({
-            "id": station.id,
-            "name": station.name,
-            "latitude": station.latitude,
-            "longitude": station.longitude,
-            "status": station.status,  # ✅ Durumu da döndürüyoruz
-            "brand": station.brand,
-            "model": station.model,
-            "vendor": station.vendor
-        })
-
-    return jsonify(station_list), 200
+    return json_array_response(station_reader.iter_fetch(db.session))
 
 # Quick Action endpoint'i (güncellenmiş ve temizlenmiş hali)
 @app.route('/quick_action', methods=['POST'])
@@ -162,7 +654,7 @@ def quick_action():
     if vehicle_id is None:
         return jsonify({"error": "vehicle_id gerekli"}), 400
 
-    vehicle = Vehicle.query.get(vehicle_id)
+    vehicle = vehicle_catalog.get(vehicle_id)
     if not vehicle:
         return jsonify({"error": "Araç bulunamadı"}), 404
 
@@ -198,14 +690,21 @@ def quick_action():
     }), 200
 
 @app.route('/user-vehicles', methods=['POST'])
+@idempotent('user-vehicles')
 def add_user_vehicle():
     data = request.get_json()
 
     vehicle_id = data.get('vehicle_id')
 
+    user_id, error = resolve_user_id(data.get('user_id'))
+    if error is not None:
+        return error
+    if user_id is None:
+        return jsonify({"error": "user_id gerekli."}), 400
+
     # Aynı marka + model + yıl var mı kontrol et
     existing_vehicle = UserVehicle.query.filter_by(
-        user_id=data['user_id'],
+        user_id=user_id,
         brand=data['brand'],
         model=data['model'],
         year=data['year']
@@ -215,7 +714,7 @@ def add_user_vehicle():
         return jsonify({"error": "This vehicle already exists in your list."}), 400
 
     new_vehicle = UserVehicle(
-        user_id=data['user_id'],
+        user_id=user_id,
         vehicle_id=vehicle_id,
         brand=data['brand'],
         model=data['model'],
@@ -232,25 +731,14 @@ def add_user_vehicle():
 
 @app.route('/user-vehicles', methods=['GET'])
 def get_user_vehicles():
-    user_id = request.args.get('user_id')
+    user_id, error = resolve_user_id(request.args.get('user_id'))
+    if error is not None:
+        return error
 
     if not user_id:
         return jsonify({"error": "user_id gerekli."}), 400
 
-    vehicles = UserVehicle.query.filter_by(user_id=user_id).all()
-    vehicle_list = []
-
-    for v in vehicles:
-        vehicle_list.append({
-            "id": v.id,
-            "brand": v.brand,
-            "model": v.model,
-            "year": v.year,
-            "battery_capacity_kWh": v.battery_capacity_kWh,
-            "charge_power_kW": v.charge_power_kW,
-            "latitude": v.latitude,
-            "longitude": v.longitude
-        })
+    vehicle_list = user_vehicle_reader.fetch(db.session, UserVehicle.user_id == user_id)
 
     return jsonify(vehicle_list), 200
 
@@ -261,11 +749,93 @@ def delete_user_vehicle(vehicle_id):
     if not vehicle:
         return jsonify({"error": "Araç bulunamadı."}), 404
 
+    error = check_owner(vehicle.user_id)
+    if error is not None:
+        return error
+
     db.session.delete(vehicle)
     db.session.commit()
 
     return jsonify({"message": "Araç başarıyla silindi."}), 200
 
+@app.route('/stations/<int:station_id>/status', methods=['GET'])
+def get_station_status_route(station_id):
+    status = get_station_status(station_id)
+    if status is None:
+        return jsonify({"error": "Şarj istasyonu bulunamadı"}), 404
+
+    return jsonify({"station_id": station_id, "status": status}), 200
+
+# Önceden hesaplanmış en yakın komşu istasyonlar
+@app.route('/stations/<int:station_id>/nearby', methods=['GET'])
+def get_nearby_stations(station_id):
+    limit = request.args.get('limit', default=app.config['STATION_DISTANCE_K'], type=int)
+    if limit is None or not 0 < limit <= app.config['STATION_DISTANCE_K']:
+        return jsonify({"error": f"limit 1 ile {app.config['STATION_DISTANCE_K']} arasında olmalı."}), 400
+
+    if get_station_status(station_id) is None:
+        return jsonify({"error": "Şarj istasyonu bulunamadı"}), 404
+
+    if not station_distances.is_built():
+        sync_station_distances()
+    arrays = get_station_arrays()
+
+    nearby = []
+    for neighbor_id, distance_km in station_distances.neighbors(station_id)[:limit]:
+        index = arrays.index_by_id.get(neighbor_id)
+        if index is None:
+            continue
+        nearby.append({
+            "id": neighbor_id,
+            "name": arrays.names[index],
+            "latitude": arrays.latitudes[index],
+            "longitude": arrays.longitudes[index],
+            "status": arrays.statuses[index],
+            "distance_km": round(distance_km, 2)
+        })
+
+    return jsonify({"station_id": station_id, "nearby": nearby}), 200
+
+@app.route('/stations/snapshot', methods=['GET'])
+def get_station_snapshot():
+    arrays = get_station_arrays()
+    snapshot = station_snapshots.current(arrays.version, arrays.ids, arrays.latitudes, arrays.longitudes,
+                                         arrays.statuses, arrays.max_power_kW, arrays.names)
+
+    since = request.args.get('since') or request.headers.get('If-None-Match', '').strip('"')
+    if since == snapshot.tag:
+        response = make_response('', 304)
+    else:
+        delta = station_snapshots.delta(since, snapshot) if since else None
+        response = make_response(delta if delta is not None else snapshot.data, 200)
+        response.headers['Content-Type'] = 'application/octet-stream'
+        response.headers['X-Snapshot-Kind'] = 'delta' if delta is not None else 'full'
+        if delta is not None:
+            response.headers['X-Snapshot-Base'] = since
+    response.headers['ETag'] = f'"{snapshot.tag}"'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/stations/clusters', methods=['GET'])
+def get_station_clusters_in_box():
+    try:
+        west, south, east, north = (float(value) for value in request.args.get('bbox', '').split(','))
+    except ValueError:
+        return jsonify({"error": "bbox 'batı,güney,doğu,kuzey' biçiminde olmalı."}), 400
+    if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+        return jsonify({"error": "Geçersiz sınır kutusu."}), 400
+
+    zoom = request.args.get('zoom', type=float)
+    if zoom is None or zoom < 0:
+        return jsonify({"error": "zoom sıfır veya pozitif bir sayı olmalı."}), 400
+
+    clusters = get_station_clusters().query(west, south, east, north, zoom)
+    return jsonify({
+        "zoom": min(int(zoom), app.config['STATION_CLUSTER_MAX_ZOOM']),
+        "total": sum(cluster["count"] for cluster in clusters),
+        "clusters": clusters
+    }), 200
+
 @app.route('/stations/<int:station_id>/status', methods=['PUT'])
 def update_station_status(station_id):
     data = request.get_json()
@@ -282,16 +852,19 @@ def update_station_status(station_id):
         return jsonify({"error": "Şarj istasyonu bulunamadı"}), 404
 
     # 3) Güncelle ve kaydet
-    station.status = new_status
+    set_station_status(station, new_status)
     db.session.commit()
 
     return jsonify({"message": f"{station.name} durum güncellendi: {new_status}"}), 200
 
 @app.route('/reservations', methods=['POST'])
+@idempotent('reservations')
 def create_reservation():
     data = request.get_json()
     
-    user_id = data.get('user_id')
+    user_id, error = resolve_user_id(data.get('user_id'))
+    if error is not None:
+        return error
     station_id = data.get('station_id')
     vehicle_id = data.get('vehicle_id')
     current_percent = data.get('current_battery_percent')
@@ -301,7 +874,7 @@ def create_reservation():
         return jsonify({"error": "Eksik veri gönderildi."}), 400
 
     # Araç bilgilerini al
-    vehicle = Vehicle.query.get(vehicle_id)
+    vehicle = vehicle_catalog.get(vehicle_id)
     if not vehicle:
         return jsonify({"error": "Araç bulunamadı."}), 404
 
@@ -313,6 +886,15 @@ def create_reservation():
     start_time = datetime.utcnow()
     end_time = start_time + timedelta(minutes=charging_time_minutes)
 
+    # Şarj istasyonunu yalnızca müsaitse 'Reserved' yap (çifte rezervasyonu önler)
+    outcome = compare_and_set_station_status(station_id, 'available', 'Reserved')
+    if outcome == 'missing':
+        db.session.rollback()
+        return jsonify({"error": "İstasyon bulunamadı."}), 404
+    if outcome == 'conflict':
+        db.session.rollback()
+        return jsonify({"error": "İstasyon şu anda rezerve edilemez."}), 409
+
     # Rezervasyon kaydet
     reservation = Reservation(
         user_id=user_id,
@@ -325,12 +907,6 @@ def create_reservation():
         expected_end_time=end_time
     )
     db.session.add(reservation)
-
-    # Şarj istasyonunu 'Reserved' yap
-    station = ChargingStation.query.get(station_id)
-    if not station:
-        return jsonify({"error": "İstasyon bulunamadı."}), 404
-    station.status = 'Reserved'
     db.session.commit()
 
     # Süre dolunca istasyonu 'Disconnected' yapacak görev
@@ -338,7 +914,7 @@ def create_reservation():
         with app.app_context():
             station_to_free = ChargingStation.query.get(station_id)
             if station_to_free and station_to_free.status != 'available':
-                station_to_free.status = 'available'
+                set_station_status(station_to_free, 'available')
                 db.session.commit()
                 print(f"[✓] İstasyon #{station_id} otomatik olarak Disconnected oldu.")
 
@@ -364,37 +940,28 @@ def smart_station_suggestions():
     if None in [user_lat, user_lon]:
         return jsonify({"error": "Konum bilgisi gerekli."}), 400
 
-    stations = ChargingStation.query.all()
+    arrays = get_station_arrays()
+    results = score_stations('location', arrays, user_lat=user_lat, user_lon=user_lon,
+                             travel_speed_kmh=travel_speed_kmh, now=to_epoch(datetime.utcnow()))
     suggestions = []
 
-    for station in stations:
-        distance_km = simple_distance(user_lat, user_lon, station.latitude, station.longitude)
-        travel_minutes = (distance_km / travel_speed_kmh) * 60
+    for station_id, distance_km, travel_minutes, reservable in results:
+        index = arrays.index_by_id[station_id]
+        status = arrays.statuses[index]
 
-        reservable = False
         reason = ""
-
-        if station.status == 'available':
-            reservable = True
-            reason = "İstasyon zaten boş"
-        elif station.status == 'reserved':
-            active_res = Reservation.query.filter(
-                Reservation.station_id == station.id, 
-                Reservation.expected_end_time > datetime.utcnow()
-            ).order_by(Reservation.expected_end_time.desc()).first()
-            if active_res:
-                expected_free_time = active_res.expected_end_time
-                arrival_time = datetime.utcnow() + timedelta(minutes=travel_minutes)
-                if arrival_time >= expected_free_time:
-                    reservable = True
-                    reason = f"İstasyona ulaştığında boş olacak (~{int(travel_minutes)} dk sonra)"
+        if reservable:
+            if status == 'available':
+                reason = "İstasyon zaten boş"
+            else:
+                reason = f"İstasyona ulaştığında boş olacak (~{int(travel_minutes)} dk sonra)"
 
         suggestions.append({
-            "id": station.id,
-            "name": station.name,
-            "latitude": station.latitude,
-            "longitude": station.longitude,
-            "status": station.status,
+            "id": station_id,
+            "name": arrays.names[index],
+            "latitude": arrays.latitudes[index],
+            "longitude": arrays.longitudes[index],
+            "status": status,
             "distance_km": round(distance_km, 2),
             "travel_minutes": round(travel_minutes),
             "reservable": reservable,
@@ -403,35 +970,86 @@ def smart_station_suggestions():
 
     return jsonify(suggestions), 200
 
+# Rota boyunca istasyon araması (kodlanmış polyline + koridor genişliği)
+@app.route('/stations/along-route', methods=['POST'])
+def stations_along_route():
+    data = request.get_json() or {}
+
+    encoded = data.get('polyline')
+    buffer_km = data.get('buffer_km', 5)
+    precision = data.get('precision', 5)
+
+    if not encoded or not isinstance(encoded, str):
+        return jsonify({"error": "polyline gerekli."}), 400
+    if not isinstance(buffer_km, (int, float)) or not 0 < buffer_km <= app.config['ROUTE_MAX_BUFFER_KM']:
+        return jsonify({"error": f"buffer_km 0 ile {app.config['ROUTE_MAX_BUFFER_KM']} arasında olmalı."}), 400
+    if precision not in (5, 6):
+        return jsonify({"error": "precision 5 veya 6 olmalı."}), 400
+
+    try:
+        route = decode_polyline(encoded, precision)
+    except ValueError as e:
+        return jsonify({"error": f"Geçersiz polyline: {str(e)}"}), 400
+
+    arrays = get_station_arrays()
+    grid = get_station_grid(arrays)
+
+    stations = []
+    for index, distance_km, along_km in grid.corridor(route, buffer_km):
+        stations.append({
+            "id": arrays.ids[index],
+            "name": arrays.names[index],
+            "latitude": arrays.latitudes[index],
+            "longitude": arrays.longitudes[index],
+            "status": arrays.statuses[index],
+            "max_power_kW": arrays.max_power_kW[index],
+            "distance_from_route_km": round(distance_km, 2),
+            "distance_along_route_km": round(along_km, 2)
+        })
+
+    return jsonify({
+        "route_points": len(route),
+        "buffer_km": buffer_km,
+        "stations": stations
+    }), 200
+
 @app.route('/reservations', methods=['GET'])
 def get_user_reservations():
-    user_id = request.args.get('user_id')
+    user_id, error = resolve_user_id(request.args.get('user_id'))
+    if error is not None:
+        return error
 
     if not user_id:
         return jsonify({"error": "user_id parametresi gerekli."}), 400
 
-    reservations = Reservation.query.filter_by(user_id=user_id).order_by(Reservation.start_time.desc()).all()
-    result = []
-
-    for r in reservations:
-        station = ChargingStation.query.get(r.station_id)
-        vehicle = Vehicle.query.get(r.vehicle_id)
-
-        result.append({
-            "reservation_id": r.id,
-            "station_name": station.name if station else "Bilinmiyor",
-            "vehicle_model": f"{vehicle.brand} {vehicle.model}" if vehicle else "Bilinmiyor",
-            "start_time": r.start_time.isoformat(),
-            "end_time": r.expected_end_time.isoformat(),
-            "duration_minutes": round(r.duration_minutes, 2),
-            "status": station.status if station else "unknown"
-        })
-
-    return jsonify(result), 200
+    # İstasyon bilgisi satır başına ayrı sorgu yerine tek bir dış birleştirmeyle okunur
+    rows = db.session.query(
+        Reservation.id, Reservation.vehicle_id, Reservation.start_time, Reservation.expected_end_time,
+        Reservation.duration_minutes, ChargingStation.id, ChargingStation.name, ChargingStation.status
+    ).outerjoin(ChargingStation, ChargingStation.id == Reservation.station_id).filter(
+        Reservation.user_id == user_id
+    ).order_by(Reservation.start_time.desc()).yield_per(500)
+
+    def reservations():
+        for reservation_id, vehicle_id, start_time, end_time, duration, station_id, station_name, status in rows:
+            vehicle = vehicle_catalog.get(vehicle_id)
+            yield {
+                "reservation_id": reservation_id,
+                "station_name": station_name if station_id is not None else "Bilinmiyor",
+                "vehicle_model": f"{vehicle.brand} {vehicle.model}" if vehicle else "Bilinmiyor",
+                "start_time": start_time.isoformat(),
+                "end_time": end_time.isoformat(),
+                "duration_minutes": round(duration, 2),
+                "status": status if station_id is not None else "unknown"
+            }
+
+    return json_array_response(reservations())
 
 @app.route('/reservations/active', methods=['GET'])
 def get_active_reservations():
-    user_id = request.args.get('user_id')
+    user_id, error = resolve_user_id(request.args.get('user_id'))
+    if error is not None:
+        return error
 
     if not user_id:
         return jsonify({"error": "user_id parametresi gerekli."}), 400
@@ -446,7 +1064,7 @@ def get_active_reservations():
 
     for res in active_reservations:
         station = ChargingStation.query.get(res.station_id)
-        vehicle = Vehicle.query.get(res.vehicle_id)
+        vehicle = vehicle_catalog.get(res.vehicle_id)
 
         result.append({
             "id": res.id,
@@ -481,6 +1099,8 @@ def add_station():
 
     db.session.add(new_station)
     db.session.commit()
+    apply_station_status_change(new_station.id, None, status)
+    station_distances.add(new_station.id, new_station.latitude, new_station.longitude)
 
 
     return jsonify({
@@ -495,6 +1115,10 @@ def cancel_reservation(reservation_id):
     if not reservation:
         return jsonify({"error": "Rezervasyon bulunamadı."}), 404
 
+    error = check_owner(reservation.user_id)
+    if error is not None:
+        return error
+
     station = ChargingStation.query.get(reservation.station_id)
 
     # 1. Rezervasyonu sil
@@ -502,7 +1126,7 @@ def cancel_reservation(reservation_id):
 
     # 2. İstasyonu tekrar available yap
     if station:
-        station.status = 'available'
+        set_station_status(station, 'available')
 
     db.session.commit()
 
@@ -518,9 +1142,12 @@ def cleanup_expired_reservations():
     for r in expired_reservations:
         station = ChargingStation.query.get(r.station_id)
         if station and station.status in ['reserved', 'available', 'occupied']:
-            station.status = 'available'
+            set_station_status(station, 'available')
             cleaned_stations.append(station.id)
 
+    # Süresi dolmuş idempotency kayıtlarını da temizle
+    IdempotencyRecord.query.filter(IdempotencyRecord.expires_at < time.time()).delete()
+
     db.session.commit()
 
     return jsonify({
@@ -534,20 +1161,28 @@ def delete_station(station_id):
     if not station:
         return jsonify({"error": "İstasyon bulunamadı."}), 404
 
+    station_id, old_status = station.id, station.status
     db.session.delete(station)
     db.session.commit()
+    apply_station_status_change(station_id, old_status, None)
+    station_distances.remove(station_id)
 
     return jsonify({"message": "İstasyon silindi."}), 200
 
+@app.route('/admin/automata/reload', methods=['POST'])
+def reload_automata_definitions():
+    force = request.args.get('force', default=0, type=int) == 1
+    report = automata_reloader.check(force=force)
+    status_code = 422 if any(result.startswith('error') for result in report.values()) else 200
+    return jsonify({"results": report}), status_code
+
 @app.route('/stations/summary', methods=['GET'])
 def station_summary():
-    total = ChargingStation.query.count()
-    connected = ChargingStation.query.filter(ChargingStation.status != 'Disconnected').count()
+    # Sayaçlar her çağrıda değil, uzlaştırma aralığı dolduğunda veritabanından okunur
+    if station_counters.needs_reconcile():
+        reconcile_station_counters()
 
-    return jsonify({
-        "total": total,
-        "connected": connected
-    })
+    return jsonify(station_counters.summary(disconnected_status='Disconnected'))
 
 @app.route('/statuses', methods=['GET'])
 def get_statuses():
@@ -563,21 +1198,21 @@ def estimate_reservation_time():
     if not station_id or not vehicle_id:
         return jsonify({"error": "Eksik parametre (station_id, vehicle_id)"}), 400
 
-    vehicle = Vehicle.query.get(vehicle_id)
-    station = ChargingStation.query.get(station_id)
+    vehicle = vehicle_catalog.get(vehicle_id)
+    station_status = get_station_status(station_id)
 
-    if not vehicle or not station:
+    if not vehicle or station_status is None:
         return jsonify({"error": "İstasyon veya araç bulunamadı."}), 404
 
     energy_needed = vehicle.battery_capacity_kWh * ((target_percent - current_percent) / 100)
     charging_time_minutes = (energy_needed / vehicle.charge_power_kW) * 60
 
-    reservable = station.status == 'available'
+    reservable = station_status == 'available'
 
     return jsonify({
         "reservable": reservable,
         "estimated_time_min": round(charging_time_minutes, 1),
-        "station_status": station.status
+        "station_status": station_status
     }), 200
 
 @app.route('/stations/<int:station_id>/connect', methods=['POST'])
@@ -586,7 +1221,7 @@ def connect_station(station_id):
     if not station:
         return jsonify({"error": "İstasyon bulunamadı"}), 404
 
-    station.status = 'available'
+    set_station_status(station, 'available')
     db.session.commit()
     return jsonify({"message": "İstasyon bağlandı", "status": station.status}), 200
 
@@ -597,7 +1232,7 @@ def disconnect_station(station_id):
     if not station:
         return jsonify({"error": "İstasyon bulunamadı"}), 404
 
-    station.status = 'unavailable'
+    set_station_status(station, 'unavailable')
     db.session.commit()
     return jsonify({"message": "İstasyon bağlantısı kesildi", "status": station.status}), 200
 
@@ -610,7 +1245,7 @@ def plug_station(station_id):
     if station.status != "reserved":
         return jsonify({"error": "İstasyon reserved değil"}), 400
 
-    station.status = "occupied"
+    set_station_status(station, "occupied")
     db.session.commit()
     return jsonify({"message": "EVSE plugged in", "status": station.status}), 200
 
@@ -623,7 +1258,7 @@ def start_charging(station_id):
     if station.status != "occupied":
         return jsonify({"error": "Şarj başlatılamaz, EVSE occupied değil"}), 400
 
-    station.status = "charging"
+    set_station_status(station, "charging")
     db.session.commit()
     return jsonify({"message": "Şarj başlatıldı", "status": station.status}), 200
 
@@ -633,7 +1268,7 @@ def stop_charging(station_id):
     if not station:
         return jsonify({"error": "İstasyon bulunamadı"}), 404
 
-    station.status = "available"
+    set_station_status(station, "available")
     db.session.commit()
     return jsonify({"message": "Şarj durduruldu", "status": station.status}), 200
 
@@ -675,6 +1310,7 @@ def update_vehicle_location(vehicle_id):
     
     # Güncelleme işlemi
     db.session.commit()
+    vehicle_catalog.bump_version()
     
     return jsonify({
         "message": "Araç bilgileri güncellendi",
@@ -703,7 +1339,7 @@ def smart_suggestion():
         return jsonify({"error": "vehicle_id gerekli"}), 400
     
     # Aracı bul
-    vehicle = Vehicle.query.get(vehicle_id)
+    vehicle = vehicle_catalog.get(vehicle_id)
     if not vehicle:
         return jsonify({"error": "Araç bulunamadı"}), 404
     
@@ -711,12 +1347,12 @@ def smart_suggestion():
     vehicle_lat = vehicle.latitude
     vehicle_lon = vehicle.longitude
     
-    # Şarj istasyonlarını al
-    stations = ChargingStation.query.all()
+    # Şarj istasyonlarının dizilerini al
+    arrays = get_station_arrays()
     
-    # Otomata motorunu başlat
+    # Otomata oturumunu başlat (her istek kendi oturumunu kullanır, paylaşılan motor değişmez)
     if 'smart_suggestion_dfa' in automatas:
-        suggestion_automata = automatas['smart_suggestion_dfa']
+        suggestion_automata = automatas['smart_suggestion_dfa'].new_session()
         suggestion_automata.trigger_event('START_SUGGESTION', {
             'vehicle': vehicle,
             'current_soc': current_soc,
@@ -724,67 +1360,52 @@ def smart_suggestion():
             'max_waiting_time': max_waiting_time
         })
     
-    suggestions = []
     now = datetime.utcnow()
+    now_epoch = to_epoch(now)
     
-    # Her istasyon için hesaplamalar
-    for station in stations:
-        # Mesafe hesapla
-        distance_km = simple_distance(vehicle_lat, vehicle_lon, station.latitude, station.longitude)
-        
-        # Kalan menzili hesapla (km cinsinden, basit bir hesaplama)
-        battery_capacity = vehicle.battery_capacity_kWh
-        # Her kWh başına ortalama 5 km menzil varsayalım (bu değer aracın verimliliğine göre değişebilir)
-        km_per_kwh = 5  
-        remaining_range = (current_soc / 100) * battery_capacity * km_per_kwh
-        
-        # İstasyona ulaşmak için gereken şarj yeterli mi?
-        can_reach = remaining_range >= distance_km
-        
-        # Şarj süresi hesaplama (dakika cinsinden)
-        charge_time_minutes = 0
-        if station.max_power_kW and station.max_power_kW > 0:
-            energy_needed = ((target_soc - current_soc) / 100) * battery_capacity
-            charge_time_minutes = (energy_needed / station.max_power_kW) * 60
-        
-        # İstasyon şu anda müsait mi?
-        is_available = station.status == 'available'
-        
-        # İstasyonda aktif rezervasyon var mı?
-        active_reservation = Reservation.query.filter(
-            Reservation.station_id == station.id, 
-            Reservation.expected_end_time > now
-        ).order_by(Reservation.expected_end_time.desc()).first()
-        
-        available_after = None
-        waiting_time = 0
-        
-        if active_reservation:
-            available_after = active_reservation.expected_end_time
-            waiting_time = (available_after - now).total_seconds() / 60  # dakika cinsinden
+    # Her istasyon için mesafe, bekleme ve şarj süresini hesapla; beklemeden şarj
+    # olabilecek veya makul bekleme süresi olan istasyonları toplam süreye göre sırala
+    ranked = score_stations(
+        'vehicle', arrays,
+        vehicle_lat=vehicle_lat,
+        vehicle_lon=vehicle_lon,
+        battery_capacity=vehicle.battery_capacity_kWh,
+        current_soc=current_soc,
+        target_soc=target_soc,
+        max_waiting_time=max_waiting_time,
+        now=now_epoch
+    )
+    
+    # Kalan menzil aracın model verimiyle bir kez hesaplanır; "ulaşılabilir mi?" kontrolü
+    # (araç modeli, SOC aralığı, hücre) izokronunda küme aramasıdır
+    km_per_kwh = efficiency_model.km_per_kwh(vehicle.brand, vehicle.model)
+    remaining_range = calculate_range(vehicle.battery_capacity_kWh, current_soc, km_per_kwh)
+    isochrone = get_isochrone_cache(arrays).get(
+        (VehicleEfficiencyModel.model_key(vehicle.brand, vehicle.model), vehicle.battery_capacity_kWh),
+        calculate_range(vehicle.battery_capacity_kWh, 1, km_per_kwh),
+        current_soc, vehicle_lat, vehicle_lon
+    )
+    
+    suggestions = []
+    for station_id, distance_km, waiting_time, charge_time_minutes in ranked:
+        index = arrays.index_by_id[station_id]
+        can_reach = isochrone.can_reach(station_id, distance_km, remaining_range)
+        available_after = arrays.reservation_ends[index] if arrays.available_after[index] > now_epoch else None
         
-        # Sonuçları hesapla
-        suggestion = {
-            "station_id": station.id,
-            "name": station.name,
+        suggestions.append({
+            "station_id": station_id,
+            "name": arrays.names[index],
             "distance_km": round(distance_km, 2),
             "can_reach": can_reach,
-            "is_available_now": is_available,
+            "is_available_now": arrays.statuses[index] == 'available',
             "available_after": available_after.isoformat() if available_after else None,
             "waiting_time_minutes": round(waiting_time),
             "charge_time_minutes": round(charge_time_minutes),
             "total_time": round(waiting_time + charge_time_minutes),
-            "latitude": station.latitude,
-            "longitude": station.longitude,
-            "max_power_kW": station.max_power_kW
-        }
-        
-        # Beklemeden şarj olabilecek veya makul bekleme süresi olan istasyonları öner
-        if is_available or (active_reservation and waiting_time <= max_waiting_time):
-            suggestions.append(suggestion)
-    
-    # Şarj ve bekleme süresi toplamına göre sırala
-    suggestions.sort(key=lambda x: x["total_time"])
+            "latitude": arrays.latitudes[index],
+            "longitude": arrays.longitudes[index],
+            "max_power_kW": arrays.max_power_kW[index]
+        })
     
     # Menzile göre erişilebilir istasyonları filtrele
     reachable_suggestions = [s for s in suggestions if s["can_reach"]]
@@ -813,27 +1434,94 @@ def smart_suggestion():
         "reachable_count": len(reachable_suggestions)
     }), 200
 
-# Şarj hesaplama fonksiyonları
-def calculate_charge_time(battery_capacity_kWh, current_soc, target_soc, charge_power_kW):
-    """Şarj için gereken süreyi hesaplar (dakika cinsinden)"""
-    if not charge_power_kW or charge_power_kW <= 0:
-        return 0
-    
-    energy_needed = ((target_soc - current_soc) / 100) * battery_capacity_kWh
-    hours = energy_needed / charge_power_kW
-    return hours * 60  # dakika cinsinden
-
-def calculate_range(battery_capacity_kWh, soc_percent, efficiency_km_per_kwh=5):
-    """Mevcut şarj seviyesi ile gidebileceği menzili hesaplar (km cinsinden)"""
-    available_energy = (soc_percent / 100) * battery_capacity_kWh
-    return available_energy * efficiency_km_per_kwh
-
-def is_station_reachable(vehicle_lat, vehicle_lon, station_lat, station_lon, 
-                        battery_capacity_kWh, current_soc, efficiency_km_per_kwh=5):
-    """İstasyonun mevcut şarj ile erişilebilir olup olmadığını kontrol eder"""
-    distance = simple_distance(vehicle_lat, vehicle_lon, station_lat, station_lon)
-    max_range = calculate_range(battery_capacity_kWh, current_soc, efficiency_km_per_kwh)
-    return max_range >= distance
+def _read_point(value):
+    """{"latitude": .., "longitude": ..} nesnesini (enlem, boylam) çiftine çevirir; geçersizse None"""
+    if not isinstance(value, dict):
+        return None
+    lat, lon = value.get('latitude'), value.get('longitude')
+    if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return float(lat), float(lon)
+
+# Çok duraklı yolculuk planı (toplam süreyi en aza indiren şarj durakları)
+@app.route('/trips/plan', methods=['POST'])
+def plan_trip():
+    data = request.get_json() or {}
+
+    vehicle_id = data.get('vehicle_id')
+    current_soc = data.get('current_soc', 20.0)
+    speed_kmh = data.get('speed_kmh', 80)
+
+    if vehicle_id is None:
+        return jsonify({"error": "vehicle_id gerekli"}), 400
+
+    vehicle = vehicle_catalog.get(vehicle_id)
+    if not vehicle:
+        return jsonify({"error": "Araç bulunamadı"}), 404
+
+    destination = _read_point(data.get('destination'))
+    if destination is None:
+        return jsonify({"error": "Geçerli bir varış konumu gerekli."}), 400
+
+    # Başlangıç verilmezse aracın kayıtlı konumu kullanılır
+    if data.get('origin') is not None:
+        origin = _read_point(data.get('origin'))
+    elif vehicle.latitude is not None and vehicle.longitude is not None:
+        origin = (vehicle.latitude, vehicle.longitude)
+    else:
+        origin = None
+    if origin is None:
+        return jsonify({"error": "Geçerli bir başlangıç konumu gerekli."}), 400
+
+    if not isinstance(current_soc, (int, float)) or not 0 <= current_soc <= 100:
+        return jsonify({"error": "current_soc 0 ile 100 arasında olmalı."}), 400
+    if not isinstance(speed_kmh, (int, float)) or speed_kmh <= 0:
+        return jsonify({"error": "speed_kmh pozitif olmalı."}), 400
+
+    arrays = get_station_arrays()
+    planner = TripPlanner(
+        arrays, get_station_grid(arrays),
+        km_per_kwh=efficiency_model.km_per_kwh(vehicle.brand, vehicle.model),
+        speed_kmh=speed_kmh,
+        soc_step=app.config['TRIP_SOC_STEP'],
+        reserve_soc=app.config['TRIP_RESERVE_SOC'],
+        max_charge_soc=app.config['TRIP_MAX_CHARGE_SOC'],
+        stop_overhead_minutes=app.config['TRIP_STOP_OVERHEAD_MIN']
+    )
+    plan = planner.plan(origin, destination, vehicle.battery_capacity_kWh, vehicle.charge_power_kW, current_soc)
+    if plan is None:
+        return jsonify({"error": "Bu şarj seviyesiyle varışa ulaşan bir plan bulunamadı."}), 404
+
+    stops = []
+    for stop in plan.stops:
+        index = stop.station_index
+        stops.append({
+            "station_id": arrays.ids[index],
+            "name": arrays.names[index],
+            "latitude": arrays.latitudes[index],
+            "longitude": arrays.longitudes[index],
+            "max_power_kW": arrays.max_power_kW[index],
+            "drive_km": round(stop.drive_km, 2),
+            "drive_minutes": round(stop.drive_minutes),
+            "arrival_soc": round(stop.arrival_soc, 1),
+            "departure_soc": round(stop.departure_soc, 1),
+            "charge_minutes": round(stop.charge_minutes)
+        })
+
+    return jsonify({
+        "vehicle_id": vehicle.id,
+        "origin": {"latitude": origin[0], "longitude": origin[1]},
+        "destination": {"latitude": destination[0], "longitude": destination[1]},
+        "start_soc": current_soc,
+        "arrival_soc": round(plan.arrival_soc, 1),
+        "distance_km": round(plan.distance_km, 2),
+        "driving_minutes": round(plan.driving_minutes),
+        "charging_minutes": round(plan.charging_minutes),
+        "total_minutes": round(plan.total_minutes),
+        "stops": stops
+    }), 200
 
 def seed_vehicles():
     vehicles = [
@@ -867,6 +1555,7 @@ def seed_vehicles():
         db.session.add(vehicle)
     
     db.session.commit()
+    vehicle_catalog.bump_version()
     print("Araçlar başarıyla Eskişehir konumlarıyla eklendi!")
 
 def seed_charging_stations():
@@ -899,27 +1588,6 @@ def seed_charging_stations():
     db.session.commit()
     print("Şarj istasyonları başarıyla eklendi.")
 
-def simple_distance(lat1, lon1, lat2, lon2):
-    R = 6371  # Dünya'nın yarıçapı (km)
-
-    # 1) Dereceleri radyana çevir
-    lat1 = math.radians(lat1)
-    lon1 = math.radians(lon1)
-    lat2 = math.radians(lat2)
-    lon2 = math.radians(lon2)
-
-    # 2) Delta'ları bul
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-
-    # 3) Haversine formülünü uygula
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-    # 4) Mesafeyi hesapla
-    distance = R * c
-    return distance
-
 # İşleyicileri kaydet
 def register_handlers():
     """Otomata sistemine koşul ve eylem işleyicilerini kaydeder"""
@@ -969,10 +1637,32 @@ def register_handlers():
             station_engine.register_action_handler('logStateChange', 
                 lambda context: print(f"İstasyon durumu değişti: {context.get('station_id')} - {context.get('new_status')}"))
         
+        # Tanımda adı geçip kaydedilmemiş işleyiciler (kayıttan sonra denetlenir)
+        for automata_id, engine in automatas.items():
+            missing = engine.get_missing_handlers()
+            if missing:
+                print(f"⚠️ {automata_id}: Kaydedilmemiş işleyiciler: {', '.join(missing)}")
+        
         print("✅ Otomata işleyicileri başarıyla kaydedildi")
     except Exception as e:
         print(f"❌ Otomata işleyicileri kaydedilirken hata: {str(e)}")
 
+def upgrade_schema():
+    """Eski veritabanlarına sonradan eklenen kolonları ekler"""
+    columns = {column['name'] for column in inspect(db.engine).get_columns('charging_station')}
+    if 'version' not in columns:
+        with db.engine.begin() as connection:
+            connection.execute(text("ALTER TABLE charging_station ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+        print("✅ charging_station tablosuna version kolonu eklendi")
+
+    inspector = inspect(db.engine)
+    columns = ({column['name'] for column in inspector.get_columns('idempotency_record')}
+               if inspector.has_table('idempotency_record') else {'request_hash'})
+    if 'request_hash' not in columns:
+        with db.engine.begin() as connection:
+            connection.execute(text("ALTER TABLE idempotency_record ADD COLUMN request_hash VARCHAR(64) NOT NULL DEFAULT ''"))
+        print("✅ idempotency_record tablosuna request_hash kolonu eklendi")
+
 # Otomata sistemini test etmek için basit bir fonksiyon ekleyelim
 def test_automata_system():
     """Otomata sistemini test eden basit fonksiyon"""
@@ -998,6 +1688,7 @@ if __name__ == '__main__':
         print("\n====== Uygulama Başlatılıyor ======")
         
         db.create_all()
+        upgrade_schema()
         print("✅ Veritabanı şeması oluşturuldu")
         
         # Testler için araç ve istasyon verileri oluştur
@@ -1012,6 +1703,13 @@ if __name__ == '__main__':
             print(f"✅ {ChargingStation.query.count()} adet şarj istasyonu veritabanına eklendi")
         else:
             print(f"ℹ️ Veritabanında zaten {ChargingStation.query.count()} adet şarj istasyonu var")
+
+        # İstasyon mesafe deposunu hazırla (dosya kuruluysa veritabanıyla karşılaştırılır, farklıysa yeniden kurulur)
+        sync_station_distances()
+        print("✅ İstasyon mesafe deposu hazır")
+
+        # Araç kataloğunu belleğe yükle
+        print(f"✅ Araç kataloğu yüklendi: {len(vehicle_catalog.all())} araç")
             
         # Otomata işleyicilerini kaydet
         try:
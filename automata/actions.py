@@ -368,6 +368,26 @@ def finalizeSuggestionProcess(context: Dict[str, Any]) -> None:
     logger.info(f"Öneri süreci tamamlandı (Kullanıcı: {user_id})")
     # Burada öneri süreci tamamlanacak
 
+# -----------------------------------------------------------------------
+# Asenkron Motor İçin Eylem Sınıfları
+# -----------------------------------------------------------------------
+
+# Geçişi beklemeden AsyncAutomataEngine'in ertelenmiş eylem kuyruğunda çalışan
+# bildirim eylemleri; olay işleme gecikmesine bildirim G/Ç'si eklenmez
+DEFERRED_ACTIONS = frozenset({
+    'notifyStationReserved', 'notifyStationFault', 'notifyMaintenance',
+    'sendReservationConfirmation', 'notifySystemAdmin', 'scheduleRetry',
+})
+
+# Aynı geçişteki diğer eşzamanlı eylemlerle birlikte çalıştırılabilen,
+# birbirinin sonucuna ve motor durumuna bağlı olmayan eylemler
+CONCURRENT_ACTIONS = frozenset({
+    'logStateChange', 'createFaultReport', 'logReservationStart', 'logPendingReservation',
+    'logUserArrival', 'logReservationCancellation', 'logReservationExpiry',
+    'logReservationCompletion', 'logStationOperational', 'logNotificationCreation',
+    'logSuccessfulSending', 'logSuccessfulDelivery', 'logFailedSending',
+})
+
 # -----------------------------------------------------------------------
 # Eylem Kayıt Fonksiyonu
 # -----------------------------------------------------------------------
@@ -0,0 +1,361 @@
+"""
+Otomata tanımı analiz modülü.
+
+Bu modül, AutomataLoader'ın ürettiği tanımları yükleme sırasında inceler
+ve XML yazım hatalarını çalışma zamanından önce raporlar:
+
+    - Başlangıçtan erişilemeyen durumlar
+    - Ölü durumlar (ne son duruma ne de başlangıca geri dönebilen)
+    - Birleştirilebilecek eşdeğer durumlar (Hopcroft küçültmesi)
+    - Hiçbir zaman tetiklenemeyen olaylar
+    - Tanımda kullanılıp kaydedilmemiş ya da kaydedilip hiç kullanılmayan işleyiciler
+
+Küçültmede iki durum yalnızca giriş/çıkış eylemleri, metadata'sı ve son
+durum olup olmaması aynıysa ve her olayda aynı koşul ve eylemle eşdeğer
+durumlara gidiyorsa birleştirilir. Ad ve açıklama birleştirmeyi engellemez;
+birleşen grubun tanımdaki ilk durumu korunur.
+"""
+
+import logging
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class AutomataReport:
+    """
+    Bir otomata tanımının analiz sonuçlarını tutan sınıf.
+    """
+    __slots__ = ("automata_id", "reachable", "unreachable", "dead", "equivalent",
+                 "unused_events", "missing_handlers")
+
+    def __init__(self, automata_id: str):
+        self.automata_id = automata_id
+        self.reachable: List[str] = []
+        self.unreachable: List[str] = []
+        self.dead: List[str] = []
+        self.equivalent: List[Tuple[str, ...]] = []
+        self.unused_events: List[str] = []
+        self.missing_handlers: List[str] = []
+
+    def warnings(self) -> List[str]:
+        """Rapordaki sorunları okunabilir mesajlar olarak döndürür"""
+        messages = []
+        if self.unreachable:
+            messages.append(f"Erişilemeyen durumlar: {', '.join(self.unreachable)}")
+        if self.dead:
+            messages.append(f"Ölü durumlar: {', '.join(self.dead)}")
+        for group in self.equivalent:
+            messages.append(f"Eşdeğer durumlar birleştirilebilir: {', '.join(group)}")
+        if self.unused_events:
+            messages.append(f"Tetiklenemeyen olaylar: {', '.join(self.unused_events)}")
+        if self.missing_handlers:
+            messages.append(f"Kaydedilmemiş işleyiciler: {', '.join(self.missing_handlers)}")
+        return messages
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Raporu JSON'a uygun sözlük olarak döndürür"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AutomataReport":
+        """as_dict() çıktısından (ör. önbellekten) raporu yeniden oluşturur"""
+        report = cls(data["automata_id"])
+        for name in cls.__slots__[1:]:
+            setattr(report, name, list(data.get(name, ())))
+        report.equivalent = [tuple(group) for group in report.equivalent]
+        return report
+
+
+def _initial_state(automata_def: Dict[str, Any]) -> Optional[str]:
+    states = automata_def.get("states", {})
+    return automata_def.get("initial_state") or next(
+        (state_id for state_id, state_def in states.items() if state_def.get("initial")), None)
+
+
+def reachable_states(automata_def: Dict[str, Any]) -> List[str]:
+    """
+    Başlangıç durumundan erişilebilen durumları (tanım sırasıyla) döndürür.
+
+    Koşullar her zaman sağlanabilir kabul edilir.
+    """
+    successors: Dict[str, List[str]] = {}
+    for transition in automata_def.get("transitions", []):
+        successors.setdefault(transition.get("from"), []).append(transition.get("to"))
+
+    initial_state = _initial_state(automata_def)
+    seen = {initial_state} if initial_state else set()
+    queue = deque(seen)
+    while queue:
+        for target in successors.get(queue.popleft(), ()):
+            if target not in seen:
+                seen.add(target)
+                queue.append(target)
+    return [state_id for state_id in automata_def.get("states", {}) if state_id in seen]
+
+
+def dead_states(automata_def: Dict[str, Any], reachable: Sequence[str]) -> List[str]:
+    """
+    Erişilebilen ama hiçbir son duruma ve başlangıç durumuna ulaşamayan durumları döndürür.
+
+    Son durumlar (final="true") ve başlangıç durumu canlı kabul edilir;
+    akış ya tamamlanabilmeli ya da başa dönebilmelidir.
+    """
+    states = automata_def.get("states", {})
+    predecessors: Dict[str, List[str]] = {}
+    for transition in automata_def.get("transitions", []):
+        predecessors.setdefault(transition.get("to"), []).append(transition.get("from"))
+
+    live = {state_id for state_id, state_def in states.items() if state_def.get("final")}
+    initial_state = _initial_state(automata_def)
+    if initial_state:
+        live.add(initial_state)
+    queue = deque(live)
+    while queue:
+        for source in predecessors.get(queue.popleft(), ()):
+            if source not in live:
+                live.add(source)
+                queue.append(source)
+    return [state_id for state_id in reachable if state_id not in live]
+
+
+def _signature(state_def: Dict[str, Any]) -> tuple:
+    metadata = state_def.get("metadata") or {}
+    return (state_def.get("onEntry"), state_def.get("onExit"), bool(state_def.get("final")),
+            tuple(sorted(metadata.items())))
+
+
+def equivalent_state_groups(automata_def: Dict[str, Any], states: Sequence[str] = None) -> List[Tuple[str, ...]]:
+    """
+    Hopcroft algoritmasıyla eşdeğer durum gruplarını bulur.
+
+    Alfabe (olay, sıra, koşul, eylem) dörtlüleridir; böylece koşulu veya
+    eylemi farklı geçişler eşdeğer sayılmaz. Yalnızca DFA'lar için anlamlıdır.
+
+    Args:
+        automata_def: Otomata tanımı
+        states: İncelenecek durumlar (None ise erişilebilen durumlar)
+
+    Returns:
+        Birden fazla durum içeren grupların listesi (tanım sırasıyla)
+    """
+    state_defs = automata_def.get("states", {})
+    if states is None:
+        states = reachable_states(automata_def)
+    included = set(states)
+
+    # Ters geçiş tablosu: sembol -> hedef -> kaynaklar. Aynı (durum, olay) için
+    # geçişler sıra numarasıyla ayrılır. Tanımsız geçişler örtük bir çukur
+    # duruma gider; Hopcroft'ta bir blok bekleme kümesine hiç alınmayabildiği
+    # için çukur bloğu ayırıcı olarak kullanılmaz ve tabloda tutulmaz.
+    inverse: Dict[tuple, Dict[str, Set[str]]] = {}
+    positions: Dict[Tuple[str, str], int] = {}
+    for transition in automata_def.get("transitions", []):
+        from_state, to_state, event = transition.get("from"), transition.get("to"), transition.get("event")
+        if from_state not in included or to_state not in included:
+            continue
+        position = positions.get((from_state, event), 0)
+        positions[(from_state, event)] = position + 1
+        symbol = (event, position, transition.get("condition"), transition.get("action"))
+        inverse.setdefault(symbol, {}).setdefault(to_state, set()).add(from_state)
+
+    signatures: Dict[tuple, int] = {}
+    blocks: List[Set[str]] = []
+    block_of: Dict[str, int] = {}
+    for state_id in states:
+        index = signatures.setdefault(_signature(state_defs.get(state_id, {})), len(blocks))
+        if index == len(blocks):
+            blocks.append(set())
+        blocks[index].add(state_id)
+        block_of[state_id] = index
+    waiting = set(range(len(blocks)))
+
+    while waiting:
+        splitter = tuple(blocks[waiting.pop()])
+        for targets in inverse.values():
+            # Yalnızca kaynaklarının bir kısmını içeren bloklar bölünür
+            touched: Dict[int, Set[str]] = {}
+            for target in splitter:
+                for source in targets.get(target, ()):
+                    touched.setdefault(block_of[source], set()).add(source)
+            for index, inside in touched.items():
+                outside = blocks[index] - inside
+                if not outside:
+                    continue
+                blocks[index] = outside
+                new_index = len(blocks)
+                blocks.append(inside)
+                for state_id in inside:
+                    block_of[state_id] = new_index
+                if index in waiting or len(inside) <= len(outside):
+                    waiting.add(new_index)
+                else:
+                    waiting.add(index)
+
+    order = {state_id: index for index, state_id in enumerate(states)}
+    groups = [tuple(sorted(block, key=order.get)) for block in blocks if len(block) > 1]
+    return sorted(groups, key=lambda group: order[group[0]])
+
+
+def minimize(automata_def: Dict[str, Any], groups: Sequence[Tuple[str, ...]] = None) -> Dict[str, Any]:
+    """
+    Erişilemeyen durumları atar ve eşdeğer durumları birleştirir.
+
+    NFA tanımları yalnızca budanır; küçültme DFA'ya dönüştürmeden sonra anlamlıdır.
+
+    Args:
+        automata_def: Otomata tanımı (değiştirilmez)
+        groups: Önceden hesaplanmış eşdeğer durum grupları (ör. AutomataReport.equivalent)
+
+    Returns:
+        Küçültülmüş tanım; birleşen durumlar "state_sets" eşlemesinde
+        (korunan durum -> özgün durumlar) tutulur
+    """
+    reachable = reachable_states(automata_def)
+    representative = {state_id: state_id for state_id in reachable}
+    if groups is None and automata_def.get("type", "dfa") == "dfa":
+        groups = equivalent_state_groups(automata_def, reachable)
+    for group in groups or ():
+        for state_id in group:
+            representative[state_id] = group[0]
+
+    states = automata_def.get("states", {})
+    state_sets: Dict[str, List[str]] = {}
+    for state_id in reachable:
+        state_sets.setdefault(representative[state_id], []).append(state_id)
+
+    transitions, seen = [], set()
+    for transition in automata_def.get("transitions", []):
+        from_state = transition.get("from")
+        if representative.get(from_state) != from_state:
+            continue  # Erişilemeyen ya da birleşen durumun geçişi
+        transition = dict(transition, to=representative.get(transition.get("to"), transition.get("to")))
+        key = tuple(sorted((name, value) for name, value in transition.items() if isinstance(value, str)))
+        if key not in seen:
+            seen.add(key)
+            transitions.append(transition)
+
+    minimized = dict(automata_def)
+    minimized["states"] = {state_id: states[state_id] for state_id in state_sets}
+    minimized["transitions"] = transitions
+    initial_state = _initial_state(automata_def)
+    minimized["initial_state"] = representative.get(initial_state, initial_state)
+    minimized["state_sets"] = {state_id: tuple(members) for state_id, members in state_sets.items()}
+    return minimized
+
+
+def referenced_handlers(automata_def: Dict[str, Any]) -> Tuple[Set[str], Set[str]]:
+    """
+    Tanımda adı geçen işleyicileri döndürür.
+
+    Returns:
+        (eylemler, koşullar): onEntry/onExit/action ve condition adları
+    """
+    actions, conditions = set(), set()
+    for state_def in automata_def.get("states", {}).values():
+        actions.update(state_def[key] for key in ("onEntry", "onExit") if state_def.get(key))
+    for transition in automata_def.get("transitions", []):
+        if transition.get("action"):
+            actions.add(transition["action"])
+        if transition.get("condition"):
+            conditions.add(transition["condition"])
+    return actions, conditions
+
+
+def registered_handlers() -> Tuple[Set[str], Set[str]]:
+    """
+    automata.actions ve automata.conditions modüllerinin kaydettiği işleyici adlarını döndürür.
+
+    Returns:
+        (eylemler, koşullar)
+    """
+    from automata.actions import register_action_handlers
+    from automata.conditions import register_condition_handlers
+
+    class _Collector:
+        def __init__(self):
+            self.actions, self.conditions = set(), set()
+
+        def register_action_handler(self, name, handler):
+            self.actions.add(name)
+
+        def register_condition_handler(self, name, handler):
+            self.conditions.add(name)
+
+    collector = _Collector()
+    register_action_handlers(collector)
+    register_condition_handlers(collector)
+    return collector.actions, collector.conditions
+
+
+def unused_handlers(definitions: Iterable[Dict[str, Any]], handlers: Tuple[Set[str], Set[str]]) -> List[str]:
+    """
+    Kaydedilmiş ama verilen tanımların hiçbirinde kullanılmayan işleyicileri döndürür.
+
+    Args:
+        definitions: Otomata tanımları
+        handlers: (eylemler, koşullar) kayıtlı işleyici adları
+    """
+    used_actions, used_conditions = set(), set()
+    for automata_def in definitions:
+        actions, conditions = referenced_handlers(automata_def)
+        used_actions |= actions
+        used_conditions |= conditions
+    return sorted((handlers[0] - used_actions) | (handlers[1] - used_conditions))
+
+
+def analyze(automata_def: Dict[str, Any], handlers: Tuple[Set[str], Set[str]] = None) -> AutomataReport:
+    """
+    Otomata tanımını analiz eder.
+
+    Args:
+        automata_def: Otomata tanımı
+        handlers: (eylemler, koşullar) kayıtlı işleyici adları; None ise işleyiciler denetlenmez
+
+    Returns:
+        AutomataReport
+    """
+    report = AutomataReport(automata_def.get("id"))
+    report.reachable = reachable_states(automata_def)
+    reachable = set(report.reachable)
+    report.unreachable = [state_id for state_id in automata_def.get("states", {}) if state_id not in reachable]
+    report.dead = dead_states(automata_def, report.reachable)
+    if automata_def.get("type", "dfa") == "dfa":
+        report.equivalent = equivalent_state_groups(automata_def, report.reachable)
+
+    events, fireable = [], set()
+    for transition in automata_def.get("transitions", []):
+        event = transition.get("event")
+        if event not in events:
+            events.append(event)
+        if transition.get("from") in reachable:
+            fireable.add(event)
+    report.unused_events = [event for event in events if event not in fireable]
+
+    if handlers is not None:
+        actions, conditions = referenced_handlers(automata_def)
+        report.missing_handlers = sorted((actions - handlers[0]) | (conditions - handlers[1]))
+    return report
+
+
+if __name__ == "__main__":
+    # Örnek: python -m automata.analysis
+    import glob
+    import os
+
+    from automata.automata_loader import AutomataLoader
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = sorted(glob.glob(os.path.join(base_dir, "dfa", "*.xml")) + glob.glob(os.path.join(base_dir, "nfa", "*.xml")))
+    logging.disable(logging.WARNING)
+    definitions = AutomataLoader().load_automatas(paths)
+    logging.disable(logging.NOTSET)
+    known = registered_handlers()
+    for automata_id, definition in definitions.items():
+        report = analyze(definition, known)
+        smaller = minimize(definition)
+        print(f"{automata_id}: {len(definition['states'])} -> {len(smaller['states'])} durum, "
+              f"{len(definition['transitions'])} -> {len(smaller['transitions'])} geçiş")
+        for message in report.warnings():
+            print(f"    {message}")
+    print(f"Kullanılmayan işleyiciler: {', '.join(unused_handlers(definitions.values(), known)) or '-'}")
@@ -0,0 +1,299 @@
+"""
+Asenkron otomata işleme motoru.
+
+Bu modül, AutomataEngine'in asyncio ile çalışan bir türevini içerir.
+Eylem ve koşul işleyicileri normal fonksiyon ya da coroutine olabilir;
+coroutine sonuçları beklenir. Bir geçişin eylemleri üç sınıfa ayrılır:
+
+    sıralı        onExit -> action -> onEntry sırasıyla tek tek beklenir
+    eşzamanlı     Art arda gelen eşzamanlı eylemler asyncio.gather ile birlikte çalışır
+    ertelenmiş    Sınırlı bir kuyruğa eklenir ve arka plan işçilerince çalıştırılır;
+                  olay işleme bu eylemleri beklemez (ör. bildirimler)
+
+Varsayılan sınıflar automata.actions modülündeki CONCURRENT_ACTIONS ve
+DEFERRED_ACTIONS kümelerinden gelir; register_action_handler ile eylem
+başına değiştirilebilir.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from automata.actions import CONCURRENT_ACTIONS, DEFERRED_ACTIONS
+from automata.compiled import CompiledAutomata
+from automata.engine import AutomataEngine
+
+logger = logging.getLogger(__name__)
+
+
+async def _call(handler: Callable, context: Dict[str, Any]) -> Any:
+    """İşleyiciyi çağırır; sonuç beklenebilirse bekler"""
+    result = handler(context)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class AsyncAutomataEngine(AutomataEngine):
+    """
+    Coroutine işleyicileri bekleyen ve bildirim eylemlerini erteleyen otomata motoru.
+    """
+
+    def __init__(self, automata_def: Union[Dict[str, Any], CompiledAutomata],
+                 deferred_queue_size: int = 1000, deferred_workers: int = 4, **kwargs):
+        """
+        AsyncAutomataEngine sınıfını başlatır.
+
+        Args:
+            automata_def: Otomata tanımını içeren sözlük veya önceden derlenmiş tanım
+            deferred_queue_size: Çalıştırılmayı bekleyebilecek en fazla ertelenmiş eylem
+            deferred_workers: Ertelenmiş eylemleri çalıştıran işçi sayısı
+            **kwargs: AutomataEngine parametreleri (history_size, history_spill, journal)
+        """
+        super().__init__(automata_def, **kwargs)
+        self.concurrent_actions = set(CONCURRENT_ACTIONS)
+        self.deferred_actions = set(DEFERRED_ACTIONS)
+        self.deferred_queue_size = deferred_queue_size
+        self.deferred_workers = deferred_workers
+        self.deferred_dropped = 0
+        self.deferred_failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._lock: Optional[asyncio.Lock] = None  # Geçişler sırayla uygulanır
+
+    def register_action_handler(self, action_name: str, handler: Callable,
+                                concurrent: bool = None, deferred: bool = None) -> None:
+        """
+        Eylem işleyici fonksiyonu (veya coroutine fonksiyonu) kaydeder.
+
+        Args:
+            action_name: Eylem adı
+            handler: Eylemi gerçekleştirecek fonksiyon
+            concurrent: True ise aynı geçişteki diğer eşzamanlı eylemlerle birlikte çalışır
+            deferred: True ise geçiş beklemeden ertelenmiş eylem kuyruğunda çalışır
+        """
+        super().register_action_handler(action_name, handler)
+        for flag, names in ((concurrent, self.concurrent_actions), (deferred, self.deferred_actions)):
+            if flag is True:
+                names.add(action_name)
+            elif flag is False:
+                names.discard(action_name)
+
+    # ------------------------------------------------------------------
+    # Ertelenmiş eylemler
+    # ------------------------------------------------------------------
+
+    def _ensure_workers(self) -> None:
+        # Kuyruk ve işçiler çalışan olay döngüsünde ilk ihtiyaçta oluşturulur
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.deferred_queue_size)
+            self._workers = [asyncio.create_task(self._worker(), name=f"{self.id}-deferred-{index}")
+                             for index in range(self.deferred_workers)]
+
+    async def _worker(self) -> None:
+        while True:
+            action_name, handler, context = await self._queue.get()
+            try:
+                await _call(handler, context)
+            except Exception as e:
+                self.deferred_failed += 1
+                logger.error(f"{self.name}: ertelenmiş '{action_name}' eylemi sırasında hata: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _defer(self, action_name: str, handler: Callable, context: Dict[str, Any]) -> None:
+        """Eylemi kuyruğa ekler; kuyruk doluysa eylem atılır ve sayılır, olay işleme beklemez"""
+        self._ensure_workers()
+        try:
+            # Bağlamın kopyası: çağıran bağlamı sonradan değiştirebilir
+            self._queue.put_nowait((action_name, handler, dict(context)))
+        except asyncio.QueueFull:
+            self.deferred_dropped += 1
+            logger.warning(f"{self.name}: ertelenmiş eylem kuyruğu dolu, '{action_name}' atıldı")
+
+    async def drain(self) -> None:
+        """Kuyruktaki tüm ertelenmiş eylemler bitene kadar bekler"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self, drain: bool = True) -> None:
+        """
+        Ertelenmiş eylem işçilerini durdurur.
+
+        Args:
+            drain: True ise önce kuyruktaki eylemlerin bitmesi beklenir
+        """
+        if self._queue is None:
+            return
+        if drain:
+            await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._queue, self._workers = None, []
+
+    # ------------------------------------------------------------------
+    # Olay işleme
+    # ------------------------------------------------------------------
+
+    async def _evaluate_condition_async(self, condition: str, context: Dict[str, Any]) -> bool:
+        """Koşulu değerlendirir; kayıtlı olmayan koşul sağlanmamış sayılır"""
+        handler = self.condition_handlers.get(condition)
+        if handler is None:
+            return False
+        try:
+            return bool(await _call(handler, context))
+        except Exception as e:
+            logger.error(f"Koşul değerlendirmesi sırasında hata: {str(e)}")
+            return False
+
+    async def _run_group(self, group: List[Tuple[str, Callable]], context: Dict[str, Any]) -> None:
+        if len(group) == 1:
+            results = [None]
+            try:
+                await _call(group[0][1], context)
+            except Exception as e:
+                results[0] = e
+        else:
+            results = await asyncio.gather(*(_call(handler, context) for _, handler in group),
+                                           return_exceptions=True)
+        for (action_name, _), result in zip(group, results):
+            if isinstance(result, Exception):
+                logger.error(f"{self.name}: '{action_name}' eylemi sırasında hata: {str(result)}")
+
+    async def _apply_transition_async(self, transition: Dict[str, Any], context: Dict[str, Any]) -> None:
+        """
+        Geçişi uygular: onExit, geçiş eylemi, durum güncellemesi, onEntry.
+
+        Sıralı eylemler bu sırayla beklenir. Ertelenmiş eylemler kuyruğa
+        eklenir. Eşzamanlı eylemler biriktirilir ve bir sonraki sıralı
+        eylemden önce ya da geçiş sonunda birlikte çalıştırılır; motor
+        durumuna bağlı olmadıkları için durum güncellemesini beklemezler.
+        """
+        from_state, to_state, event = transition.get("from"), transition.get("to"), transition.get("event")
+        steps = (
+            (False, self.compiled.states.get(from_state, {}).get("onExit")),
+            (False, transition.get("action")),
+            (True, self.compiled.states.get(to_state, {}).get("onEntry")),
+        )
+
+        group: List[Tuple[str, Callable]] = []
+        for is_entry, action_name in steps:
+            if is_entry:
+                # Durum güncellemesi (from_state'i kaldır, to_state'i ekle)
+                if self.type == "dfa":
+                    self.current_states.clear()
+                else:
+                    self.current_states.discard(from_state)
+                self.current_states.add(to_state)
+                self.state_history.append(time.time(), from_state, to_state, self.compiled.event_ids[event])
+
+            handler = self.action_handlers.get(action_name) if action_name else None
+            if handler is None:
+                continue
+            if action_name in self.deferred_actions:
+                self._defer(action_name, handler, context)
+            elif action_name in self.concurrent_actions:
+                group.append((action_name, handler))
+            else:
+                if group:
+                    await self._run_group(group, context)
+                    group = []
+                await self._run_group([(action_name, handler)], context)
+        if group:
+            await self._run_group(group, context)
+
+        logger.info(f"Durum geçişi: {from_state} -> {to_state} (olay: {event})")
+
+    async def trigger_event(self, event: str, context: Dict[str, Any] = None) -> bool:
+        """
+        Olayı işler: koşulu sağlanan ilk geçişi bulur ve eylemleriyle uygular.
+
+        Args:
+            event: Tetiklenecek olay
+            context: Olay bağlamı (eylem ve koşul işleyicilerine geçirilir)
+
+        Returns:
+            bool: Geçiş yapıldıysa True, aksi halde False
+        """
+        context = context or {}
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self.current_states:
+                logger.warning(f"{self.name}: Mevcut durum bulunamadı")
+                return False
+            current_state_id = next(iter(self.current_states))
+
+            for transition in self.compiled.transitions_for(current_state_id, event):
+                condition = transition.get("condition")
+                if condition and not await self._evaluate_condition_async(condition, context):
+                    continue
+                await self._apply_transition_async(transition, context)
+                return True
+
+            logger.warning(f"{self.name}: '{current_state_id}' durumundan '{event}' olayı için geçiş yok")
+            return False
+
+
+async def benchmark_dispatch_latency(automata_def: Dict[str, Any], events: int = 200,
+                                     io_delay: float = 0.005) -> Dict[str, float]:
+    """
+    Bildirim G/Ç'si içeren eylemlerle olay işleme gecikmesini ölçer.
+
+    Tanımdaki tüm eylemlere io_delay saniye bekleyen bir coroutine kaydedilir;
+    önce hepsi sıralı, sonra DEFERRED_ACTIONS/CONCURRENT_ACTIONS sınıflarıyla çalıştırılır.
+
+    Returns:
+        {"sequential_ms", "async_ms"}: Olay başına ortalama gecikme
+    """
+    compiled = CompiledAutomata(automata_def)
+
+    async def slow_action(context):
+        await asyncio.sleep(io_delay)
+
+    actions = {state.get(key) for state in compiled.states.values() for key in ("onEntry", "onExit")}
+    actions |= {transition.get("action") for transitions in compiled.transitions.values()
+                for transition in transitions}
+    actions.discard(None)
+
+    results = {}
+    logging.disable(logging.WARNING)
+    try:
+        for name, classify in (("sequential", False), ("async", True)):
+            engine = AsyncAutomataEngine(automata_def, deferred_queue_size=events * 4)
+            for action_name in actions:
+                engine.register_action_handler(action_name, slow_action,
+                                               concurrent=None if classify else False,
+                                               deferred=None if classify else False)
+            for condition in {transition.get("condition") for transitions in compiled.transitions.values()
+                              for transition in transitions} - {None}:
+                engine.register_condition_handler(condition, lambda context: True)
+
+            start = time.perf_counter()
+            for _ in range(events):
+                choices = engine.get_possible_events()
+                if not choices or not await engine.trigger_event(choices[0]):
+                    engine.reset()
+            results[f"{name}_ms"] = (time.perf_counter() - start) * 1000 / events
+            await engine.close()
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+
+if __name__ == "__main__":
+    # Örnek: python -m automata.async_engine
+    import os
+
+    from automata.automata_loader import AutomataLoader
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    logging.disable(logging.WARNING)
+    definition = AutomataLoader().load_automata(os.path.join(base_dir, "dfa", "charge_station_dfa.xml"))
+    logging.disable(logging.NOTSET)
+    stats = asyncio.run(benchmark_dispatch_latency(definition))
+    print(f"Olay başına gecikme: sıralı {stats['sequential_ms']:.2f} ms  "
+          f"eşzamanlı/ertelenmiş {stats['async_ms']:.2f} ms")
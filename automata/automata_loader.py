@@ -10,18 +10,25 @@ import logging
 import xml.etree.ElementTree as ET
 from typing import Dict, Any, List, Optional, Tuple
 
+from automata.analysis import AutomataReport, analyze, minimize, registered_handlers, unused_handlers
+from automata.definition_cache import AutomataDefinitionCache
+
 logger = logging.getLogger(__name__)
 
 class AutomataLoader:
     """XML dosyalarından otomata tanımlarını yükleyen sınıf."""
     
-    def __init__(self, base_dir: str = None):
+    def __init__(self, base_dir: str = None, cache_path: str = None, minimize: bool = False):
         """
         AutomataLoader sınıfını başlatır.
         
         Args:
             base_dir: Otomata XML dosyalarının bulunduğu ana dizin.
                       None ise, server/automata klasörü kullanılır.
+            cache_path: Ayrıştırılmış tanımların önbellek dosyası.
+                        None ise XML her seferinde ayrıştırılır.
+            minimize: True ise erişilemeyen durumlar atılır ve eşdeğer
+                      durumlar birleştirilir.
         """
         if base_dir is None:
             # Otomata dosyalarının varsayılan konumu
@@ -36,6 +43,14 @@ class AutomataLoader:
         # Yüklenen otomatalar için depolama
         self.loaded_automata = {}
         
+        # XML yalnızca değiştiğinde yeniden ayrıştırılır
+        self.definition_cache = AutomataDefinitionCache(cache_path) if cache_path else None
+        
+        # Yükleme sırasındaki analiz sonuçları (otomata_id -> rapor)
+        self.minimize = minimize
+        self.reports: Dict[str, AutomataReport] = {}
+        self._handlers = None
+        
     def load_all_automata(self) -> Dict[str, Any]:
         """
         Tüm DFA ve NFA otomatalarını yükler.
@@ -49,6 +64,7 @@ class AutomataLoader:
         # NFA'ları yükle
         self._load_automata_from_dir(self.nfa_dir, "nfa")
         
+        self._save_cache()
         return self.loaded_automata
         
     def _load_automata_from_dir(self, directory: str, automata_type: str) -> None:
@@ -67,7 +83,7 @@ class AutomataLoader:
             if filename.endswith(".xml") and filename != "__init__.py":
                 filepath = os.path.join(directory, filename)
                 try:
-                    automata_def = self._parse_automata_xml(filepath)
+                    automata_def = self._load_definition(filepath)
                     if automata_def:
                         automata_id = automata_def.get("id", os.path.splitext(filename)[0])
                         self.loaded_automata[automata_id] = automata_def
@@ -75,6 +91,68 @@ class AutomataLoader:
                 except Exception as e:
                     logger.error(f"{filename} dosyasını yüklerken hata: {str(e)}")
     
+    def _load_definition(self, xml_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Tanımı önbellekten döndürür; önbellek yoksa veya XML değiştiyse ayrıştırır.
+        
+        Args:
+            xml_path: Otomata XML dosyasının yolu
+            
+        Returns:
+            Otomata tanımını içeren sözlük
+        """
+        if self.definition_cache is None:
+            entry = self._parse_and_analyze(xml_path)
+        else:
+            entry = self.definition_cache.get(xml_path, self._parse_and_analyze)
+        if not entry:
+            return None
+        automata_def, report_data = entry
+        report = AutomataReport.from_dict(report_data)
+        self.reports[report.automata_id] = report
+        if self.minimize:
+            return minimize(automata_def, report.equivalent)
+        return automata_def
+    
+    def _parse_and_analyze(self, xml_path: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        XML'i ayrıştırır, tanımı analiz eder ve sorunları günlüğe yazar.
+        
+        Önbellekle kullanıldığında yalnızca XML değiştiğinde çağrılır; böylece
+        uyarılar her işçi başlangıcında tekrarlanmaz. Kayıtlı işleyiciler burada
+        denetlenmez (uygulama işleyicileri motorlara sonradan ekler); bunun için
+        AutomataEngine.get_missing_handlers() kullanılır.
+        
+        Args:
+            xml_path: Otomata XML dosyasının yolu
+            
+        Returns:
+            (tanım, analiz raporu sözlüğü) veya None
+        """
+        automata_def = self._parse_automata_xml(xml_path)
+        if not automata_def:
+            return None
+        report = analyze(automata_def)
+        for message in report.warnings():
+            logger.warning(f"{report.automata_id}: {message}")
+        return automata_def, report.as_dict()
+    
+    def get_unused_handlers(self) -> List[str]:
+        """
+        Kayıtlı olup yüklenen otomataların hiçbirinde kullanılmayan işleyicileri döndürür.
+        
+        Returns:
+            İşleyici adlarının listesi
+        """
+        if self._handlers is None:
+            self._handlers = registered_handlers()
+        return unused_handlers(self.loaded_automata.values(), self._handlers)
+    
+    def _save_cache(self) -> None:
+        """Yeni ayrıştırılan tanımları önbellek dosyasına yazar"""
+        if self.definition_cache is not None:
+            self.definition_cache.save()
+    
     def _parse_automata_xml(self, xml_path: str) -> Dict[str, Any]:
         """
         XML dosyasından otomata tanımını ayrıştırır.
@@ -118,7 +196,8 @@ class AutomataLoader:
                     state_def = {
                         "id": state_id,
                         "name": state_elem.get("name", state_id),
-                        "initial": state_elem.get("initial") == "true"
+                        "initial": state_elem.get("initial") == "true",
+                        "final": state_elem.get("final") == "true"
                     }
                     
                     # Initial state ise kaydet
@@ -208,11 +287,12 @@ class AutomataLoader:
             Yüklenen otomata tanımı veya None (hata durumunda)
         """
         try:
-            automata_def = self._parse_automata_xml(xml_path)
+            automata_def = self._load_definition(xml_path)
             if automata_def:
                 automata_id = automata_def.get("id")
                 self.loaded_automata[automata_id] = automata_def
                 logger.info(f"{automata_id} otomatası başarıyla yüklendi.")
+                self._save_cache()
                 return automata_def
         except Exception as e:
             logger.error(f"{xml_path} dosyasını yüklerken hata: {str(e)}")
@@ -231,7 +311,7 @@ class AutomataLoader:
         result = {}
         for xml_path in xml_paths:
             try:
-                automata_def = self._parse_automata_xml(xml_path)
+                automata_def = self._load_definition(xml_path)
                 if automata_def:
                     automata_id = automata_def.get("id")
                     if automata_id:
@@ -243,4 +323,5 @@ class AutomataLoader:
             except Exception as e:
                 logger.error(f"{xml_path} dosyasını yüklerken hata: {str(e)}")
         
+        self._save_cache()
         return result 
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+Derlenmiş otomata tanımı modülü.
+
+Bu modül, AutomataLoader'ın ürettiği otomata tanım sözlüğünü bir kez
+derleyerek olay işleme sırasında sabit zamanlı arama yapılabilen
+tablolara dönüştürür:
+
+    (durum, olay) -> geçişler   Olay tetiklemede kullanılır
+    durum -> olaylar            Mevcut durumda tetiklenebilecek olaylar
+
+NFA tanımları derlenmeden önce alt küme yapısıyla DFA'ya dönüştürülür;
+böylece NFA'lar da olay başına sabit zamanda çalışır.
+
+Derlenmiş tanım değiştirilmez; bu yüzden aynı tanımı çalıştıran tüm
+motorlar tarafından paylaşılabilir.
+"""
+
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from automata.determinize import determinize
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledAutomata:
+    """
+    Bir otomata tanımının sabit zamanlı geçiş tablolarını tutan sınıf.
+    """
+    __slots__ = ("definition", "id", "name", "type", "states", "initial_states",
+                 "transitions", "events_by_state", "events", "event_ids", "state_sets")
+
+    def __init__(self, automata_def: Dict[str, Any], known_events: Tuple[str, ...] = ()):
+        """
+        Otomata tanımını derler.
+
+        Args:
+            automata_def: AutomataLoader'ın ürettiği otomata tanımı
+            known_events: ID'leri korunacak olaylar (ör. yeniden yüklenen tanımın önceki sürümündeki olaylar)
+        """
+        self.definition = automata_def
+        self.id = automata_def.get("id", "unnamed_automata")
+        self.name = automata_def.get("name", self.id)
+        self.type = automata_def.get("type", "dfa")  # 'dfa' veya 'nfa'
+        if self.type == "nfa":
+            # Tablolar eşdeğer DFA'dan kurulur; tanım (definition) özgün NFA olarak kalır
+            automata_def = determinize(automata_def)
+        self.states: Dict[str, Dict[str, Any]] = automata_def.get("states", {})
+        # Durum -> özgün NFA durumları (DFA'larda her durum kendisine eşlenir)
+        self.state_sets: Dict[str, Tuple[str, ...]] = automata_def.get(
+            "state_sets", {state_id: (state_id,) for state_id in self.states})
+
+        initial_state = automata_def.get("initial_state")
+        if not initial_state:
+            # Initial state yoksa, 'initial="true"' olan ilk state kullanılır
+            initial_state = next((state_id for state_id, state_def in self.states.items()
+                                  if state_def.get("initial", False)), None)
+        self.initial_states: Tuple[str, ...] = (initial_state,) if initial_state else ()
+
+        # Geçişler tanımdaki sırayla tutulur; ilk eşleşen geçiş önceliklidir
+        transitions: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        events_by_state: Dict[str, List[str]] = {}
+        for transition in automata_def.get("transitions", []):
+            from_state, event = transition.get("from"), transition.get("event")
+            transitions.setdefault((from_state, event), []).append(transition)
+            events = events_by_state.setdefault(from_state, [])
+            if event and event not in events:
+                events.append(event)
+
+        self.transitions: Dict[Tuple[str, str], Tuple[Dict[str, Any], ...]] = {
+            key: tuple(values) for key, values in transitions.items()
+        }
+        self.events_by_state: Dict[str, Tuple[str, ...]] = {
+            state_id: tuple(events) for state_id, events in events_by_state.items()
+        }
+        # Olay ID'leri (geçmiş kayıtlarında olay adı yerine tutulur)
+        self.events: Tuple[str, ...] = tuple(dict.fromkeys(
+            list(known_events) + [event for _, event in transitions]))
+        self.event_ids: Dict[str, int] = {event: index for index, event in enumerate(self.events)}
+
+    def transitions_for(self, state_id: str, event: str) -> Tuple[Dict[str, Any], ...]:
+        """Durumdan olayla yapılabilecek geçişleri (tanım sırasıyla) döndürür"""
+        return self.transitions.get((state_id, event), ())
+
+    def events_for(self, state_id: str) -> Tuple[str, ...]:
+        """Durumda tetiklenebilecek olayları döndürür"""
+        return self.events_by_state.get(state_id, ())
+
+    def get_state(self, state_id: str) -> Optional[Dict[str, Any]]:
+        """Durum tanımını döndürür"""
+        return self.states.get(state_id)
+
+    def state_set(self, state_id: str) -> Tuple[str, ...]:
+        """Durumun karşılık geldiği özgün (NFA) durumları döndürür"""
+        return self.state_sets.get(state_id, (state_id,))
+
+
+def validate_definition(automata_def: Dict[str, Any]) -> List[str]:
+    """
+    Otomata tanımındaki yapısal hataları bulur.
+
+    Args:
+        automata_def: Otomata tanımı
+
+    Returns:
+        Hata açıklamalarının listesi (geçerli tanım için boş)
+    """
+    errors = []
+    if not automata_def.get("id"):
+        errors.append("Otomata ID'si yok")
+    states = automata_def.get("states") or {}
+    if not states:
+        errors.append("Hiç durum tanımlanmamış")
+
+    initial_state = automata_def.get("initial_state") or next(
+        (state_id for state_id, state_def in states.items() if state_def.get("initial")), None)
+    if not initial_state:
+        errors.append("Başlangıç durumu yok")
+    elif initial_state not in states:
+        errors.append(f"Başlangıç durumu '{initial_state}' tanımlı değil")
+
+    unconditional = set()
+    for index, transition in enumerate(automata_def.get("transitions", [])):
+        from_state, to_state, event = transition.get("from"), transition.get("to"), transition.get("event")
+        if not event:
+            errors.append(f"{index}. geçişin olayı yok")
+        for role, state_id in (("kaynak", from_state), ("hedef", to_state)):
+            if state_id not in states:
+                errors.append(f"{index}. geçişin {role} durumu '{state_id}' tanımlı değil")
+        if automata_def.get("type", "dfa") == "dfa" and not transition.get("condition"):
+            if (from_state, event) in unconditional:
+                errors.append(f"'{from_state}' durumunda '{event}' olayı için birden fazla koşulsuz geçiş var")
+            unconditional.add((from_state, event))
+    return errors
+
+
+def benchmark_dispatch(automata_def: Dict[str, Any], events: int = 200_000, seed: int = 1) -> Dict[str, float]:
+    """
+    Geçiş listesini taramak ile derlenmiş tabloyu kullanmayı saniyedeki olay sayısıyla karşılaştırır.
+
+    Olay dizisi, her adımda mevcut durumda tetiklenebilen olaylardan biri
+    rastgele seçilerek (rastgele yürüyüş) üretilir.
+
+    Args:
+        automata_def: Otomata tanımı
+        events: İşlenecek olay sayısı
+        seed: Rastgele yürüyüş tohumu
+
+    Returns:
+        {"scan_events_per_sec", "compiled_events_per_sec", "engine_events_per_sec"}
+    """
+    from automata.engine import AutomataEngine
+
+    compiled = CompiledAutomata(automata_def)
+    rng = random.Random(seed)
+    state = compiled.initial_states[0]
+    sequence = []
+    for _ in range(events):
+        choices = compiled.events_for(state)
+        if not choices:
+            state = compiled.initial_states[0]
+            choices = compiled.events_for(state)
+        event = rng.choice(choices)
+        sequence.append(event)
+        state = compiled.transitions_for(state, event)[0]["to"]
+
+    transition_list = automata_def.get("transitions", [])
+
+    def scan():
+        current = compiled.initial_states[0]
+        for event in sequence:
+            matches = [t for t in transition_list if t.get("from") == current and t.get("event") == event]
+            current = matches[0]["to"] if matches else compiled.initial_states[0]
+
+    def table():
+        current = compiled.initial_states[0]
+        lookup = compiled.transitions.get
+        for event in sequence:
+            matches = lookup((current, event))
+            current = matches[0]["to"] if matches else compiled.initial_states[0]
+
+    def engine():
+        automata = AutomataEngine(automata_def)
+        for event in sequence:
+            if not automata.trigger_event(event):
+                automata.reset()
+
+    results = {}
+    for name, run in (("scan", scan), ("compiled", table), ("engine", engine)):
+        start = time.perf_counter()
+        run()
+        results[f"{name}_events_per_sec"] = events / (time.perf_counter() - start)
+    logger.info(f"{compiled.id}: {results}")
+    return results
+
+
+def benchmark_session_creation(automata_def: Dict[str, Any], count: int = 200_000) -> float:
+    """
+    Paylaşılan tanımdan oturum oluşturmanın maliyetini ölçer.
+
+    Args:
+        automata_def: Otomata tanımı
+        count: Oluşturulacak oturum sayısı
+
+    Returns:
+        Oturum başına nanosaniye
+    """
+    from automata.engine import AutomataEngine
+
+    new_session = AutomataEngine(automata_def).new_session
+    start = time.perf_counter()
+    for _ in range(count):
+        new_session()
+    return (time.perf_counter() - start) * 1e9 / count
+
+
+if __name__ == "__main__":
+    # Örnek: python -m automata.compiled
+    from automata.automata_loader import AutomataLoader
+
+    logging.disable(logging.WARNING)  # Geçersiz olay uyarıları ölçümü bozmasın
+    for automata_def in AutomataLoader().load_all_automata().values():
+        stats = benchmark_dispatch(automata_def)
+        print(f"{automata_def['id']:<28} tarama {stats['scan_events_per_sec']:>12,.0f} olay/sn  "
+              f"tablo {stats['compiled_events_per_sec']:>12,.0f} olay/sn  "
+              f"motor {stats['engine_events_per_sec']:>10,.0f} olay/sn  "
+              f"oturum {benchmark_session_creation(automata_def):.0f} ns")
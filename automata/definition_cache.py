@@ -0,0 +1,161 @@
+"""
+Derlenmiş otomata tanımı önbelleği modülü.
+
+Bu modül, XML'den ayrıştırılmış otomata tanımlarını marshal ile tek bir
+küçük dosyada saklar. Her kayıt dosya yolu, değiştirilme zamanı (mtime),
+boyut ve içerik özetiyle (SHA-256) anahtarlanır:
+
+    mtime ve boyut aynı      -> XML hiç okunmaz
+    mtime farklı, özet aynı  -> XML okunur ama ayrıştırılmaz
+    özet farklı              -> XML yeniden ayrıştırılır ve önbellek güncellenir
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 3  # 2: durumlarda "final" alanı, 3: kayıtlar analiz raporunu da içerir
+
+
+class AutomataDefinitionCache:
+    """
+    Otomata tanımlarını XML dosyalarının durumuna göre saklayan sınıf.
+    """
+
+    def __init__(self, path: str):
+        """
+        AutomataDefinitionCache sınıfını başlatır ve varsa önbellek dosyasını okur.
+
+        Args:
+            path: Önbellek dosyasının yolu
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._entries: Dict[str, tuple] = self._read()
+
+    def _read(self) -> Dict[str, tuple]:
+        try:
+            with open(self.path, "rb") as cache_file:
+                data = marshal.loads(cache_file.read())
+            if isinstance(data, dict) and data.get("format") == CACHE_FORMAT:
+                return data["entries"]
+        except FileNotFoundError:
+            pass
+        except (OSError, EOFError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Otomata önbelleği okunamadı, yeniden oluşturulacak: {str(e)}")
+        return {}
+
+    def get(self, xml_path: str, parse: Callable[[str], Optional[Any]]) -> Optional[Any]:
+        """
+        XML dosyasının kaydını önbellekten döndürür; dosya değiştiyse yeniden ayrıştırır.
+
+        Args:
+            xml_path: Otomata XML dosyasının yolu
+            parse: Önbellek geçersizse çağrılacak ayrıştırıcı (xml_path -> kayıt);
+                   kayıt marshal ile yazılabilir olmalıdır (ör. tanım ve analiz raporu)
+
+        Returns:
+            Ayrıştırıcının döndürdüğü kayıt (ayrıştırıcı None döndürürse None)
+        """
+        key = os.path.abspath(xml_path)
+        stat = os.stat(key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self.hits += 1
+            return entry[3]
+
+        with open(key, "rb") as xml_file:
+            digest = hashlib.sha256(xml_file.read()).hexdigest()
+        if entry is not None and entry[2] == digest:
+            # Dosyaya dokunulmuş ama içerik aynı; yalnızca mtime güncellenir
+            definition = entry[3]
+            self.hits += 1
+        else:
+            definition = parse(xml_path)
+            self.misses += 1
+            if definition is None:
+                return None
+
+        with self._lock:
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, digest, definition)
+            self._dirty = True
+        return definition
+
+    def save(self) -> None:
+        """Değişiklik varsa önbelleği atomik olarak (geçici dosya + yeniden adlandırma) yazar"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = marshal.dumps({"format": CACHE_FORMAT, "entries": self._entries})
+            self._dirty = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as cache_file:
+                cache_file.write(data)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Otomata önbelleği yazılamadı: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+def benchmark_startup(xml_paths: Sequence[str], cache_path: str, repeat: int = 50) -> Dict[str, float]:
+    """
+    Otomata tanımlarını XML'den ayrıştırmak ile önbellekten yüklemeyi karşılaştırır.
+
+    Her tekrar yeni bir yükleyici (yeni bir işçi sürecinin başlangıcı gibi) oluşturur.
+
+    Args:
+        xml_paths: Yüklenecek XML dosyaları
+        cache_path: Ölçümde kullanılacak (geçici) önbellek dosyası
+        repeat: Tekrar sayısı
+
+    Returns:
+        {"xml_ms", "cached_ms"}: Tekrar başına tüm tanımların yüklenme süresi
+    """
+    from automata.automata_loader import AutomataLoader
+
+    logging.disable(logging.WARNING)  # Analiz uyarıları yalnızca ilk ayrıştırmada yazılır
+    try:
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        AutomataLoader(cache_path=cache_path).load_automatas(xml_paths)  # Önbelleği doldur
+
+        results = {}
+        for name, loader_cache in (("xml", None), ("cached", cache_path)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                AutomataLoader(cache_path=loader_cache).load_automatas(xml_paths)
+            results[f"{name}_ms"] = (time.perf_counter() - start) * 1000 / repeat
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+
+if __name__ == "__main__":
+    # Örnek: python -m automata.definition_cache
+    import glob
+    import tempfile
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = sorted(glob.glob(os.path.join(base_dir, "dfa", "*.xml")) + glob.glob(os.path.join(base_dir, "nfa", "*.xml")))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        stats = benchmark_startup(paths, os.path.join(temp_dir, "automata_definitions.cache"))
+    print(f"{len(paths)} tanım: XML {stats['xml_ms']:.2f} ms  önbellek {stats['cached_ms']:.2f} ms  "
+          f"({stats['xml_ms'] / stats['cached_ms']:.1f}x)")
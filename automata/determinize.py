@@ -0,0 +1,201 @@
+"""
+NFA -> DFA dönüştürme (alt küme yapısı) modülü.
+
+Bu modül, AutomataLoader'ın ürettiği NFA tanımını aynı dili kabul eden
+bir DFA tanımına dönüştürür. DFA'nın her durumu NFA durumlarının bir
+kümesidir; kümeler DFA tanımındaki "state_sets" eşlemesinde saklanır ve
+raporlamada özgün durumlara geri dönmek için kullanılır:
+
+    tek elemanlı küme   -> NFA durumunun ID'si ve tanımı aynen korunur
+    çok elemanlı küme   -> "A+B" biçiminde yeni ID, eylemsiz durum
+
+Olayı olmayan geçişler epsilon geçişi sayılır. Koşullar dönüştürmede
+her zaman sağlanabilir kabul edilir (dil olaylar üzerinden tanımlanır);
+tek bir NFA geçişinden gelen DFA geçişleri koşulunu ve eylemini korur.
+"""
+
+import logging
+from collections import deque
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATE_SET_SEPARATOR = "+"
+
+
+def _epsilon_closure(states, epsilon: Dict[str, List[str]]) -> FrozenSet[str]:
+    closure = set(states)
+    stack = list(states)
+    while stack:
+        for target in epsilon.get(stack.pop(), ()):
+            if target not in closure:
+                closure.add(target)
+                stack.append(target)
+    return frozenset(closure)
+
+
+def _index_transitions(nfa_def: Dict[str, Any]):
+    """Geçişleri (durum, olay) ve epsilon tablolarına ayırır"""
+    moves: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    epsilon: Dict[str, List[str]] = {}
+    events: List[str] = []
+    for transition in nfa_def.get("transitions", []):
+        event = transition.get("event")
+        if not event:
+            epsilon.setdefault(transition.get("from"), []).append(transition.get("to"))
+            continue
+        moves.setdefault((transition.get("from"), event), []).append(transition)
+        if event not in events:
+            events.append(event)
+    return moves, epsilon, events
+
+
+def _initial_states(automata_def: Dict[str, Any]) -> List[str]:
+    states = automata_def.get("states", {})
+    initial_state = automata_def.get("initial_state") or next(
+        (state_id for state_id, state_def in states.items() if state_def.get("initial")), None)
+    return [initial_state] if initial_state else []
+
+
+def determinize(nfa_def: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    NFA tanımını alt küme yapısıyla eşdeğer DFA tanımına dönüştürür.
+
+    Yalnızca başlangıçtan erişilebilen durum kümeleri üretilir; boş küme
+    (geçiş yok) DFA'da geçiş yokluğu olarak kalır.
+
+    Args:
+        nfa_def: AutomataLoader'ın ürettiği NFA tanımı
+
+    Returns:
+        Aynı ID'ye sahip, type="dfa" olan tanım; ek olarak
+        "state_sets" (DFA durumu -> NFA durumları) eşlemesini içerir
+    """
+    nfa_states: Dict[str, Dict[str, Any]] = nfa_def.get("states", {})
+    order = {state_id: index for index, state_id in enumerate(nfa_states)}
+    moves, epsilon, events = _index_transitions(nfa_def)
+
+    def members_of(state_set: FrozenSet[str]) -> List[str]:
+        return sorted(state_set, key=lambda state_id: order.get(state_id, len(order)))
+
+    def name_of(state_set: FrozenSet[str]) -> str:
+        return STATE_SET_SEPARATOR.join(members_of(state_set))
+
+    start = _epsilon_closure(_initial_states(nfa_def), epsilon)
+    dfa_states: Dict[str, Dict[str, Any]] = {}
+    dfa_transitions: List[Dict[str, Any]] = []
+    state_sets: Dict[str, Tuple[str, ...]] = {}
+
+    queue = deque([start] if start else [])
+    seen = {start}
+    while queue:
+        state_set = queue.popleft()
+        state_id = name_of(state_set)
+        members = members_of(state_set)
+        state_sets[state_id] = tuple(members)
+        if len(members) == 1:
+            state_def = dict(nfa_states.get(state_id, {"id": state_id, "name": state_id}))
+        else:
+            state_def = {
+                "id": state_id,
+                "name": " / ".join(nfa_states.get(member, {}).get("name", member) for member in members)
+            }
+        state_def["initial"] = state_set == start
+        dfa_states[state_id] = state_def
+
+        for event in events:
+            sources = [transition for member in members for transition in moves.get((member, event), ())]
+            if not sources:
+                continue
+            target = _epsilon_closure([transition.get("to") for transition in sources], epsilon)
+            transition_def = {"from": state_id, "to": name_of(target), "event": event}
+            if len(sources) == 1:
+                for key in ("condition", "action"):
+                    if key in sources[0]:
+                        transition_def[key] = sources[0][key]
+            else:
+                # Birden fazla NFA geçişi birleşti; eylemler özgün geçişlerden okunur
+                transition_def["nfa_transitions"] = sources
+            dfa_transitions.append(transition_def)
+            if target not in seen:
+                seen.add(target)
+                queue.append(target)
+
+    dfa_def = {key: value for key, value in nfa_def.items() if key not in ("states", "transitions")}
+    dfa_def.update({
+        "type": "dfa",
+        "states": dfa_states,
+        "transitions": dfa_transitions,
+        "initial_state": name_of(start) if start else None,
+        "state_sets": state_sets,
+    })
+    logger.info(f"{nfa_def.get('id')}: {len(nfa_states)} NFA durumu -> {len(dfa_states)} DFA durumu")
+    return dfa_def
+
+
+def find_counterexample(nfa_def: Dict[str, Any], dfa_def: Dict[str, Any]) -> Optional[List[str]]:
+    """
+    NFA ile DFA'nın aynı dili kabul ettiğini doğrular.
+
+    NFA'nın durum kümesi simülasyonu ile DFA, erişilebilen tüm (küme, durum)
+    çiftleri üzerinde birlikte yürütülür. Her çiftte DFA durumunun
+    "state_sets" karşılığı simüle edilen kümeye, tetiklenebilen olaylar da
+    birbirine eşit olmalıdır. Çift sayısı sonlu olduğundan arama tamdır;
+    tüm durumlar kabul durumu olduğundan bu, dillerin eşitliği demektir.
+
+    Args:
+        nfa_def: Özgün NFA tanımı
+        dfa_def: determinize() ile üretilen DFA tanımı
+
+    Returns:
+        Farkı gösteren en kısa olay dizisi; diller eşitse None
+    """
+    moves, epsilon, events = _index_transitions(nfa_def)
+    dfa_moves = {(transition["from"], transition["event"]): transition["to"]
+                 for transition in dfa_def.get("transitions", [])}
+    dfa_events = {event for _, event in dfa_moves}
+    state_sets = dfa_def.get("state_sets", {})
+
+    start_set = _epsilon_closure(_initial_states(nfa_def), epsilon)
+    start_state = dfa_def.get("initial_state")
+    queue = deque([(start_set, start_state, [])])
+    seen = {(start_set, start_state)}
+    while queue:
+        nfa_set, dfa_state, path = queue.popleft()
+        if frozenset(state_sets.get(dfa_state, ())) != nfa_set:
+            return path
+        for event in sorted(set(events) | dfa_events):
+            target_set = _epsilon_closure(
+                [transition.get("to") for member in nfa_set for transition in moves.get((member, event), ())],
+                epsilon)
+            target_state = dfa_moves.get((dfa_state, event))
+            if not target_set and target_state is None:
+                continue
+            if not target_set or target_state is None:
+                return path + [event]
+            if (target_set, target_state) not in seen:
+                seen.add((target_set, target_state))
+                queue.append((target_set, target_state, path + [event]))
+    return None
+
+
+if __name__ == "__main__":
+    # Örnek: python -m automata.determinize
+    import glob
+    import os
+    import sys
+
+    from automata.automata_loader import AutomataLoader
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    loader = AutomataLoader()
+    failed = False
+    for path in sorted(glob.glob(os.path.join(base_dir, "nfa", "*.xml"))):
+        definition = loader.load_automata(path)
+        deterministic = determinize(definition)
+        counterexample = find_counterexample(definition, deterministic)
+        print(f"{definition['id']}: {len(definition['states'])} NFA durumu -> "
+              f"{len(deterministic['states'])} DFA durumu, "
+              + ("dil eşdeğer" if counterexample is None else f"FARK: {counterexample}"))
+        failed = failed or counterexample is not None
+    sys.exit(1 if failed else 0)
@@ -6,8 +6,13 @@ durum geçişlerini yöneten sınıfları içerir.
 """
 
 import logging
+import time
 from typing import Dict, Any, List, Callable, Optional, Union
-from datetime import datetime
+
+from automata.analysis import referenced_handlers
+from automata.compiled import CompiledAutomata
+from automata.history import HistorySpillWriter, StateHistory
+from automata.journal import AutomataJournal
 
 logger = logging.getLogger(__name__)
 
@@ -16,33 +21,38 @@ class AutomataEngine:
     Otomata tanımlarını yürüten ve durum geçişlerini yöneten sınıf.
     """
     
-    def __init__(self, automata_def: Dict[str, Any]):
+    def __init__(self, automata_def: Union[Dict[str, Any], CompiledAutomata],
+                 history_size: int = 256, history_spill: HistorySpillWriter = None,
+                 journal: AutomataJournal = None, session_history_size: int = 32):
         """
         AutomataEngine sınıfını başlatır.
         
         Args:
-            automata_def: Otomata tanımını içeren sözlük
+            automata_def: Otomata tanımını içeren sözlük veya önceden derlenmiş tanım
+            history_size: Bellekte tutulacak en fazla geçiş sayısı
+            history_spill: Tampondan taşan geçişlerin yazılacağı yazıcı (None ise atılır)
+            journal: Anahtarlı oturumların geçişlerinin yazılacağı kalıcı günlük
+            session_history_size: Her oturumun bellekte tuttuğu en fazla geçiş sayısı
         """
-        self.automata_def = automata_def
-        self.id = automata_def.get("id", "unnamed_automata")
-        self.name = automata_def.get("name", self.id)
-        self.type = automata_def.get("type", "dfa")  # 'dfa' veya 'nfa'
+        if isinstance(automata_def, CompiledAutomata):
+            self.compiled = automata_def
+        else:
+            self.compiled = CompiledAutomata(automata_def)
+        self.automata_def = self.compiled.definition
+        self.id = self.compiled.id
+        self.name = self.compiled.name
+        self.type = self.compiled.type  # 'dfa' veya 'nfa'
         
         # Mevcut durum ve geçmiş
-        self.current_states = set()  # NFA'lar için çoklu durum desteği
-        initial_state = automata_def.get("initial_state")
+        self.current_states = set(self.compiled.initial_states)  # NFA'lar için çoklu durum desteği
         
-        if initial_state:
-            self.current_states.add(initial_state)
-        else:
-            # Initial state yoksa, 'initial="true"' olan bir state bul
-            for state_id, state_def in automata_def.get("states", {}).items():
-                if state_def.get("initial", False):
-                    self.current_states.add(state_id)
-                    break
+        # Durum geçiş geçmişi (sabit boyutlu halka tampon)
+        self.state_history = StateHistory(history_size, self.compiled.events, name=self.id,
+                                          spill=history_spill)
+        self.session_history_size = session_history_size
         
-        # Durum geçiş geçmişi
-        self.state_history = []
+        # Anahtarlı oturumlar yeniden başlatmadan sonra bu günlükten devam eder
+        self.journal = journal
         
         # Eylem işleyicileri (callbacks)
         self.action_handlers = {}
@@ -81,6 +91,18 @@ class AutomataEngine:
         """
         self.event_handlers[event_name] = handler
     
+    def get_missing_handlers(self) -> List[str]:
+        """
+        Tanımda adı geçen ama bu motora kaydedilmemiş eylem ve koşul işleyicilerini döndürür.
+        
+        İşleyiciler kaydedildikten sonra çağrılmalıdır.
+        
+        Returns:
+            İşleyici adlarının sıralı listesi
+        """
+        actions, conditions = referenced_handlers(self.automata_def)
+        return sorted((actions - set(self.action_handlers)) | (conditions - set(self.condition_handlers)))
+    
     def trigger_event(self, event: str, context: Dict[str, Any] = None) -> bool:
         """
         Otomata için bir olay tetikler ve durum geçişi yapar.
@@ -102,12 +124,8 @@ class AutomataEngine:
         
         current_state_id = next(iter(self.current_states))
         
-        # Mevcut durum için geçerli geçişleri bul
-        valid_transitions = []
-        
-        for transition in self.automata_def.get("transitions", []):
-            if transition.get("from") == current_state_id and transition.get("event") == event:
-                valid_transitions.append(transition)
+        # Mevcut durum için geçerli geçişleri bul (derlenmiş tablodan sabit zamanda)
+        valid_transitions = self.compiled.transitions_for(current_state_id, event)
         
         if not valid_transitions:
             logger.warning(f"{self.name}: '{current_state_id}' durumundan '{event}' olayı için geçiş yok")
@@ -122,15 +140,8 @@ class AutomataEngine:
         self.current_states.clear()
         self.current_states.add(target_state_id)
         
-        # Geçiş geçmişini güncelle
-        transition_info = {
-            "from": prev_state,
-            "to": target_state_id,
-            "event": event,
-            "timestamp": datetime.now().isoformat(),
-            "context": context
-        }
-        self.state_history.append(transition_info)
+        # Geçiş geçmişini güncelle (bağlam saklanmaz)
+        self.state_history.append(time.time(), prev_state, target_state_id, self.compiled.event_ids[event])
         
         logger.info(f"{self.name}: '{prev_state}' -> '{target_state_id}' ({event})")
         return True
@@ -152,7 +163,7 @@ class AutomataEngine:
             event = transition.get("event")
             
             # Çıkış olayını işle (from_state için onExit)
-            from_state_def = self.automata_def.get("states", {}).get(from_state, {})
+            from_state_def = self.compiled.states.get(from_state, {})
             on_exit = from_state_def.get("onExit")
             if on_exit and on_exit in self.action_handlers:
                 self.action_handlers[on_exit](context)
@@ -171,19 +182,13 @@ class AutomataEngine:
             self.current_states.add(to_state)
             
             # Giriş olayını işle (to_state için onEntry)
-            to_state_def = self.automata_def.get("states", {}).get(to_state, {})
+            to_state_def = self.compiled.states.get(to_state, {})
             on_entry = to_state_def.get("onEntry")
             if on_entry and on_entry in self.action_handlers:
                 self.action_handlers[on_entry](context)
             
             # Geçiş geçmişine ekle
-            transition_record = {
-                "timestamp": datetime.now().isoformat(),
-                "from": from_state,
-                "to": to_state,
-                "event": event
-            }
-            self.state_history.append(transition_record)
+            self.state_history.append(time.time(), from_state, to_state, self.compiled.event_ids[event])
             
             logger.info(f"Durum geçişi: {from_state} -> {to_state} (olay: {event})")
             return True
@@ -221,7 +226,9 @@ class AutomataEngine:
         if self.type == "dfa":
             return next(iter(self.current_states)) if self.current_states else None
         else:
-            return list(self.current_states)
+            # Determinize edilmiş durum, özgün NFA durum kümesi olarak raporlanır
+            return [nfa_state for state_id in self.current_states
+                    for nfa_state in self.compiled.state_set(state_id)]
     
     def get_current_state_name(self) -> str:
         """
@@ -236,7 +243,7 @@ class AutomataEngine:
             return "UNKNOWN"
         
         # State bilgisini al
-        state_def = self.automata_def.get("states", {}).get(current_state_id, {})
+        state_def = self.compiled.states.get(current_state_id, {})
         
         # Durum adını döndür
         return state_def.get("name", current_state_id)
@@ -253,15 +260,8 @@ class AutomataEngine:
         
         current_state_id = next(iter(self.current_states))
         
-        # Mevcut durumdan yapılabilecek tüm geçişlerin olaylarını topla
-        events = []
-        for transition in self.automata_def.get("transitions", []):
-            if transition.get("from") == current_state_id:
-                event = transition.get("event")
-                if event and event not in events:
-                    events.append(event)
-        
-        return events
+        # Mevcut durumdan yapılabilecek tüm geçişlerin olayları (tanım sırasıyla)
+        return list(self.compiled.events_for(current_state_id))
     
     def get_state_history(self) -> List[Dict[str, Any]]:
         """
@@ -270,26 +270,57 @@ class AutomataEngine:
         Returns:
             Durum geçişlerinin kronolojik listesi
         """
-        return self.state_history
+        return self.state_history.as_dicts()
     
     def reset(self) -> None:
         """
         Otomatayı başlangıç durumuna sıfırlar.
         """
         self.current_states.clear()
-        initial_state = self.automata_def.get("initial_state")
+        self.current_states.update(self.compiled.initial_states)
         
-        if initial_state:
-            self.current_states.add(initial_state)
-        else:
-            # Initial state yoksa, 'initial="true"' olan bir state bul
-            for state_id, state_def in self.automata_def.get("states", {}).items():
-                if state_def.get("initial", False):
-                    self.current_states.add(state_id)
-                    break
-        
-        self.state_history = []
+        self.state_history.clear()
         logger.info(f"{self.name} otomatası sıfırlandı. Yeni durum: {self.current_states}")
+
+    def swap_definition(self, compiled: CompiledAutomata) -> None:
+        """
+        Derlenmiş tanımı atomik olarak değiştirir.
+        
+        Yeni oturumlar yeni tanımı kullanır; devam eden oturumlar oluşturuldukları
+        tanımı tutmaya devam eder. Motorun mevcut durumu yeni tanımda yoksa
+        motor başlangıç durumuna döner.
+        
+        Args:
+            compiled: Aynı otomata ID'sine sahip yeni derlenmiş tanım
+        
+        Raises:
+            ValueError: Tanımın ID'si motorunkiyle aynı değilse
+        """
+        if compiled.id != self.id:
+            raise ValueError(f"'{compiled.id}' tanımı '{self.id}' motoruna yüklenemez")
+        
+        self.state_history.events = compiled.events
+        self.compiled = compiled
+        self.automata_def = compiled.definition
+        self.name = compiled.name
+        self.type = compiled.type
+        
+        if not any(state_id in compiled.states for state_id in self.current_states):
+            self.current_states = set(compiled.initial_states)
+        logger.info(f"{self.name} otomatasının tanımı güncellendi. Mevcut durum: {self.current_states}")
+    
+    def new_session(self, key: str = None) -> "AutomataSession":
+        """
+        Bu motorun derlenmiş tanımını ve işleyicilerini paylaşan yeni bir oturum oluşturur.
+        
+        Args:
+            key: Oturum anahtarı; motorun günlüğü varsa geçişler bu anahtarla
+                 kaydedilir ve aynı anahtarlı oturum kaldığı durumdan devam eder
+        
+        Returns:
+            AutomataSession (günlükte kaydı yoksa başlangıç durumunda)
+        """
+        return AutomataSession(self, key)
         
     def get_state_metadata(self, state_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -301,7 +332,110 @@ class AutomataEngine:
         Returns:
             Durum metadata'sı veya None
         """
-        state_def = self.automata_def.get("states", {}).get(state_id)
+        state_def = self.compiled.states.get(state_id)
         if state_def:
             return state_def.get("metadata", {})
-        return None 
\ No newline at end of file
+        return None
+
+
+class AutomataSession:
+    """
+    Tek bir iş akışının (ör. bir öneri isteğinin) otomata durumunu tutan hafif sınıf.
+    
+    Derlenmiş tanım ve işleyiciler motorla paylaşılır ve değiştirilmez;
+    oturum yalnızca kendi durumunu ve geçmişini tutar. Her istek kendi
+    oturumunu oluşturduğu için oturumlar arasında paylaşılan değişken
+    durum yoktur.
+    """
+    __slots__ = ("engine", "compiled", "current_state", "history", "key", "journal")
+    
+    def __init__(self, engine: AutomataEngine, key: str = None):
+        """
+        AutomataSession sınıfını başlatır.
+        
+        Args:
+            engine: Derlenmiş tanımı ve işleyicileri sağlayan motor
+            key: Kalıcı günlükte kullanılacak oturum anahtarı (None ise kaydedilmez)
+        """
+        self.engine = engine
+        self.compiled = engine.compiled
+        initial_states = self.compiled.initial_states
+        self.current_state = initial_states[0] if initial_states else None
+        self.history = None  # İlk geçişte oluşturulur (son session_history_size geçiş)
+        self.key = key
+        self.journal = engine.journal if key is not None else None
+        if self.journal is not None:
+            saved_state = self.journal.state_of(key)
+            if saved_state in self.compiled.states:
+                self.current_state = saved_state
+    
+    def trigger_event(self, event: str, context: Dict[str, Any] = None) -> bool:
+        """
+        Oturum için bir olay tetikler ve durum geçişi yapar.
+        
+        Args:
+            event: Tetiklenecek olay
+            context: Olay bağlamı (geçmişe yazılmaz)
+            
+        Returns:
+            bool: Olay tetiklendiyse True, aksi halde False
+        """
+        current_state_id = self.current_state
+        if current_state_id is None:
+            logger.warning(f"{self.compiled.name}: Mevcut durum bulunamadı")
+            return False
+        
+        valid_transitions = self.compiled.transitions.get((current_state_id, event))
+        if not valid_transitions:
+            logger.warning(f"{self.compiled.name}: '{current_state_id}' durumundan '{event}' olayı için geçiş yok")
+            return False
+        
+        target_state_id = valid_transitions[0].get("to")
+        self.current_state = target_state_id
+        
+        if self.history is None:
+            # Uzun ömürlü anahtarlı oturumlarda geçmiş sınırsız büyümesin; taşan kayıtlar atılır
+            self.history = StateHistory(self.engine.session_history_size, self.compiled.events)
+        self.history.append(time.time(), current_state_id, target_state_id, self.compiled.event_ids[event])
+        if self.journal is not None:
+            self.journal.record(self.key, current_state_id, target_state_id, event)
+        
+        logger.info(f"{self.compiled.name}: '{current_state_id}' -> '{target_state_id}' ({event})")
+        return True
+    
+    def get_current_state(self) -> Optional[str]:
+        """Mevcut durumu döndürür"""
+        return self.current_state
+    
+    def get_current_state_name(self) -> str:
+        """Mevcut durumun adını döndürür"""
+        if self.current_state is None:
+            return "UNKNOWN"
+        return self.compiled.states.get(self.current_state, {}).get("name", self.current_state)
+    
+    def get_possible_events(self) -> List[str]:
+        """Mevcut durumda tetiklenebilecek olayları listeler"""
+        return list(self.compiled.events_for(self.current_state))
+    
+    def get_state_history(self) -> List[Dict[str, Any]]:
+        """
+        Durum geçiş geçmişini motorla aynı biçimde döndürür.
+        
+        Returns:
+            Durum geçişlerinin kronolojik listesi
+        """
+        return self.history.as_dicts() if self.history is not None else []
+    
+    def reset(self) -> None:
+        """Oturumu başlangıç durumuna sıfırlar"""
+        initial_states = self.compiled.initial_states
+        self.current_state = initial_states[0] if initial_states else None
+        self.history = None
+        if self.journal is not None:
+            self.journal.end(self.key)
+    
+    def close(self) -> None:
+        """Anahtarlı oturumun bittiğini günlüğe yazar; aynı anahtar yeniden başlangıçtan başlar"""
+        if self.journal is not None:
+            self.journal.end(self.key)
+            self.journal = None
@@ -0,0 +1,224 @@
+"""
+Dizi tabanlı filo otomatası modülü.
+
+Bu modül, aynı otomata tanımını (ör. charge_station_dfa) binlerce istasyon
+için tek tek motor nesnesi oluşturmadan çalıştırır:
+
+    targets[olay, durum]     Tamsayı kodlu geçiş matrisi (-1 = geçiş yok)
+    states[istasyon]         Her istasyonun mevcut durum kodu (NumPy dizisi)
+
+Bir olay, istasyonların herhangi bir alt kümesine tek bir vektör işlemiyle
+uygulanır. Giriş/çıkış ve geçiş eylemleri istasyon başına değil, geçiş
+türü başına bir kez, o geçişi yapan istasyonların indeksleriyle çağrılır.
+
+Koşullar, AutomataEngine.trigger_event'te olduğu gibi değerlendirilmez;
+(durum, olay) için tanımdaki ilk geçiş kullanılır.
+
+Bağımlılık: Bu modül NumPy gerektirir (requirements.txt; ``pip install numpy``).
+Uygulamanın geri kalanı NumPy'a bağlı değildir; modül yalnızca içe aktarıldığında
+gerekir.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import numpy as np
+except ImportError as e:  # İsteğe bağlı bağımlılık: yalnızca filo motoru kullanılırsa gerekir
+    raise ImportError("automata.fleet NumPy gerektirir; 'pip install numpy' ile kurun") from e
+
+from automata.compiled import CompiledAutomata
+
+logger = logging.getLogger(__name__)
+
+NO_TRANSITION = -1
+
+
+class FleetAutomata:
+    """
+    Bir otomata tanımını çok sayıda örnek için NumPy dizileri üzerinde çalıştıran sınıf.
+    """
+
+    def __init__(self, compiled: CompiledAutomata, size: int):
+        """
+        FleetAutomata sınıfını başlatır; tüm örnekler başlangıç durumunda başlar.
+
+        Args:
+            compiled: Derlenmiş otomata tanımı
+            size: Örnek (istasyon) sayısı
+        """
+        if not compiled.initial_states:
+            raise ValueError(f"{compiled.id}: başlangıç durumu yok")
+        self.compiled = compiled
+        self.state_names = tuple(compiled.states)
+        self.state_codes: Dict[str, int] = {state_id: code for code, state_id in enumerate(self.state_names)}
+        self.event_codes: Dict[str, int] = dict(compiled.event_ids)
+
+        shape = (len(compiled.events), len(self.state_names))
+        self.targets = np.full(shape, NO_TRANSITION, dtype=np.int16)
+        # Geçiş türü numarası: eylem dağıtımında grupları ayırmak için
+        self.transition_ids = np.full(shape, NO_TRANSITION, dtype=np.int32)
+        self.transitions = []
+        for (from_state, event), transitions in compiled.transitions.items():
+            transition = transitions[0]
+            if from_state not in self.state_codes or transition.get("to") not in self.state_codes:
+                continue
+            event_code, state_code = self.event_codes[event], self.state_codes[from_state]
+            self.targets[event_code, state_code] = self.state_codes[transition["to"]]
+            self.transition_ids[event_code, state_code] = len(self.transitions)
+            self.transitions.append(transition)
+
+        self.initial_code = self.state_codes[compiled.initial_states[0]]
+        self.states = np.full(size, self.initial_code, dtype=np.int16)
+        # Toplu işleyiciler: handler(indeksler, bağlam)
+        self.action_handlers: Dict[str, Callable[[np.ndarray, Dict[str, Any]], None]] = {}
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def register_action_handler(self, action_name: str, handler: Callable[[np.ndarray, Dict[str, Any]], None]) -> None:
+        """
+        Toplu eylem işleyicisi kaydeder.
+
+        Args:
+            action_name: Eylem adı
+            handler: Geçişi yapan örneklerin indeks dizisi ve bağlamla çağrılacak fonksiyon
+        """
+        self.action_handlers[action_name] = handler
+
+    def resize(self, size: int) -> None:
+        """Örnek sayısını değiştirir; yeni örnekler başlangıç durumunda başlar"""
+        current = len(self.states)
+        if size > current:
+            self.states = np.concatenate([self.states, np.full(size - current, self.initial_code, dtype=np.int16)])
+        else:
+            self.states = self.states[:size].copy()
+
+    def set_states(self, indices, state_id: str) -> None:
+        """Örneklerin durumunu doğrudan ayarlar (ör. veritabanından başlatırken)"""
+        self.states[indices] = self.state_codes[state_id]
+
+    def state_of(self, index: int) -> str:
+        """Örneğin mevcut durumunu döndürür"""
+        return self.state_names[self.states[index]]
+
+    def counts(self) -> Dict[str, int]:
+        """Durum başına örnek sayısını döndürür"""
+        counts = np.bincount(self.states, minlength=len(self.state_names))
+        return {state_id: int(count) for state_id, count in zip(self.state_names, counts)}
+
+    def _dispatch(self, action: Optional[str], indices: np.ndarray, context: Dict[str, Any]) -> None:
+        handler = self.action_handlers.get(action) if action else None
+        if handler is None:
+            return
+        try:
+            handler(indices, context)
+        except Exception as e:
+            logger.error(f"{self.compiled.name}: '{action}' eylemi sırasında hata: {str(e)}")
+
+    def apply(self, event: str, selection=None, context: Dict[str, Any] = None) -> np.ndarray:
+        """
+        Olayı seçili örneklere uygular.
+
+        Eylem sırası AutomataEngine._apply_transition ile aynıdır: her geçiş
+        türü için çıkış (onExit) ve geçiş eylemleri, ardından durumların
+        tek seferde güncellenmesi, ardından giriş (onEntry) eylemleri.
+
+        Args:
+            event: Olay adı
+            selection: İndeks dizisi, mantıksal maske veya None (tüm örnekler); tekrarlanan
+                       indeksler bir kez sayılır, her örnek olayı en fazla bir kez alır
+            context: Eylem işleyicilerine geçirilecek bağlam
+
+        Returns:
+            Geçiş yapan örneklerin artan sıralı indeksleri (geçişi olmayanlar değişmeden kalır)
+        """
+        context = context or {}
+        event_code = self.event_codes.get(event)
+        if event_code is None:
+            return np.empty(0, dtype=np.intp)
+
+        if selection is None:
+            indices = np.arange(len(self.states))
+        else:
+            indices = np.asarray(selection)
+            if indices.dtype == np.bool_:
+                indices = np.flatnonzero(indices)
+            else:
+                # Tekrarlanan indeksler işleyicileri aynı örnek için birden fazla çağırmasın
+                indices = np.unique(indices)
+
+        transition_ids = self.transition_ids[event_code, self.states[indices]]
+        moving = transition_ids != NO_TRANSITION
+        indices, transition_ids = indices[moving], transition_ids[moving]
+        if not len(indices):
+            return indices
+
+        groups = [(self.transitions[transition_id], indices[transition_ids == transition_id])
+                  for transition_id in np.unique(transition_ids)]
+        states = self.compiled.states
+
+        for transition, group in groups:
+            self._dispatch(states.get(transition["from"], {}).get("onExit"), group, context)
+            self._dispatch(transition.get("action"), group, context)
+
+        self.states[indices] = self.targets[event_code, self.states[indices]]
+
+        for transition, group in groups:
+            self._dispatch(states.get(transition["to"], {}).get("onEntry"), group, context)
+
+        logger.info(f"{self.compiled.name}: {len(indices)} örnek '{event}' ile geçiş yaptı")
+        return indices
+
+
+def benchmark_fleet(automata_def: Dict[str, Any], size: int = 100_000, sample: int = 5_000) -> Dict[str, float]:
+    """
+    Örnek başına AutomataEngine ile filo motorunu saniyedeki örnek-olay sayısıyla karşılaştırır.
+
+    Args:
+        automata_def: Otomata tanımı (ör. charge_station_dfa)
+        size: Filo motorundaki örnek sayısı
+        sample: Motor başına ölçümde kullanılacak örnek sayısı
+
+    Returns:
+        {"engine_per_sec", "fleet_per_sec"}
+    """
+    from automata.engine import AutomataEngine
+
+    compiled = CompiledAutomata(automata_def)
+    events = [event for state_id in compiled.states for event in compiled.events_for(state_id)]
+    rounds = 20
+
+    logging.disable(logging.WARNING)
+    try:
+        engines = [AutomataEngine(automata_def, history_size=16) for _ in range(sample)]
+        start = time.perf_counter()
+        for round_index in range(rounds):
+            event = events[round_index % len(events)]
+            for engine in engines:
+                engine.trigger_event(event)
+        engine_rate = sample * rounds / (time.perf_counter() - start)
+
+        fleet = FleetAutomata(compiled, size)
+        start = time.perf_counter()
+        for round_index in range(rounds):
+            fleet.apply(events[round_index % len(events)])
+        fleet_rate = size * rounds / (time.perf_counter() - start)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    return {"engine_per_sec": engine_rate, "fleet_per_sec": fleet_rate}
+
+
+if __name__ == "__main__":
+    # Örnek: python -m automata.fleet
+    import os
+
+    from automata.automata_loader import AutomataLoader
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    definition = AutomataLoader().load_automata(os.path.join(base_dir, "dfa", "charge_station_dfa.xml"))
+    stats = benchmark_fleet(definition)
+    print(f"Motor başına: {stats['engine_per_sec']:,.0f} istasyon-olay/sn  "
+          f"Filo: {stats['fleet_per_sec']:,.0f} istasyon-olay/sn")
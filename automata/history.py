@@ -0,0 +1,182 @@
+"""
+Otomata durum geçmişi modülü.
+
+Bu modül, uzun ömürlü otomata motorlarının geçiş geçmişini sabit boyutlu
+bir halka tamponda (ring buffer) tutan sınıfı ve tampondan taşan kayıtları
+arka planda sıkıştırılmış bir günlük dosyasına yazan isteğe bağlı yazıcıyı
+içerir. Her kayıt küçük bir demettir:
+
+    (zaman_damgası, önceki_durum, sonraki_durum, olay_id)
+
+Olay ID'leri derlenmiş tanımdaki olay listesinin indeksleridir.
+"""
+
+import gzip
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+HistoryEntry = Tuple[float, str, str, int]
+
+
+class StateHistory:
+    """
+    Son geçişleri sabit boyutlu halka tamponda tutan sınıf.
+    """
+    __slots__ = ("capacity", "name", "events", "spill", "_entries", "_next", "_count")
+
+    def __init__(self, capacity: int, events: Sequence[str], name: str = None,
+                 spill: "HistorySpillWriter" = None):
+        """
+        StateHistory sınıfını başlatır.
+
+        Args:
+            capacity: Tutulacak en fazla geçiş sayısı
+            events: Olay ID'si -> olay adı dizisi
+            name: Taşan kayıtlarda kullanılacak otomata adı
+            spill: Taşan kayıtların yazılacağı yazıcı (None ise taşan kayıtlar atılır)
+        """
+        self.capacity = max(1, capacity)
+        self.name = name
+        self.events = events
+        self.spill = spill
+        self._entries: List[Optional[HistoryEntry]] = [None] * self.capacity
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, from_state: str, to_state: str, event_id: int) -> None:
+        """Geçişi ekler; tampon doluysa en eski kaydın yerine yazar"""
+        index = self._next
+        if self._count == self.capacity:
+            if self.spill is not None:
+                self.spill.submit(self.name, self.events, self._entries[index])
+        else:
+            self._count += 1
+        self._entries[index] = (timestamp, from_state, to_state, event_id)
+        self._next = (index + 1) % self.capacity
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        """Kayıtları eskiden yeniye döndürür"""
+        start = (self._next - self._count) % self.capacity
+        for offset in range(self._count):
+            yield self._entries[(start + offset) % self.capacity]
+
+    def clear(self) -> None:
+        """Tamponu boşaltır (taşan kayıt olarak yazmadan)"""
+        self._entries = [None] * self.capacity
+        self._next = 0
+        self._count = 0
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Kayıtları {"from", "to", "event", "timestamp"} sözlükleri olarak döndürür.
+
+        Returns:
+            Durum geçişlerinin kronolojik listesi
+        """
+        events = self.events
+        return [
+            {"from": from_state, "to": to_state, "event": events[event_id],
+             "timestamp": datetime.fromtimestamp(timestamp).isoformat()}
+            for timestamp, from_state, to_state, event_id in self
+        ]
+
+
+class HistorySpillWriter:
+    """
+    Halka tampondan taşan geçişleri arka planda gzip günlük dosyasına ekleyen sınıf.
+
+    Olay işleme yolu yalnızca sınırlı bir kuyruğa ekleme yapar; kuyruk
+    doluysa kayıt atılır ve sayılır, çağıran asla beklemez. Her yazma
+    partisi dosyaya ayrı bir gzip üyesi olarak eklenir; ``gzip.open``
+    dosyayı tek parça olarak okuyabilir. Satır biçimi:
+
+        zaman_damgası <TAB> otomata <TAB> önceki <TAB> sonraki <TAB> olay
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, max_queue: int = 10_000, batch_size: int = 1000,
+                 flush_interval: float = 1.0, compresslevel: int = 6):
+        """
+        HistorySpillWriter sınıfını başlatır ve yazıcı iş parçacığını çalıştırır.
+
+        Args:
+            path: Günlük dosyasının yolu
+            max_queue: Yazılmayı bekleyebilecek en fazla kayıt sayısı
+            batch_size: Bir seferde dosyaya eklenecek en fazla kayıt sayısı
+            flush_interval: Bekleyen kayıtların en geç yazılma süresi (saniye)
+            compresslevel: gzip sıkıştırma seviyesi
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compresslevel = compresslevel
+        self.written = 0
+        self.dropped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="automata-history-spill", daemon=True)
+        self._thread.start()
+
+    def submit(self, name: str, events: Sequence[str], entry: HistoryEntry) -> None:
+        """Kaydı yazma kuyruğuna ekler (kuyruk doluysa kaydı atar)"""
+        try:
+            self._queue.put_nowait((name, events, entry))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            # İlk kayıttan sonra flush_interval boyunca gelenler aynı partide yazılır
+            deadline = time.monotonic() + self.flush_interval
+            batch = []
+            while True:
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch) -> None:
+        lines = []
+        for name, events, (timestamp, from_state, to_state, event_id) in batch:
+            lines.append(f"{timestamp:.6f}\t{name}\t{from_state}\t{to_state}\t{events[event_id]}\n")
+        try:
+            with gzip.open(self.path, "at", encoding="utf-8", compresslevel=self.compresslevel) as log_file:
+                log_file.writelines(lines)
+            self.written += len(lines)
+        except OSError as e:
+            self.dropped += len(lines)
+            logger.error(f"Otomata geçmişi yazılamadı: {str(e)}")
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Bekleyen kayıtları yazar ve yazıcı iş parçacığını durdurur"""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(self._STOP, timeout=timeout)
+            except queue.Full:
+                logger.warning("Otomata geçmiş kuyruğu dolu, yazıcı durdurulamadı")
+                return
+            self._thread.join(timeout)
@@ -0,0 +1,116 @@
+"""
+Otomata tanımlarını çalışırken yeniden yükleme modülü.
+
+Bu modül, otomata XML dosyalarını izleyen ve değişen tanımları arka planda
+ayrıştırıp doğrulayan bir yükleyici içerir. Doğrulanan tanım derlenir ve
+motorun derlenmiş tanımı tek bir atama ile (atomik olarak) değiştirilir:
+
+    - Yeni oturumlar yeni tanımla başlar
+    - Devam eden oturumlar oluşturuldukları tanımla tamamlanır
+    - Hatalı bir XML eski tanımı bozmaz; hata raporlanır
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+from automata.automata_loader import AutomataLoader
+from automata.compiled import CompiledAutomata, validate_definition
+
+logger = logging.getLogger(__name__)
+
+
+class AutomataReloader:
+    """
+    XML dosyalarındaki değişiklikleri motorlara uygulayan sınıf.
+    """
+
+    def __init__(self, loader: AutomataLoader, engines: Dict[str, "AutomataEngine"], xml_paths: Sequence[str]):
+        """
+        AutomataReloader sınıfını başlatır.
+
+        Args:
+            loader: Tanımları ayrıştıran (ve önbelleğe alan) yükleyici
+            engines: Otomata ID'si -> motor sözlüğü
+            xml_paths: İzlenecek XML dosyaları
+        """
+        self.loader = loader
+        self.engines = engines
+        self.xml_paths = list(xml_paths)
+        self._stamps: Dict[str, Optional[Tuple[int, int]]] = {path: self._stamp(path) for path in self.xml_paths}
+        self._lock = threading.Lock()  # Aynı anda tek yeniden yükleme
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self, force: bool = False) -> Dict[str, str]:
+        """
+        Değişen XML dosyalarını yeniden yükler.
+
+        Args:
+            force: True ise değişmemiş dosyalar da yeniden yüklenir
+
+        Returns:
+            XML yolu -> "unchanged", "reloaded" veya hata açıklaması
+        """
+        report = {}
+        with self._lock:
+            for path in self.xml_paths:
+                stamp = self._stamp(path)
+                if not force and stamp == self._stamps.get(path):
+                    report[path] = "unchanged"
+                    continue
+                report[path] = self._reload(path)
+                # Hatalı dosya da işaretlenir; bir sonraki değişikliğe kadar tekrar denenmez
+                self._stamps[path] = stamp
+        return report
+
+    def _reload(self, path: str) -> str:
+        automata_def = self.loader.load_automata(path)
+        if automata_def is None:
+            return "error: XML ayrıştırılamadı"
+
+        errors = validate_definition(automata_def)
+        if errors:
+            logger.error(f"{path} geçersiz, eski tanım kullanılmaya devam ediyor: {errors}")
+            return "error: " + "; ".join(errors)
+
+        engine = self.engines.get(automata_def["id"])
+        if engine is None:
+            return f"error: '{automata_def['id']}' için çalışan motor yok"
+
+        # Olay ID'leri korunur; eski geçmiş kayıtları yeni tanımla da doğru okunur
+        compiled = CompiledAutomata(automata_def, known_events=engine.compiled.events)
+        engine.swap_definition(compiled)
+        logger.info(f"{compiled.id} otomatası yeniden yüklendi")
+        return "reloaded"
+
+    def start(self, interval: float) -> None:
+        """Dosyaları belirtilen aralıkla denetleyen arka plan iş parçacığını başlatır"""
+        if self._thread is not None:
+            return
+
+        def watch():
+            while not self._stop.wait(interval):
+                try:
+                    self.check()
+                except Exception as e:
+                    logger.error(f"Otomata izleyicisi hatası: {str(e)}")
+
+        self._thread = threading.Thread(target=watch, name="automata-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """İzleyici iş parçacığını durdurur"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,183 @@
+"""
+Kimlik doğrulama servisi modülü.
+
+Bu modül, CPU yoğun parola özetleme (hash) işlemlerini istek iş
+parçacığından alıp sınırlı kuyruklu bir iş parçacığı havuzunda çalıştıran
+servisi ve kısa ömürlü imzalı oturum jetonlarını içerir.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from services.benchmarking import run_with_probe
+
+logger = logging.getLogger(__name__)
+
+
+class AuthServiceBusy(Exception):
+    """Kuyruk dolu olduğunda veya işlem zaman aşımına uğradığında fırlatılır"""
+
+
+class AuthService:
+    """
+    Parola özetleme ve doğrulamayı sınırlı bir havuzda çalıştıran sınıf.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64,
+                 hash_method: str = "scrypt", timeout: float = 10.0):
+        """
+        AuthService sınıfını başlatır.
+
+        Args:
+            max_workers: Aynı anda çalışan özetleme işi sayısı
+            max_queue: Bekleyebilecek en fazla iş sayısı (aşılırsa AuthServiceBusy)
+            hash_method: werkzeug parola özetleme yöntemi ve maliyeti
+                         (ör. "scrypt:32768:8:1" veya "pbkdf2:sha256:600000")
+            timeout: Bir işin sonucunu bekleme süresi (saniye)
+        """
+        self.hash_method = hash_method
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auth")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    def _run(self, func: Callable, *args) -> Any:
+        if not self._slots.acquire(blocking=False):
+            raise AuthServiceBusy("Kimlik doğrulama kuyruğu dolu")
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise AuthServiceBusy("Kimlik doğrulama zaman aşımına uğradı")
+
+    def hash_password(self, password: str) -> str:
+        """
+        Parolanın özetini havuzda hesaplar.
+
+        Args:
+            password: Düz metin parola
+
+        Returns:
+            Parola özeti
+        """
+        return self._run(generate_password_hash, password, self.hash_method)
+
+    def verify_password(self, password_hash: str, password: str) -> bool:
+        """
+        Parolayı özetle havuzda karşılaştırır.
+
+        Args:
+            password_hash: Saklanan parola özeti
+            password: Düz metin parola
+
+        Returns:
+            Parola doğruysa True
+        """
+        return self._run(check_password_hash, password_hash, password)
+
+    def shutdown(self) -> None:
+        """Havuzu kapatır"""
+        self._executor.shutdown(wait=False)
+
+
+class SessionTokens:
+    """
+    Kullanıcı ID'sini taşıyan kısa ömürlü imzalı oturum jetonları.
+    """
+
+    def __init__(self, secret_key: str, max_age: int = 900, salt: str = "voltrix-session"):
+        """
+        SessionTokens sınıfını başlatır.
+
+        Args:
+            secret_key: İmzalama anahtarı (tüm işçi süreçlerinde aynı olmalı)
+            max_age: Jetonun geçerlilik süresi (saniye)
+            salt: İmza tuzu
+        """
+        self.max_age = max_age
+        self._serializer = URLSafeTimedSerializer(secret_key, salt=salt)
+
+    def issue(self, user_id: int) -> str:
+        """
+        Kullanıcı için yeni bir jeton üretir.
+
+        Args:
+            user_id: Kullanıcı ID'si
+
+        Returns:
+            İmzalı jeton
+        """
+        return self._serializer.dumps({"uid": user_id})
+
+    def verify(self, token: str) -> Optional[int]:
+        """
+        Jetonu doğrular.
+
+        Args:
+            token: İmzalı jeton
+
+        Returns:
+            Kullanıcı ID'si veya None (geçersiz ya da süresi dolmuşsa)
+        """
+        try:
+            payload = self._serializer.loads(token, max_age=self.max_age)
+        except (BadSignature, SignatureExpired):
+            return None
+        return payload.get("uid") if isinstance(payload, dict) else None
+
+
+def benchmark_login_throughput(concurrency: int = 32, logins: int = 128,
+                               hash_method: str = "scrypt", max_workers: int = 4) -> Dict[str, Dict[str, float]]:
+    """
+    Eşzamanlı giriş fırtınasında satır içi doğrulama ile havuzlu doğrulamayı karşılaştırır.
+
+    Her iki yolda da aynı anda diğer istekleri temsil eden hafif bir yoklama
+    iş parçacığı çalışır; gecikmesi, özetleme işlerinin diğer rotaları ne
+    kadar aç bıraktığını gösterir.
+
+    Args:
+        concurrency: Eşzamanlı istemci sayısı
+        logins: Toplam giriş sayısı
+        hash_method: Parola özetleme yöntemi
+        max_workers: Havuzdaki iş parçacığı sayısı
+
+    Returns:
+        Yol adı -> {"logins_per_sec", "probe_p50_ms", "probe_p99_ms"} sözlüğü
+    """
+    password = "voltrix-benchmark"
+    password_hash = generate_password_hash(password, method=hash_method)
+    service = AuthService(max_workers=max_workers, max_queue=logins, hash_method=hash_method, timeout=300)
+
+    paths = {
+        "inline": lambda: check_password_hash(password_hash, password),
+        "pooled": lambda: service.verify_password(password_hash, password),
+    }
+
+    results = {}
+    for name, login in paths.items():
+        run = run_with_probe(login, logins, concurrency)
+        assert all(run.results)
+        results[name] = {
+            "logins_per_sec": run.calls_per_sec,
+            "probe_p50_ms": run.probe_p50_ms,
+            "probe_p99_ms": run.probe_p99_ms,
+        }
+
+    service.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    # Örnek: python -m services.auth_service
+    for path, stats in benchmark_login_throughput().items():
+        print(f"{path:<7} {stats['logins_per_sec']:.1f} giriş/sn  "
+              f"yoklama p50 {stats['probe_p50_ms']:.3f} ms  p99 {stats['probe_p99_ms']:.3f} ms")
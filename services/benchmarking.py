@@ -0,0 +1,64 @@
+"""
+Kıyaslama (benchmark) yardımcıları modülü.
+
+Servis modüllerindeki ``benchmark_*`` fonksiyonlarının ortak ölçüm düzeneğini
+içerir: bir işi eşzamanlı istemcilerle çalıştırırken diğer istekleri temsil
+eden hafif bir yoklama iş parçacığının gecikmesini ölçer. Yoklama gecikmesi,
+ölçülen işin GIL'i veya CPU'yu diğer rotalardan ne kadar aldığını gösterir.
+"""
+
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, NamedTuple
+
+
+class ProbedRun(NamedTuple):
+    """Yoklamalı eşzamanlı çalıştırmanın sonucu"""
+    results: List[Any]
+    calls_per_sec: float
+    probe_p50_ms: float
+    probe_p99_ms: float
+
+
+def run_with_probe(task: Callable[[], Any], calls: int, concurrency: int) -> ProbedRun:
+    """
+    İşi eşzamanlı istemcilerle çalıştırır ve yoklama gecikmesini ölçer.
+
+    Args:
+        task: Her çağrıda çalıştırılacak iş
+        calls: Toplam çağrı sayısı
+        concurrency: Eşzamanlı istemci sayısı
+
+    Returns:
+        İşin sonuçları, saniyedeki çağrı sayısı ve yoklama gecikmesinin p50/p99 değerleri
+    """
+    stop = threading.Event()
+    probe_latencies = []
+
+    def probe():
+        while not stop.is_set():
+            start = time.perf_counter()
+            sum(range(2000))  # Hafif bir rota işi
+            probe_latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.001)
+
+    probe_thread = threading.Thread(target=probe)
+    probe_thread.start()
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as clients:
+            results = list(clients.map(lambda _: task(), range(calls)))
+        elapsed = time.perf_counter() - start
+    finally:
+        stop.set()
+        probe_thread.join()
+
+    latencies = sorted(probe_latencies) or [0.0]
+    return ProbedRun(
+        results=results,
+        calls_per_sec=calls / elapsed,
+        probe_p50_ms=statistics.median(latencies),
+        probe_p99_ms=latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    )
@@ -0,0 +1,64 @@
+"""
+Yanıt sıkıştırma modülü.
+
+Bu modül, istemcinin Accept-Encoding başlığına göre gzip veya deflate
+kodlamasını seçen ve yanıt gövdesini (tek parça ya da akışlı) sıkıştıran
+yardımcıları içerir. Eşikten küçük gövdeler sıkıştırılmaz; çünkü küçük
+yanıtlarda başlık ve CPU maliyeti kazançtan büyüktür.
+"""
+
+import logging
+import zlib
+from typing import Iterable, Iterator, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_ENCODINGS = ("gzip", "deflate")
+
+# zlib pencere bitleri: gzip başlığı için 16+, zlib (HTTP "deflate") için olduğu gibi
+_WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+
+def negotiate_encoding(accept_encodings, supported: Sequence[str] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    """
+    İstemcinin kabul ettiği en uygun kodlamayı seçer.
+
+    Args:
+        accept_encodings: Werkzeug ``request.accept_encodings`` nesnesi (q=0 olanlar reddedilmiş sayılır)
+        supported: Sunucunun desteklediği kodlamalar (tercih sırasıyla)
+
+    Returns:
+        Kodlama adı veya sıkıştırma yapılmayacaksa None
+    """
+    return accept_encodings.best_match(supported)
+
+
+def compress_body(data: bytes, encoding: str, level: int = 6) -> bytes:
+    """Gövdeyi tek seferde sıkıştırır"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str, level: int = 6) -> Iterator[bytes]:
+    """
+    Akışlı gövdeyi parça parça sıkıştırır.
+
+    Her girdi parçasından sonra Z_SYNC_FLUSH yapılır; böylece istemci ilk
+    baytları sıkıştırıcının iç tamponu dolmadan alır.
+
+    Args:
+        chunks: Sıkıştırılmamış gövde parçaları
+        encoding: "gzip" veya "deflate"
+        level: zlib sıkıştırma seviyesi
+
+    Yields:
+        Sıkıştırılmış parçalar
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
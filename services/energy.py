@@ -0,0 +1,92 @@
+"""
+Enerji ve şarj hesaplama modülü.
+
+Bu modül, şarj süresi, menzil ve erişilebilirlik hesaplarını içerir.
+Fonksiyonlar Flask'a bağımlı değildir; uygulama ve planlama servisleri
+tarafından ortak kullanılır.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from services.geo import simple_distance
+
+DEFAULT_KM_PER_KWH = 5  # Modeli bilinmeyen araçlar için ortalama verim
+
+# Model bazında ortalama verim (km/kWh, karma kullanım tüketim değerlerinden)
+MODEL_KM_PER_KWH = {
+    ("tesla", "model 3"): 6.7,
+    ("tesla", "model y"): 6.1,
+    ("tesla", "model s"): 5.6,
+    ("tesla", "model x"): 4.9,
+    ("porsche", "taycan"): 4.8,
+    ("hyundai", "ioniq 5"): 5.7,
+    ("hyundai", "kona electric"): 6.5,
+    ("kia", "ev6"): 5.8,
+    ("ford", "mustang mach-e"): 5.3,
+    ("volkswagen", "id.4"): 5.5,
+    ("bmw", "i4"): 6.0,
+    ("bmw", "ix3"): 5.4,
+    ("mercedes", "eqc 400"): 4.5,
+    ("audi", "e-tron"): 4.3,
+    ("nissan", "leaf e+"): 5.7,
+}
+
+
+class VehicleEfficiencyModel:
+    """
+    Araç modeline göre kWh başına menzili (km/kWh) veren sınıf.
+    """
+
+    def __init__(self, table: Dict[Tuple[str, str], float] = None,
+                 default_km_per_kwh: float = DEFAULT_KM_PER_KWH):
+        """
+        VehicleEfficiencyModel sınıfını başlatır.
+
+        Args:
+            table: (marka, model) -> km/kWh tablosu (küçük harf); varsayılan MODEL_KM_PER_KWH
+            default_km_per_kwh: Tabloda olmayan modeller için verim
+        """
+        self.table = dict(MODEL_KM_PER_KWH if table is None else table)
+        self.default_km_per_kwh = default_km_per_kwh
+
+    @staticmethod
+    def model_key(brand: Optional[str], model: Optional[str]) -> Tuple[str, str]:
+        """Marka ve modeli tablo anahtarına çevirir"""
+        return (brand or "").strip().lower(), (model or "").strip().lower()
+
+    def km_per_kwh(self, brand: Optional[str], model: Optional[str]) -> float:
+        """
+        Aracın verimini döndürür.
+
+        Args:
+            brand: Araç markası
+            model: Araç modeli
+
+        Returns:
+            kWh başına menzil (km)
+        """
+        return self.table.get(self.model_key(brand, model), self.default_km_per_kwh)
+
+
+def calculate_charge_time(battery_capacity_kWh, current_soc, target_soc, charge_power_kW):
+    """Şarj için gereken süreyi hesaplar (dakika cinsinden)"""
+    if not charge_power_kW or charge_power_kW <= 0:
+        return 0
+    
+    energy_needed = ((target_soc - current_soc) / 100) * battery_capacity_kWh
+    hours = energy_needed / charge_power_kW
+    return hours * 60  # dakika cinsinden
+
+
+def calculate_range(battery_capacity_kWh, soc_percent, efficiency_km_per_kwh=5):
+    """Mevcut şarj seviyesi ile gidebileceği menzili hesaplar (km cinsinden)"""
+    available_energy = (soc_percent / 100) * battery_capacity_kWh
+    return available_energy * efficiency_km_per_kwh
+
+
+def is_station_reachable(vehicle_lat, vehicle_lon, station_lat, station_lon, 
+                        battery_capacity_kWh, current_soc, efficiency_km_per_kwh=5):
+    """İstasyonun mevcut şarj ile erişilebilir olup olmadığını kontrol eder"""
+    distance = simple_distance(vehicle_lat, vehicle_lon, station_lat, station_lon)
+    max_range = calculate_range(battery_capacity_kWh, current_soc, efficiency_km_per_kwh)
+    return max_range >= distance
@@ -0,0 +1,75 @@
+"""
+Coğrafi hesaplama modülü.
+
+Bu modül, uygulama ve puanlama işçi süreçleri tarafından ortak kullanılan
+mesafe fonksiyonlarını içerir. Fonksiyonlar Flask'a bağımlı değildir.
+"""
+
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371  # Dünya'nın yarıçapı (km)
+
+
+def simple_distance(lat1, lon1, lat2, lon2):
+    R = EARTH_RADIUS_KM
+
+    # 1) Dereceleri radyana çevir
+    lat1 = math.radians(lat1)
+    lon1 = math.radians(lon1)
+    lat2 = math.radians(lat2)
+    lon2 = math.radians(lon2)
+
+    # 2) Delta'ları bul
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    # 3) Haversine formülünü uygula
+    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    # 4) Mesafeyi hesapla
+    distance = R * c
+    return distance
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> List[Tuple[float, float]]:
+    """
+    Google kodlanmış polyline metnini koordinat listesine çözer.
+
+    Args:
+        encoded: Kodlanmış polyline
+        precision: Ondalık hassasiyeti (Google: 5, OSRM/Valhalla polyline6: 6)
+
+    Returns:
+        (enlem, boylam) çiftlerinin listesi
+
+    Raises:
+        ValueError: Polyline geçersizse
+    """
+    factor = 10 ** precision
+    points = []
+    index, lat, lon = 0, 0, 0
+    length = len(encoded)
+
+    while index < length:
+        deltas = []
+        for _ in range(2):
+            result, shift = 0, 0
+            while True:
+                if index >= length:
+                    raise ValueError("Polyline beklenmedik şekilde bitti")
+                byte = ord(encoded[index]) - 63
+                index += 1
+                if not 0 <= byte < 64:
+                    raise ValueError(f"Geçersiz polyline karakteri: {encoded[index - 1]!r}")
+                result |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        points.append((lat / factor, lon / factor))
+
+    return points
@@ -0,0 +1,213 @@
+"""
+İdempotency anahtarı deposu modülü.
+
+Bu modül, aynı ``Idempotency-Key`` ile tekrarlanan POST isteklerinin işi
+yeniden yapmadan ilk yanıtı almasını sağlayan, boyutu ve yaşam süresi
+sınırlı bellek içi depoyu içerir. Bellekte bulunamayan kayıtlar için
+isteğe bağlı bir kalıcı depo (ör. veritabanı) kullanılabilir.
+
+Kalıcı depo verildiğinde anahtar, iş yapılmadan önce depoya eklenen
+bekleyen bir kayıtla sahiplenilir. Eklemenin benzersiz anahtar nedeniyle
+başarısız olması, aynı anahtarın başka bir işçi sürecinde işlendiğini
+gösterir; böylece farklı işçilere düşen tekrarlar işi iki kez yapmaz.
+Her kayıt isteğin özetini de taşır ve anahtarın farklı bir istekle
+yeniden kullanılması reddedilir.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUS = 0  # Sahiplenilmiş ama henüz yanıtlanmamış kayıt
+
+# claim() sonuçları
+CLAIMED = 'claimed'          # Bu istek işi yapacak
+REPLAY = 'replay'            # Aynı istek daha önce yanıtlandı
+IN_PROGRESS = 'in_progress'  # Aynı anahtarla başka bir istek işleniyor
+MISMATCH = 'mismatch'        # Anahtar farklı bir istekle kullanılmış
+
+
+class StoredResponse(NamedTuple):
+    """Tekrar oynatılmak üzere saklanan yanıt"""
+    status_code: int
+    body: bytes
+    mimetype: str
+    expires_at: float
+    request_hash: str = ""
+
+    @property
+    def pending(self) -> bool:
+        """Kayıt yalnızca sahiplenilmişse (yanıt henüz yoksa) True"""
+        return self.status_code == PENDING_STATUS
+
+
+class IdempotencyStore:
+    """
+    İdempotency anahtarlarını LRU ve TTL ile sınırlı olarak saklayan sınıf.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 24 * 3600,
+                 load_fallback: Callable[[str], Optional[StoredResponse]] = None,
+                 save_fallback: Callable[[str, StoredResponse], None] = None,
+                 claim_fallback: Callable[[str, StoredResponse], bool] = None,
+                 release_fallback: Callable[[str], None] = None,
+                 lease_seconds: float = 60.0):
+        """
+        IdempotencyStore sınıfını başlatır.
+
+        Args:
+            max_entries: Bellekte tutulacak en fazla kayıt sayısı
+            ttl_seconds: Kayıtların geçerlilik süresi (saniye)
+            load_fallback: Bellekte olmayan kaydı kalıcı depodan okuyan fonksiyon
+            save_fallback: Kaydı kalıcı depoya yazan fonksiyon
+            claim_fallback: Bekleyen kaydı kalıcı depoya ekleyen fonksiyon; anahtar
+                zaten varsa False döndürür
+            release_fallback: Yanıtlanmadan bırakılan bekleyen kaydı silen fonksiyon
+            lease_seconds: Bekleyen kaydın geçerlilik süresi; işleyen süreç çökerse
+                anahtar bu süreden sonra yeniden sahiplenilebilir
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.load_fallback = load_fallback
+        self.save_fallback = save_fallback
+        self.claim_fallback = claim_fallback
+        self.release_fallback = release_fallback
+        self._entries: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        """
+        Anahtar için saklanan yanıtı döndürür.
+
+        Args:
+            key: İdempotency anahtarı
+
+        Returns:
+            Saklanan yanıt veya None (yoksa, henüz yanıtlanmadıysa ya da süresi dolduysa)
+        """
+        now = time.time()
+        with self._lock:
+            stored = self._entries.get(key)
+            if stored is not None:
+                if stored.expires_at > now:
+                    self._entries.move_to_end(key)
+                    return stored
+                del self._entries[key]
+
+        stored = self._load(key, now)
+        if stored is None or stored.pending:
+            return None
+        self._remember(key, stored)
+        return stored
+
+    def _load(self, key: str, now: float) -> Optional[StoredResponse]:
+        if self.load_fallback is None:
+            return None
+        stored = self.load_fallback(key)
+        if stored is None or stored.expires_at <= now:
+            return None
+        return stored
+
+    def claim(self, key: str, request_hash: str) -> Tuple[str, Optional[StoredResponse]]:
+        """
+        Anahtarı bu istek için sahiplenir.
+
+        Önce saklanan yanıta bakılır; yoksa anahtar süreç içinde ve (varsa)
+        kalıcı depoda sahiplenilir. CLAIMED dönen istek işi yaptıktan sonra
+        put() veya release() çağırmalıdır.
+
+        Args:
+            key: İdempotency anahtarı
+            request_hash: İsteği yapan kullanıcı ve istek gövdesinin özeti
+
+        Returns:
+            (sonuç, saklanan yanıt): sonuç CLAIMED, REPLAY, IN_PROGRESS veya MISMATCH
+        """
+        stored = self.get(key)
+        if stored is not None:
+            return (REPLAY if stored.request_hash == request_hash else MISMATCH), stored
+
+        with self._lock:
+            if key in self._in_flight:
+                return IN_PROGRESS, None
+            self._in_flight.add(key)
+
+        if self.claim_fallback is None:
+            return CLAIMED, None
+
+        pending = StoredResponse(PENDING_STATUS, b"", "", time.time() + self.lease_seconds, request_hash)
+        try:
+            claimed = self.claim_fallback(key, pending)
+        except Exception:
+            self._forget_in_flight(key)
+            raise
+        if claimed:
+            return CLAIMED, None
+
+        # Anahtar başka bir süreçte sahiplenilmiş: yanıtlanmış mı, hâlâ işleniyor mu?
+        self._forget_in_flight(key)
+        stored = self._load(key, time.time())
+        if stored is None:
+            return IN_PROGRESS, None
+        if stored.request_hash != request_hash:
+            return MISMATCH, stored
+        if stored.pending:
+            return IN_PROGRESS, None
+        self._remember(key, stored)
+        return REPLAY, stored
+
+    def release(self, key: str) -> None:
+        """
+        Yanıt saklanmadan sahiplenmeyi bırakır; istemci aynı anahtarla yeniden deneyebilir.
+
+        Args:
+            key: İdempotency anahtarı
+        """
+        self._forget_in_flight(key)
+        if self.release_fallback is not None:
+            try:
+                self.release_fallback(key)
+            except Exception as e:
+                logger.error(f"İdempotency sahiplenmesi kalıcı depodan silinemedi: {str(e)}")
+
+    def _forget_in_flight(self, key: str) -> None:
+        with self._lock:
+            self._in_flight.discard(key)
+
+    def put(self, key: str, status_code: int, body: bytes, mimetype: str,
+            request_hash: str = "") -> StoredResponse:
+        """
+        Yanıtı saklar (bellek + varsa kalıcı depo) ve sahiplenmeyi tamamlar.
+
+        Args:
+            key: İdempotency anahtarı
+            status_code: HTTP durum kodu
+            body: Yanıt gövdesi
+            mimetype: Yanıt içerik tipi
+            request_hash: İsteği yapan kullanıcı ve istek gövdesinin özeti
+
+        Returns:
+            Saklanan yanıt
+        """
+        stored = StoredResponse(status_code, body, mimetype, time.time() + self.ttl_seconds, request_hash)
+        self._remember(key, stored)
+        self._forget_in_flight(key)
+        if self.save_fallback is not None:
+            try:
+                self.save_fallback(key, stored)
+            except Exception as e:
+                logger.error(f"İdempotency kaydı kalıcı depoya yazılamadı: {str(e)}")
+        return stored
+
+    def _remember(self, key: str, stored: StoredResponse) -> None:
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
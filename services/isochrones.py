@@ -0,0 +1,142 @@
+"""
+Erişilebilirlik izokron önbelleği modülü.
+
+Bu modül, bir araç modelinin belirli bir SOC aralığında, ızgaranın belirli
+bir hücresinden hangi istasyonlara ulaşabileceğini önceden hesaplar ve
+sonuçları LRU ile sınırlı bir önbellekte tutar. Böylece istek başına
+"ulaşılabilir mi?" kontrolü bir küme aramasına indirgenir.
+
+Her izokron iki kümeden oluşur:
+    sure:     Hücrenin her noktasından, SOC aralığının alt sınırıyla bile
+              ulaşılabilen istasyonlar
+    boundary: Konuma veya SOC'ye göre ulaşılabilir olabilen istasyonlar;
+              yalnızca bunlar için gerçek mesafe ile menzil karşılaştırılır
+Kümelerin dışında kalan istasyonlara ulaşılamaz.
+"""
+
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Hashable, NamedTuple, Tuple
+
+from services.geo import simple_distance
+from services.station_grid import KM_PER_DEGREE_LAT, StationGrid
+
+logger = logging.getLogger(__name__)
+
+
+class Isochrone(NamedTuple):
+    """Bir (araç modeli, SOC aralığı, hücre) için erişilebilir istasyon ID'leri"""
+    sure: FrozenSet[int]
+    boundary: FrozenSet[int]
+
+    def can_reach(self, station_id: int, distance_km: float, range_km: float) -> bool:
+        """
+        İstasyonun ulaşılabilir olup olmadığını döndürür.
+
+        Args:
+            station_id: İstasyon ID'si
+            distance_km: Araçla istasyon arasındaki gerçek mesafe (yalnızca sınırdaki istasyonlar için kullanılır)
+            range_km: Aracın gerçek kalan menzili
+
+        Returns:
+            Ulaşılabiliyorsa True
+        """
+        if station_id in self.sure:
+            return True
+        return station_id in self.boundary and range_km >= distance_km
+
+
+class IsochroneCache:
+    """
+    İzokronları (araç modeli, SOC aralığı, hücre) anahtarıyla LRU olarak saklayan sınıf.
+    """
+
+    def __init__(self, grid: StationGrid, station_ids, max_entries: int = 1024, soc_bucket: float = 5):
+        """
+        IsochroneCache sınıfını başlatır.
+
+        Args:
+            grid: İstasyon ızgarası
+            station_ids: Izgara indekslerine karşılık gelen istasyon ID'leri
+            max_entries: Önbellekteki en fazla izokron sayısı
+            soc_bucket: SOC aralığı genişliği (yüzde)
+        """
+        self.grid = grid
+        self.station_ids = station_ids
+        self.max_entries = max_entries
+        self.soc_bucket = soc_bucket
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Isochrone]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model_key: Hashable, km_per_soc: float, soc: float, lat: float, lon: float) -> Isochrone:
+        """
+        Konumun hücresi ve SOC'nin aralığı için izokronu döndürür (gerekirse hesaplar).
+
+        Args:
+            model_key: Araç modelini (ve menzilini belirleyen özellikleri) tanımlayan anahtar
+            km_per_soc: %1 SOC ile gidilebilen mesafe (km)
+            soc: Aracın şu anki SOC değeri (yüzde)
+            lat, lon: Aracın konumu
+
+        Returns:
+            Isochrone
+        """
+        bucket = math.floor(soc / self.soc_bucket)
+        cell = self.grid.cell_of(lat, lon)
+        key = (model_key, bucket, cell)
+
+        with self._lock:
+            isochrone = self._entries.get(key)
+            if isochrone is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return isochrone
+            self.misses += 1
+
+        isochrone = self._compute(cell, km_per_soc * bucket * self.soc_bucket,
+                                  km_per_soc * (bucket + 1) * self.soc_bucket)
+
+        with self._lock:
+            self._entries[key] = isochrone
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return isochrone
+
+    def _compute(self, cell: Tuple[int, int], range_low: float, range_high: float) -> Isochrone:
+        grid = self.grid
+        cell_deg = grid.cell_deg
+        south, west = cell[0] * cell_deg, cell[1] * cell_deg
+        center_lat, center_lon = south + cell_deg / 2, west + cell_deg / 2
+        # Hücre merkezinden en uzak köşeye mesafe (küçük bir pay ile)
+        half_diagonal = 1.01 * max(simple_distance(center_lat, center_lon, corner_lat, corner_lon)
+                                   for corner_lat in (south, south + cell_deg)
+                                   for corner_lon in (west, west + cell_deg))
+
+        sure, boundary = [], []
+        if range_high + half_diagonal <= 0:
+            return Isochrone(frozenset(), frozenset())
+
+        reach = range_high + half_diagonal
+        reach_lat = reach / KM_PER_DEGREE_LAT
+        cos_lat = max(0.01, math.cos(math.radians(min(89.0, abs(center_lat) + reach_lat))))
+        reach_lon = reach_lat / cos_lat
+        for box_cell in grid.cells_in_box(center_lat - reach_lat, center_lon - reach_lon,
+                                          center_lat + reach_lat, center_lon + reach_lon):
+            for index in grid.cells[box_cell]:
+                distance_km = simple_distance(center_lat, center_lon, grid.latitudes[index], grid.longitudes[index])
+                if distance_km + half_diagonal <= range_low:
+                    sure.append(self.station_ids[index])
+                elif distance_km - half_diagonal <= range_high:
+                    boundary.append(self.station_ids[index])
+
+        return Isochrone(frozenset(sure), frozenset(boundary))
+
+    def stats(self) -> Dict[str, int]:
+        """Önbellek istatistiklerini döndürür"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,103 @@
+"""
+Akışlı JSON kodlama modülü.
+
+Bu modül, büyük liste yanıtlarını tek bir dev dizge olarak bellekte
+oluşturmak yerine dizi elemanlarını kodlandıkça parça parça üreten bir
+kodlayıcı içerir. Böylece tepe bellek kullanımı ve ilk bayta kadar geçen
+süre liste boyutundan bağımsız kalır.
+"""
+
+import json
+import logging
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_BYTES = 16 * 1024
+
+
+def _compact_dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def iter_json_array(items: Iterable[Any], dumps: Callable[[Any], str] = _compact_dumps,
+                    chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Elemanları bir JSON dizisi olarak kodlayıp parça parça üretir.
+
+    Args:
+        items: Dizinin elemanları (tembel bir üreteç olabilir)
+        dumps: Tek bir elemanı JSON dizgesine çeviren fonksiyon
+        chunk_bytes: Bir parçanın yaklaşık boyutu (bayt)
+
+    Yields:
+        UTF-8 kodlu JSON parçaları; birleşimleri ``[e1,e2,...]\\n`` olur
+    """
+    buffer = ["["]
+    size = 1
+    first = True
+    for item in items:
+        encoded = dumps(item)
+        if first:
+            first = False
+        else:
+            buffer.append(",")
+            size += 1
+        buffer.append(encoded)
+        size += len(encoded)
+        if size >= chunk_bytes:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            size = 0
+    buffer.append("]\n")
+    yield "".join(buffer).encode("utf-8")
+
+
+def benchmark_json_encoding(count: int = 100_000) -> Dict[str, Dict[str, float]]:
+    """
+    Tek seferde kodlama ile akışlı kodlamayı tepe bellek ve ilk parça süresi açısından karşılaştırır.
+
+    Args:
+        count: Listedeki eleman sayısı
+
+    Returns:
+        Yol adı -> {"first_chunk_ms", "total_ms", "peak_kb"} sözlüğü
+    """
+    def rows():
+        for index in range(count):
+            yield {"id": index, "name": f"İstasyon {index}", "latitude": 39.0 + index * 1e-5,
+                   "longitude": 32.0 + index * 1e-5, "status": "available"}
+
+    def whole():
+        yield (_compact_dumps(list(rows())) + "\n").encode("utf-8")
+
+    def streamed():
+        return iter_json_array(rows())
+
+    results = {}
+    for name, encode in (("jsonify", whole), ("stream", streamed)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        first_chunk_ms = None
+        total_bytes = 0
+        for chunk in encode():
+            if first_chunk_ms is None:
+                first_chunk_ms = (time.perf_counter() - start) * 1000
+            total_bytes += len(chunk)  # Parça hemen "gönderilip" bırakılır
+        total_ms = (time.perf_counter() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {"first_chunk_ms": first_chunk_ms, "total_ms": total_ms,
+                         "peak_kb": peak / 1024, "bytes": total_bytes}
+        logger.info(f"{name}: {results[name]}")
+    return results
+
+
+if __name__ == "__main__":
+    # Örnek: python -m services.json_stream
+    for count in (10_000, 100_000):
+        for path, stats in benchmark_json_encoding(count).items():
+            print(f"{count:>7} {path:<8} ilk parça {stats['first_chunk_ms']:.2f} ms  "
+                  f"toplam {stats['total_ms']:.1f} ms  tepe {stats['peak_kb']:.0f} KB")
@@ -0,0 +1,175 @@
+"""
+Hafif satır okuma modülü.
+
+Bu modül, liste endpoint'lerinde ORM nesneleri oluşturmadan yalnızca
+gerekli kolonları tuple olarak okuyan ve bu tuple'ları önceden derlenmiş
+serileştiricilerle sözlüğe çeviren yardımcıları içerir.
+"""
+
+import logging
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import select
+
+logger = logging.getLogger(__name__)
+
+
+def compile_row_serializer(keys: Sequence[str]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+    """
+    Tuple satırı sözlüğe çeviren bir fonksiyonu kaynak koddan derler.
+
+    Üretilen fonksiyon ``lambda r: {"id": r[0], "name": r[1], ...}``
+    biçimindedir; böylece her satır için döngü, getattr veya zip maliyeti
+    oluşmaz.
+
+    Args:
+        keys: Çıktı sözlüğünün anahtarları (satırdaki kolon sırasıyla)
+
+    Returns:
+        Satırı sözlüğe çeviren fonksiyon
+    """
+    items = ", ".join(f"{key!r}: r[{index}]" for index, key in enumerate(keys))
+    source = f"lambda r: {{{items}}}"
+    return eval(compile(source, f"<row_serializer {','.join(keys)}>", "eval"), {})
+
+
+class RowReader:
+    """
+    Bir model için seçili kolonları tuple olarak okuyan sınıf.
+    """
+
+    def __init__(self, model, fields: Sequence[str], keys: Sequence[str] = None):
+        """
+        RowReader sınıfını başlatır.
+
+        Args:
+            model: Kolonları okunacak SQLAlchemy modeli
+            fields: Okunacak kolon adları
+            keys: Çıktı sözlüğündeki anahtarlar. None ise kolon adları kullanılır.
+        """
+        self.model = model
+        self.fields = tuple(fields)
+        self.keys = tuple(keys) if keys else self.fields
+        self.columns = [getattr(model, field) for field in self.fields]
+        self.serialize = compile_row_serializer(self.keys)
+
+    def _statement(self, criteria, order_by):
+        statement = select(*self.columns)
+        if criteria:
+            statement = statement.where(*criteria)
+        if order_by is not None:
+            statement = statement.order_by(order_by)
+        return statement
+
+    def rows(self, session, *criteria, order_by=None) -> List[Tuple[Any, ...]]:
+        """
+        Seçili kolonları tuple listesi olarak döndürür.
+
+        Args:
+            session: Veritabanı oturumu
+            criteria: WHERE koşulları
+            order_by: Sıralama ifadesi
+
+        Returns:
+            Kolon değerlerinden oluşan satır listesi
+        """
+        return session.execute(self._statement(criteria, order_by)).all()
+
+    def fetch(self, session, *criteria, order_by=None) -> List[Dict[str, Any]]:
+        """
+        Seçili kolonları okur ve her satırı sözlüğe çevirir.
+
+        Args:
+            session: Veritabanı oturumu
+            criteria: WHERE koşulları
+            order_by: Sıralama ifadesi
+
+        Returns:
+            Serileştirilmiş satırların listesi
+        """
+        serialize = self.serialize
+        return [serialize(row) for row in self.rows(session, *criteria, order_by=order_by)]
+
+    def iter_fetch(self, session, *criteria, order_by=None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        fetch ile aynı sözlükleri, satırları imleçten parti parti okuyarak tek tek üretir.
+
+        Args:
+            session: Veritabanı oturumu
+            criteria: WHERE koşulları
+            order_by: Sıralama ifadesi
+            batch_size: İmleçten tek seferde okunacak satır sayısı
+
+        Yields:
+            Serileştirilmiş satırlar
+        """
+        serialize = self.serialize
+        statement = self._statement(criteria, order_by).execution_options(yield_per=batch_size)
+        for row in session.execute(statement):
+            yield serialize(row)
+
+
+def benchmark_read_paths(session, reader: RowReader, repeat: int = 200) -> Dict[str, Dict[str, float]]:
+    """
+    ORM yolu ile tuple yolunu gecikme ve bellek ayırma açısından karşılaştırır.
+
+    Args:
+        session: Veritabanı oturumu
+        reader: Karşılaştırılacak RowReader
+        repeat: Her yol için tekrar sayısı
+
+    Returns:
+        Yol adı -> {"ms_per_call", "peak_kb", "allocations"} sözlüğü
+    """
+    fields = reader.fields
+    keys = reader.keys
+
+    def orm_path():
+        return [
+            {key: getattr(obj, field) for key, field in zip(keys, fields)}
+            for obj in session.query(reader.model).all()
+        ]
+
+    def tuple_path():
+        return reader.fetch(session)
+
+    results = {}
+    for name, func in (("orm", orm_path), ("tuple", tuple_path)):
+        func()  # Isınma turu (sorgu derleme önbelleği)
+        session.expunge_all()
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+            session.expunge_all()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        result = func()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        session.expunge_all()
+
+        results[name] = {
+            "ms_per_call": elapsed * 1000 / repeat,
+            "peak_kb": peak / 1024,
+            "allocations": sum(stat.count for stat in snapshot.statistics("filename")),
+        }
+        logger.info(f"{name}: {results[name]}")
+
+    return results
+
+
+if __name__ == "__main__":
+    # Örnek: python -m services.row_reader
+    from app import app, db, station_reader, vehicle_reader
+
+    with app.app_context():
+        for label, row_reader in (("stations", station_reader), ("vehicles", vehicle_reader)):
+            for path, stats in benchmark_read_paths(db.session, row_reader).items():
+                print(f"{label:<10} {path:<6} {stats['ms_per_call']:.3f} ms/çağrı  "
+                      f"tepe {stats['peak_kb']:.1f} KB  {stats['allocations']} ayırma")
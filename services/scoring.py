@@ -0,0 +1,260 @@
+"""
+İstasyon puanlama modülü.
+
+Bu modül, akıllı öneri endpoint'lerinin istasyon başına yaptığı hesaplamaları
+saf fonksiyonlar (çekirdekler) olarak içerir. Çekirdekler aynı işlem içinde
+doğrudan veya GIL'i tutmamak için bir süreç havuzunda çalıştırılabilir.
+Havuz kullanıldığında istasyon dizileri her çağrıda pickle edilmez; paylaşılan
+belleğe bir kez yazılır ve işçi süreçleri bloğa adıyla bağlanır.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.benchmarking import run_with_probe
+from services.geo import simple_distance
+from services.station_arrays import (
+    STATUS_AVAILABLE, STATUS_RESERVED, SharedStationArrays, StationArrays, attach_station_arrays,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def rank_for_vehicle(arrays: StationArrays, vehicle_lat: float, vehicle_lon: float,
+                     battery_capacity: float, current_soc: float, target_soc: float,
+                     max_waiting_time: float, now: float) -> List[Tuple]:
+    """
+    Araç için önerilecek istasyonları toplam süreye göre sıralar.
+
+    Şu an müsait olan veya aktif rezervasyonu en fazla max_waiting_time
+    dakika içinde bitecek istasyonlar seçilir; sıralama yuvarlanmış
+    (bekleme + şarj) süresine göre ve istasyon sırasını koruyarak yapılır.
+
+    Args:
+        arrays: İstasyon dizileri
+        vehicle_lat, vehicle_lon: Aracın konumu
+        battery_capacity: Batarya kapasitesi (kWh)
+        current_soc, target_soc: Şu anki ve hedeflenen şarj yüzdesi
+        max_waiting_time: Kabul edilen en uzun bekleme (dakika)
+        now: Şu anki zaman (Unix zamanı)
+
+    Returns:
+        (istasyon_id, mesafe_km, bekleme_dk, şarj_dk) demetlerinin sıralı listesi
+    """
+    energy_needed = ((target_soc - current_soc) / 100) * battery_capacity
+    ids, latitudes, longitudes = arrays.ids, arrays.latitudes, arrays.longitudes
+    max_power, available_after, status_codes = arrays.max_power, arrays.available_after, arrays.status_codes
+
+    ranked = []
+    for index in range(len(ids)):
+        free_at = available_after[index]
+        has_reservation = free_at > now
+        waiting_time = (free_at - now) / 60 if has_reservation else 0
+        is_available = status_codes[index] == STATUS_AVAILABLE
+        if not (is_available or (has_reservation and waiting_time <= max_waiting_time)):
+            continue
+
+        power = max_power[index]
+        charge_time = (energy_needed / power) * 60 if power > 0 else 0
+        distance_km = simple_distance(vehicle_lat, vehicle_lon, latitudes[index], longitudes[index])
+        ranked.append((ids[index], distance_km, waiting_time, charge_time))
+
+    ranked.sort(key=lambda item: round(item[2] + item[3]))
+    return ranked
+
+
+def rank_for_location(arrays: StationArrays, user_lat: float, user_lon: float,
+                      travel_speed_kmh: float, now: float) -> List[Tuple]:
+    """
+    Konuma göre her istasyonun mesafesini ve varışta rezerve edilebilirliğini hesaplar.
+
+    Args:
+        arrays: İstasyon dizileri
+        user_lat, user_lon: Kullanıcının konumu
+        travel_speed_kmh: Ortalama hız (km/h)
+        now: Şu anki zaman (Unix zamanı)
+
+    Returns:
+        İstasyon sırasıyla (istasyon_id, mesafe_km, yolculuk_dk, rezerve_edilebilir) demetleri
+    """
+    ids, latitudes, longitudes = arrays.ids, arrays.latitudes, arrays.longitudes
+    available_after, status_codes = arrays.available_after, arrays.status_codes
+
+    results = []
+    for index in range(len(ids)):
+        distance_km = simple_distance(user_lat, user_lon, latitudes[index], longitudes[index])
+        travel_minutes = (distance_km / travel_speed_kmh) * 60
+
+        status_code = status_codes[index]
+        if status_code == STATUS_AVAILABLE:
+            reservable = True
+        elif status_code == STATUS_RESERVED:
+            free_at = available_after[index]
+            reservable = free_at > now and now + travel_minutes * 60 >= free_at
+        else:
+            reservable = False
+
+        results.append((ids[index], distance_km, travel_minutes, reservable))
+    return results
+
+
+KERNELS = {
+    "vehicle": rank_for_vehicle,
+    "location": rank_for_location,
+}
+
+
+# İşçi sürecinde bağlı olunan paylaşılan bellek bloğu: (ad, blok, diziler)
+_worker_attachment: Optional[Tuple[str, Any, StationArrays]] = None
+
+
+def _detach_worker() -> None:
+    global _worker_attachment
+    if _worker_attachment is None:
+        return
+    _, shm, arrays = _worker_attachment
+    _worker_attachment = None
+    for column in (arrays.ids, arrays.latitudes, arrays.longitudes,
+                   arrays.max_power, arrays.available_after, arrays.status_codes):
+        column.release()
+    shm.close()
+
+
+def _score_shared(name: str, kind: str, params: Dict[str, Any]) -> List[Tuple]:
+    """İşçi sürecinde çalışır: bloğa (gerekirse) bağlanır ve çekirdeği çalıştırır"""
+    global _worker_attachment
+    if _worker_attachment is None or _worker_attachment[0] != name:
+        _detach_worker()
+        shm, arrays = attach_station_arrays(name)
+        _worker_attachment = (name, shm, arrays)
+    return KERNELS[kind](_worker_attachment[2], **params)
+
+
+class ScoringPool:
+    """
+    Puanlama çekirdeklerini bir süreç havuzunda çalıştıran sınıf.
+    """
+
+    def __init__(self, processes: int = 2, timeout: float = 5.0, keep_blocks: int = 2):
+        """
+        ScoringPool sınıfını başlatır.
+
+        Args:
+            processes: İşçi süreç sayısı
+            timeout: Bir puanlama işinin sonucunu bekleme süresi (saniye)
+            keep_blocks: Kuyruktaki işler için açık tutulan en fazla blok sayısı
+        """
+        self.timeout = timeout
+        self.keep_blocks = max(1, keep_blocks)
+        self._executor = ProcessPoolExecutor(max_workers=processes)
+        self._blocks: List[Tuple[StationArrays, SharedStationArrays]] = []
+        self._lock = threading.Lock()
+
+    def publish(self, arrays: StationArrays) -> str:
+        """
+        Dizileri (henüz yazılmadıysa) paylaşılan belleğe yazar.
+
+        Args:
+            arrays: İstasyon dizileri
+
+        Returns:
+            Paylaşılan bellek bloğunun adı
+        """
+        with self._lock:
+            if self._blocks and self._blocks[-1][0] is arrays:
+                return self._blocks[-1][1].name
+            block = SharedStationArrays(arrays)
+            self._blocks.append((arrays, block))
+            # Eski blokları sil; işçiler yeni adı görünce kendi eşlemelerini kapatır
+            while len(self._blocks) > self.keep_blocks:
+                self._blocks.pop(0)[1].release()
+            return block.name
+
+    def rank(self, arrays: StationArrays, kind: str, params: Dict[str, Any]) -> List[Tuple]:
+        """
+        Çekirdeği havuzda çalıştırır.
+
+        Args:
+            arrays: İstasyon dizileri
+            kind: Çekirdek adı ("vehicle" veya "location")
+            params: Çekirdeğe verilecek istek parametreleri
+
+        Returns:
+            Çekirdeğin sonucu
+        """
+        name = self.publish(arrays)
+        return self._executor.submit(_score_shared, name, kind, params).result(timeout=self.timeout)
+
+    def shutdown(self) -> None:
+        """Havuzu kapatır ve paylaşılan bellek bloklarını siler"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for _, block in self._blocks:
+                block.release()
+            self._blocks.clear()
+
+
+def _synthetic_arrays(count: int) -> StationArrays:
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    rows, ends = [], {}
+    for station_id in range(1, count + 1):
+        status = rng.choice(['available', 'reserved', 'occupied'])
+        rows.append((station_id, f"İstasyon {station_id}", rng.uniform(36, 42), rng.uniform(26, 45),
+                     status, rng.choice([22.0, 50.0, 150.0])))
+        if station_id % 3 == 0:
+            ends[station_id] = now + timedelta(minutes=rng.uniform(0, 60))
+    return StationArrays.from_rows(1, rows, ends)
+
+
+def benchmark_scoring(stations: int = 20000, requests: int = 32, concurrency: int = 8,
+                      processes: int = 2) -> Dict[str, Dict[str, float]]:
+    """
+    Eşzamanlı öneri isteklerinde satır içi puanlama ile havuzlu puanlamayı karşılaştırır.
+
+    Her iki yolda da diğer istekleri temsil eden hafif bir yoklama iş
+    parçacığı çalışır; gecikmesi, puanlamanın GIL'i ne kadar tuttuğunu gösterir.
+
+    Args:
+        stations: Sentetik istasyon sayısı
+        requests: Toplam öneri isteği sayısı
+        concurrency: Eşzamanlı istemci sayısı
+        processes: Havuzdaki süreç sayısı
+
+    Returns:
+        Yol adı -> {"requests_per_sec", "probe_p50_ms", "probe_p99_ms"} sözlüğü
+    """
+    arrays = _synthetic_arrays(stations)
+    params = {"vehicle_lat": 39.9, "vehicle_lon": 32.8, "battery_capacity": 75.0, "current_soc": 20.0,
+              "target_soc": 80.0, "max_waiting_time": 30, "now": time.time()}
+    pool = ScoringPool(processes=processes, timeout=60)
+    pool.rank(arrays, "vehicle", params)  # Süreçleri ve bloğu ısıt
+
+    paths = {
+        "inline": lambda: rank_for_vehicle(arrays, **params),
+        "process": lambda: pool.rank(arrays, "vehicle", params),
+    }
+
+    results = {}
+    for name, score in paths.items():
+        run = run_with_probe(score, requests, concurrency)
+        results[name] = {
+            "requests_per_sec": run.calls_per_sec,
+            "probe_p50_ms": run.probe_p50_ms,
+            "probe_p99_ms": run.probe_p99_ms,
+        }
+
+    pool.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    # Örnek: python -m services.scoring
+    for path, stats in benchmark_scoring().items():
+        print(f"{path:<8} {stats['requests_per_sec']:.1f} istek/sn  "
+              f"yoklama p50 {stats['probe_p50_ms']:.3f} ms  p99 {stats['probe_p99_ms']:.3f} ms")
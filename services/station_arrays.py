@@ -0,0 +1,183 @@
+"""
+Sıkıştırılmış istasyon dizileri modülü.
+
+Bu modül, istasyon verilerini puanlama ve arama algoritmalarının
+kullanabileceği kolon bazlı dizilere (array) dönüştüren ve bu dizileri
+işçi süreçleriyle paylaşılan bellek (shared memory) üzerinden paylaşan
+sınıfları içerir.
+"""
+
+import logging
+import struct
+import zlib
+from array import array
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Durum kodları (puanlama çekirdekleri yalnızca bunları ayırt eder)
+STATUS_OTHER = 0
+STATUS_AVAILABLE = 1
+STATUS_RESERVED = 2
+
+_STATUS_CODES = {'available': STATUS_AVAILABLE, 'reserved': STATUS_RESERVED}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(moment: datetime) -> float:
+    """Saat dilimsiz UTC datetime değerini Unix zamanına çevirir"""
+    return (moment - _EPOCH).total_seconds()
+
+
+def positions_key(ids, latitudes, longitudes) -> int:
+    """İstasyon ID'leri ve koordinatlarının özetini (sayı << 32 | CRC32) döndürür"""
+    crc = zlib.crc32(memoryview(ids).cast("B"))
+    crc = zlib.crc32(memoryview(latitudes).cast("B"), crc)
+    crc = zlib.crc32(memoryview(longitudes).cast("B"), crc)
+    return len(ids) << 32 | crc
+
+
+class StationArrays:
+    """
+    İstasyon verilerini kolon bazlı dizilerde tutan sınıf.
+
+    Sayısal kolonlar (ids, latitudes, longitudes, max_power, available_after,
+    status_codes) paylaşılan belleğe kopyalanabilir; names, statuses,
+    max_power_kW ve reservation_ends yalnızca ana süreçte yanıt oluşturmak
+    için tutulur.
+
+    positions_key yalnızca istasyon ID'lerine ve koordinatlarına bağlıdır;
+    durum değişince aynı kalır, istasyon eklenince, taşınınca veya silinince
+    değişir. Konuma bağlı yapılar (ızgara, izokronlar) bununla anahtarlanır.
+    """
+
+    def __init__(self, version: int, ids: array, latitudes: array, longitudes: array,
+                 max_power: array, available_after: array, status_codes: array,
+                 names: List[str] = None, statuses: List[str] = None,
+                 max_power_kW: List[Optional[float]] = None,
+                 reservation_ends: List[Optional[datetime]] = None):
+        self.version = version
+        self.ids = ids
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.max_power = max_power
+        self.available_after = available_after
+        self.status_codes = status_codes
+        self.names = names or []
+        self.statuses = statuses or []
+        self.max_power_kW = max_power_kW or []
+        self.reservation_ends = reservation_ends or []
+        self.index_by_id = {station_id: index for index, station_id in enumerate(ids)}
+        self.positions_key = positions_key(ids, latitudes, longitudes)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, version: int, rows: Iterable[Sequence],
+                  reservation_ends: Dict[int, datetime] = None) -> "StationArrays":
+        """
+        Veritabanı satırlarından istasyon dizileri oluşturur.
+
+        Args:
+            version: Verinin sürüm damgası
+            rows: (id, name, latitude, longitude, status, max_power_kW) satırları
+            reservation_ends: İstasyon ID'si -> en geç aktif rezervasyon bitişi
+
+        Returns:
+            Yeni StationArrays nesnesi
+        """
+        reservation_ends = reservation_ends or {}
+        ids, latitudes, longitudes = array('q'), array('d'), array('d')
+        max_power, available_after, status_codes = array('d'), array('d'), array('b')
+        names, statuses, powers, ends = [], [], [], []
+
+        for station_id, name, latitude, longitude, status, power in rows:
+            end = reservation_ends.get(station_id)
+            ids.append(station_id)
+            latitudes.append(latitude)
+            longitudes.append(longitude)
+            max_power.append(power or 0.0)
+            available_after.append(to_epoch(end) if end else 0.0)
+            status_codes.append(_STATUS_CODES.get(status, STATUS_OTHER))
+            names.append(name)
+            statuses.append(status)
+            powers.append(power)
+            ends.append(end)
+
+        return cls(version, ids, latitudes, longitudes, max_power, available_after,
+                   status_codes, names, statuses, powers, ends)
+
+
+# Paylaşılan bellek düzeni: istasyon sayısı + sayısal kolonlar art arda
+_SHM_HEADER = struct.Struct("<q")
+_NUMERIC_COLUMNS = (("ids", "q"), ("latitudes", "d"), ("longitudes", "d"),
+                    ("max_power", "d"), ("available_after", "d"), ("status_codes", "b"))
+
+
+def _column_layout(count: int) -> List[Tuple[str, str, int, int]]:
+    layout, offset = [], _SHM_HEADER.size
+    for name, typecode in _NUMERIC_COLUMNS:
+        size = count * array(typecode).itemsize
+        layout.append((name, typecode, offset, size))
+        offset += size
+    return layout
+
+
+class SharedStationArrays:
+    """
+    StationArrays'in sayısal kolonlarını paylaşılan bellek bloğuna yazan sınıf.
+    """
+
+    def __init__(self, arrays: StationArrays):
+        """
+        Dizileri yeni bir paylaşılan bellek bloğuna kopyalar.
+
+        Args:
+            arrays: Paylaşılacak istasyon dizileri
+        """
+        count = len(arrays)
+        layout = _column_layout(count)
+        total = max(1, layout[-1][2] + layout[-1][3])
+        self.version = arrays.version
+        self.count = count
+        self.shm = shared_memory.SharedMemory(create=True, size=total)
+        _SHM_HEADER.pack_into(self.shm.buf, 0, count)
+        for name, _, offset, size in layout:
+            self.shm.buf[offset:offset + size] = getattr(arrays, name).tobytes()
+        logger.info(f"İstasyon dizileri paylaşılan belleğe yazıldı: {self.shm.name} ({count} istasyon)")
+
+    @property
+    def name(self) -> str:
+        """Paylaşılan bellek bloğunun adı"""
+        return self.shm.name
+
+    def release(self) -> None:
+        """Paylaşılan bellek bloğunu kapatır ve siler"""
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def attach_station_arrays(name: str) -> Tuple[shared_memory.SharedMemory, StationArrays]:
+    """
+    Paylaşılan bellekteki istasyon dizilerine kopyalamadan bağlanır.
+
+    Args:
+        name: Paylaşılan bellek bloğunun adı
+
+    Returns:
+        (bellek bloğu, bloğa bakan memoryview kolonlarıyla StationArrays)
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    count = _SHM_HEADER.unpack_from(shm.buf, 0)[0]
+    columns = {
+        name: shm.buf[offset:offset + size].cast(typecode)
+        for name, typecode, offset, size in _column_layout(count)
+    }
+    return shm, StationArrays(version=None, **columns)
@@ -0,0 +1,180 @@
+"""
+Sunucu taraflı istasyon kümeleme modülü.
+
+Bu modül, istasyonları her yakınlaştırma (zoom) seviyesi için Web Mercator
+düzleminde sabit piksel boyutlu hücrelere toplayan hiyerarşik bir küme
+indeksi içerir. Her seviyedeki hücre, bir üst seviyede tam olarak dört
+hücreye bölünür; böylece kümeler seviyeler arasında iç içe geçer.
+
+İndeks artımlı güncellenir: bir istasyonun eklenmesi, silinmesi veya durum
+değiştirmesi yalnızca o istasyonun her seviyedeki tek kümesine dokunur.
+"""
+
+import logging
+import math
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 256          # Mercator karo boyutu (piksel)
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def mercator(lat: float, lon: float) -> Tuple[float, float]:
+    """Koordinatı [0, 1) aralığında Web Mercator düzlemine izdüşürür"""
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    sin_lat = math.sin(math.radians(lat))
+    x = (lon + 180.0) / 360.0
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return min(max(x, 0.0), 1 - 1e-12), min(max(y, 0.0), 1 - 1e-12)
+
+
+class Cluster:
+    """Bir hücredeki istasyonların özeti"""
+    __slots__ = ("count", "lat_sum", "lon_sum", "id_sum", "statuses")
+
+    def __init__(self):
+        self.count = 0
+        self.lat_sum = 0.0
+        self.lon_sum = 0.0
+        self.id_sum = 0          # Tek istasyonlu kümede istasyon ID'sinin kendisi
+        self.statuses: Dict[str, int] = {}
+
+
+class StationClusterIndex:
+    """
+    İstasyonları zoom seviyelerine göre hiyerarşik kümelerde tutan sınıf.
+    """
+
+    def __init__(self, max_zoom: int = 16, cell_px: int = 64):
+        """
+        StationClusterIndex sınıfını başlatır.
+
+        Args:
+            max_zoom: Kümelerin tutulduğu en yüksek zoom seviyesi
+            cell_px: Küme hücresinin ekrandaki boyutu (piksel, 2'nin kuvveti)
+        """
+        self.max_zoom = max_zoom
+        self.cell_px = cell_px
+        self.version = None
+        # Seviye 0'da dünya (TILE_SIZE / cell_px) hücre genişliğindedir, her seviyede iki katına çıkar
+        self._base_cells = max(1, TILE_SIZE // cell_px)
+        self._levels: List[Dict[Tuple[int, int], Cluster]] = [{} for _ in range(max_zoom + 1)]
+        self._stations: Dict[int, Tuple[float, float, float, float, str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._stations)
+
+    def _cells_per_axis(self, zoom: int) -> int:
+        return self._base_cells << zoom
+
+    def _update(self, station_id: int, lat: float, lon: float, x: float, y: float,
+                status: str, sign: int) -> None:
+        # Çağıran _lock içinde olmalıdır
+        for zoom, level in enumerate(self._levels):
+            cells = self._cells_per_axis(zoom)
+            key = (int(x * cells), int(y * cells))
+            cluster = level.get(key)
+            if cluster is None:
+                cluster = level[key] = Cluster()
+            cluster.count += sign
+            cluster.lat_sum += sign * lat
+            cluster.lon_sum += sign * lon
+            cluster.id_sum += sign * station_id
+            remaining = cluster.statuses.get(status, 0) + sign
+            if remaining:
+                cluster.statuses[status] = remaining
+            else:
+                cluster.statuses.pop(status, None)
+            if cluster.count == 0:
+                del level[key]
+
+    def _add(self, station_id: int, lat: float, lon: float, status: str) -> None:
+        if lat is None or lon is None:
+            return
+        x, y = mercator(lat, lon)
+        self._stations[station_id] = (lat, lon, x, y, status)
+        self._update(station_id, lat, lon, x, y, status, +1)
+
+    def _remove(self, station_id: int) -> None:
+        entry = self._stations.pop(station_id, None)
+        if entry is not None:
+            lat, lon, x, y, status = entry
+            self._update(station_id, lat, lon, x, y, status, -1)
+
+    def sync(self, version: Any, ids: Sequence[int], latitudes: Sequence[float],
+             longitudes: Sequence[float], statuses: Sequence[str]) -> int:
+        """
+        İndeksi güncel istasyon listesiyle eşitler; yalnızca farklı olan istasyonlar güncellenir.
+
+        Args:
+            version: Listenin sürüm damgası (aynı sürüm için hiçbir şey yapılmaz)
+            ids, latitudes, longitudes, statuses: İstasyon kolonları
+
+        Returns:
+            Güncellenen istasyon sayısı
+        """
+        with self._lock:
+            if version is not None and version == self.version:
+                return 0
+            changed = 0
+            seen = set()
+            stations = self._stations
+            for index, station_id in enumerate(ids):
+                seen.add(station_id)
+                lat, lon, status = latitudes[index], longitudes[index], statuses[index]
+                entry = stations.get(station_id)
+                if entry is not None and entry[0] == lat and entry[1] == lon and entry[4] == status:
+                    continue
+                self._remove(station_id)
+                self._add(station_id, lat, lon, status)
+                changed += 1
+            for station_id in [station_id for station_id in stations if station_id not in seen]:
+                self._remove(station_id)
+                changed += 1
+            self.version = version
+
+        if changed:
+            logger.debug(f"Küme indeksi eşitlendi: {changed} istasyon güncellendi")
+        return changed
+
+    def query(self, west: float, south: float, east: float, north: float, zoom: float) -> List[Dict[str, Any]]:
+        """
+        Sınır kutusundaki kümeleri döndürür.
+
+        Args:
+            west, south, east, north: Sınır kutusu (derece)
+            zoom: Harita zoom seviyesi (max_zoom üzerindeki değerler max_zoom'a indirilir)
+
+        Returns:
+            {"latitude", "longitude", "count", "statuses", "station_id"} sözlükleri;
+            station_id yalnızca tek istasyonlu kümelerde doludur
+        """
+        zoom = max(0, min(self.max_zoom, int(zoom)))
+        cells = self._cells_per_axis(zoom)
+        x_min, y_min = mercator(north, west)
+        x_max, y_max = mercator(south, east)
+        cx_min, cx_max = int(x_min * cells), int(x_max * cells)
+        cy_min, cy_max = int(y_min * cells), int(y_max * cells)
+
+        with self._lock:
+            level = self._levels[zoom]
+            if (cx_max - cx_min + 1) * (cy_max - cy_min + 1) <= len(level):
+                keys = [(cx, cy) for cx in range(cx_min, cx_max + 1) for cy in range(cy_min, cy_max + 1)
+                        if (cx, cy) in level]
+            else:
+                keys = [key for key in level if cx_min <= key[0] <= cx_max and cy_min <= key[1] <= cy_max]
+
+            clusters = []
+            for key in keys:
+                cluster = level[key]
+                clusters.append({
+                    "latitude": cluster.lat_sum / cluster.count,
+                    "longitude": cluster.lon_sum / cluster.count,
+                    "count": cluster.count,
+                    "statuses": dict(cluster.statuses),
+                    "station_id": cluster.id_sum if cluster.count == 1 else None,
+                })
+        return clusters
@@ -0,0 +1,100 @@
+"""
+İstasyon durum sayaçları modülü.
+
+Bu modül, şarj istasyonlarının durumlarına göre sayılarını bellekte
+artımlı olarak tutan ve belirli aralıklarla veritabanı ile uzlaştırılan
+sayaç sınıfını içerir.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StationStatusCounters:
+    """
+    Durum başına istasyon sayılarını O(1) güncelleme ile tutan sınıf.
+    """
+
+    def __init__(self, reconcile_interval: float = 60.0):
+        """
+        StationStatusCounters sınıfını başlatır.
+
+        Args:
+            reconcile_interval: Veritabanı ile uzlaştırma aralığı (saniye)
+        """
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._total = 0
+        self._reconciled_at: Optional[float] = None
+
+    def needs_reconcile(self) -> bool:
+        """
+        Sayaçların veritabanından yeniden okunması gerekip gerekmediğini döndürür.
+
+        Returns:
+            Hiç yüklenmediyse veya uzlaştırma aralığı geçtiyse True
+        """
+        reconciled_at = self._reconciled_at
+        return reconciled_at is None or time.monotonic() - reconciled_at >= self.reconcile_interval
+
+    def reconcile(self, status_counts: Iterable[Tuple[str, int]]) -> None:
+        """
+        Sayaçları veritabanından okunan durum sayılarıyla değiştirir.
+
+        Args:
+            status_counts: (durum, adet) çiftleri
+        """
+        counts = Counter({status: count for status, count in status_counts if count})
+        with self._lock:
+            if self._reconciled_at is not None and counts != self._counts:
+                logger.warning(f"İstasyon sayaçları uzlaştırıldı: {dict(self._counts)} -> {dict(counts)}")
+            self._counts = counts
+            self._total = sum(counts.values())
+            self._reconciled_at = time.monotonic()
+
+    def apply(self, old_status: Optional[str], new_status: Optional[str]) -> None:
+        """
+        Tek bir istasyonun durum değişikliğini sayaçlara işler.
+
+        Args:
+            old_status: Önceki durum (yeni eklenen istasyon için None)
+            new_status: Yeni durum (silinen istasyon için None)
+        """
+        if old_status == new_status:
+            return
+        with self._lock:
+            if old_status is not None:
+                remaining = self._counts[old_status] - 1
+                if remaining > 0:
+                    self._counts[old_status] = remaining
+                else:
+                    del self._counts[old_status]
+                self._total -= 1
+            if new_status is not None:
+                self._counts[new_status] += 1
+                self._total += 1
+
+    def summary(self, disconnected_status: str = 'Disconnected') -> Dict[str, Any]:
+        """
+        Toplam, bağlı ve durum bazında istasyon sayılarını döndürür.
+
+        Args:
+            disconnected_status: Bağlı sayılmayan durum
+
+        Returns:
+            {"total", "connected", "by_status"} sözlüğü
+        """
+        with self._lock:
+            total = self._total
+            by_status = dict(self._counts)
+        return {
+            "total": total,
+            "connected": total - by_status.get(disconnected_status, 0),
+            "by_status": by_status
+        }
@@ -0,0 +1,396 @@
+"""
+İstasyonlar arası mesafe deposu modülü.
+
+Bu modül, her istasyon için en yakın k istasyonu ve mesafelerini önceden
+hesaplayıp bellek eşlemli (memory-mapped) bir dosyada tutar. Okuyucular
+dosyayı salt okunur eşler; başlangıçta hiçbir şey yüklenmez ve her okuma
+doğrudan sayfa önbelleğinden yapılır. Yazmalar (tam kurulum, istasyon
+ekleme/silme) dosyaya süreçler arası kilit altında ``os.pwrite`` ile yapılır
+ve aynı dosyayı eşleyen tüm süreçlerde hemen görünür.
+
+Dosya süreç yeniden başlatmalarından sonra da kalır. add/remove dışından
+yapılan değişiklikler (tohum verileri, doğrudan veritabanı düzenlemeleri)
+için depo sync() ile veritabanındaki istasyonlarla karşılaştırılır ve
+farklıysa yeniden kurulur.
+
+Dosya düzeni:
+    Başlık (64 bayt): sihirli değer, düzen sürümü, k, kapasite, kurulum
+                      bayrağı, en büyük ID + 1 ve genel sürüm damgası
+    Slotlar (istasyon ID'si ile indekslenir): sıra sayacı (seqlock), var
+                      bayrağı, enlem, boylam, k komşu ID'si, k mesafe (km)
+"""
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Tuple
+
+from services.geo import simple_distance
+from services.station_grid import StationGrid
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok, yalnızca süreç içi kilit
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VXSD"
+LAYOUT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIIQ")  # magic, layout, k, capacity, built, high_water, version
+HEADER_SIZE = 64
+
+SLOT_HEAD = struct.Struct("<IB3xdd")  # seq, present, latitude, longitude
+
+NO_NEIGHBOR = -1
+
+
+class StationDistanceStore:
+    """
+    İstasyon başına en yakın k komşuyu paylaşımlı bir dosyada tutan sınıf.
+    """
+
+    def __init__(self, path: str, capacity: int = 65536, k: int = 16):
+        """
+        StationDistanceStore sınıfını başlatır ve dosyayı salt okunur eşler.
+
+        Args:
+            path: Depo dosyasının yolu
+            capacity: En büyük istasyon ID'si + 1 (slot sayısı)
+            k: İstasyon başına tutulacak komşu sayısı
+        """
+        self.path = path
+        self.capacity = capacity
+        self.k = k
+        self._neighbors = struct.Struct(f"<{k}i{k}f")
+        self.slot_size = SLOT_HEAD.size + self._neighbors.size
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        size = HEADER_SIZE + capacity * self.slot_size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        with self._file_lock():
+            if os.fstat(self._fd).st_size != size or not self._has_valid_header():
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, LAYOUT_VERSION, k, capacity, 0, 0, 0), 0)
+                logger.info(f"İstasyon mesafe deposu oluşturuldu: {path} ({capacity} slot, k={k})")
+            self._mm = mmap.mmap(self._fd, size, access=mmap.ACCESS_READ)
+
+    def _has_valid_header(self) -> bool:
+        data = os.pread(self._fd, HEADER.size, 0)
+        if len(data) != HEADER.size:
+            return False
+        magic, layout, k, capacity, _, _, _ = HEADER.unpack(data)
+        return magic == MAGIC and layout == LAYOUT_VERSION and k == self.k and capacity == self.capacity
+
+    @contextmanager
+    def _file_lock(self):
+        """Süreç içi ve (destekleniyorsa) süreçler arası yazma kilidi"""
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _header(self) -> Tuple:
+        return HEADER.unpack_from(self._mm, 0)
+
+    @property
+    def version(self) -> int:
+        """Her yazmada artan genel sürüm damgası"""
+        return self._header()[6]
+
+    def is_built(self) -> bool:
+        """Deponun tam olarak kurulup kurulmadığını döndürür"""
+        return self._header()[4] == 1
+
+    # --- Okuma ---
+
+    def _read_slot(self, station_id: int) -> Optional[Tuple[float, float, List[Tuple[int, float]]]]:
+        if not 0 <= station_id < self.capacity:
+            return None
+        mm = self._mm
+        offset = HEADER_SIZE + station_id * self.slot_size
+        for _ in range(8):
+            seq, present, lat, lon = SLOT_HEAD.unpack_from(mm, offset)
+            if seq & 1:
+                continue  # Yazma sürüyor
+            values = self._neighbors.unpack_from(mm, offset + SLOT_HEAD.size)
+            if SLOT_HEAD.unpack_from(mm, offset)[0] != seq:
+                continue
+            if not present:
+                return None
+            k = self.k
+            neighbors = [(values[i], values[k + i]) for i in range(k) if values[i] != NO_NEIGHBOR]
+            return lat, lon, neighbors
+        return None
+
+    def neighbors(self, station_id: int) -> List[Tuple[int, float]]:
+        """
+        İstasyonun en yakın komşularını döndürür.
+
+        Args:
+            station_id: İstasyon ID'si
+
+        Returns:
+            Mesafeye göre sıralı (istasyon_id, mesafe_km) çiftleri (istasyon yoksa boş)
+        """
+        slot = self._read_slot(station_id)
+        return slot[2] if slot else []
+
+    def coordinates(self, station_id: int) -> Optional[Tuple[float, float]]:
+        """İstasyonun depodaki (enlem, boylam) bilgisini döndürür"""
+        slot = self._read_slot(station_id)
+        return (slot[0], slot[1]) if slot else None
+
+    def distance(self, station_a: int, station_b: int) -> Optional[float]:
+        """
+        İki istasyon arasındaki mesafeyi döndürür.
+
+        Komşu listesinde varsa önceden hesaplanmış değer, yoksa depodaki
+        koordinatlardan simple_distance ile hesaplanan değer döner.
+
+        Returns:
+            Mesafe (km) veya None (istasyonlardan biri yoksa)
+        """
+        slot_a = self._read_slot(station_a)
+        if slot_a is None:
+            return None
+        for neighbor_id, distance_km in slot_a[2]:
+            if neighbor_id == station_b:
+                return distance_km
+        slot_b = self._read_slot(station_b)
+        if slot_b is None:
+            return None
+        return simple_distance(slot_a[0], slot_a[1], slot_b[0], slot_b[1])
+
+    # --- Yazma (çağıran _file_lock içinde olmalıdır) ---
+
+    def _pack_slot(self, seq: int, present: bool, lat: float, lon: float,
+                   neighbors: List[Tuple[int, float]]) -> bytes:
+        k = self.k
+        neighbors = neighbors[:k]
+        ids = [neighbor_id for neighbor_id, _ in neighbors] + [NO_NEIGHBOR] * (k - len(neighbors))
+        distances = [distance_km for _, distance_km in neighbors] + [0.0] * (k - len(neighbors))
+        return SLOT_HEAD.pack(seq & 0xFFFFFFFF, 1 if present else 0, lat, lon) + self._neighbors.pack(*ids, *distances)
+
+    def _write_slot(self, station_id: int, present: bool, lat: float = 0.0, lon: float = 0.0,
+                    neighbors: List[Tuple[int, float]] = ()) -> None:
+        offset = HEADER_SIZE + station_id * self.slot_size
+        seq = struct.unpack_from("<I", self._mm, offset)[0]
+        # Sıra sayacı tekken gövde yazılır, ardından sayaç çifte çekilir (seqlock)
+        os.pwrite(self._fd, struct.pack("<I", (seq + 1) & 0xFFFFFFFF), offset)
+        os.pwrite(self._fd, self._pack_slot(0, present, lat, lon, list(neighbors))[4:], offset + 4)
+        os.pwrite(self._fd, struct.pack("<I", (seq + 2) & 0xFFFFFFFF), offset)
+
+    def _write_header(self, built: int, high_water: int) -> None:
+        version = self.version + 1
+        os.pwrite(self._fd, HEADER.pack(MAGIC, LAYOUT_VERSION, self.k, self.capacity, built, high_water, version), 0)
+
+    def _present_stations(self) -> Tuple[List[int], List[float], List[float]]:
+        ids, latitudes, longitudes = [], [], []
+        mm, slot_size = self._mm, self.slot_size
+        for station_id in range(self._header()[5]):
+            _, present, lat, lon = SLOT_HEAD.unpack_from(mm, HEADER_SIZE + station_id * slot_size)
+            if present:
+                ids.append(station_id)
+                latitudes.append(lat)
+                longitudes.append(lon)
+        return ids, latitudes, longitudes
+
+    def _in_range(self, station_id: int, lat, lon) -> bool:
+        if not 0 <= station_id < self.capacity:
+            logger.warning(f"İstasyon ID'si mesafe deposu kapasitesini aşıyor: {station_id}")
+            return False
+        return lat is not None and lon is not None
+
+    def _valid_rows(self, rows: Iterable[Tuple[int, float, float]]) -> List[Tuple[int, float, float]]:
+        return sorted((station_id, lat, lon) for station_id, lat, lon in rows
+                      if self._in_range(station_id, lat, lon))
+
+    def build(self, rows: Iterable[Tuple[int, float, float]]) -> bool:
+        """
+        Depoyu tüm istasyonlardan sıfırdan kurar (başka bir süreç kurduysa atlar).
+
+        Args:
+            rows: (istasyon_id, enlem, boylam) satırları
+
+        Returns:
+            Kurulum bu çağrıda yapıldıysa True
+        """
+        rows = self._valid_rows(rows)
+        with self._file_lock():
+            if self.is_built():
+                return False
+            self._build(rows)
+        return True
+
+    def sync(self, rows: Iterable[Tuple[int, float, float]]) -> bool:
+        """
+        Depodaki istasyonları veritabanındakilerle karşılaştırır; kurulmamışsa
+        veya istasyon kümesi ya da konumlar farklıysa depoyu yeniden kurar.
+
+        Args:
+            rows: (istasyon_id, enlem, boylam) satırları
+
+        Returns:
+            Depo bu çağrıda (yeniden) kurulduysa True
+        """
+        rows = self._valid_rows(rows)
+        with self._file_lock():
+            if self.is_built():
+                ids, latitudes, longitudes = self._present_stations()
+                if list(zip(ids, latitudes, longitudes)) == rows:
+                    return False
+                logger.warning(f"İstasyon mesafe deposu veritabanıyla uyuşmuyor "
+                               f"({len(ids)} / {len(rows)} istasyon), yeniden kuruluyor")
+            self._build(rows)
+        return True
+
+    def _build(self, rows: List[Tuple[int, float, float]]) -> None:
+        # Çağıran _file_lock içinde olmalıdır
+        started = time.perf_counter()
+        ids = [row[0] for row in rows]
+        grid = StationGrid([row[1] for row in rows], [row[2] for row in rows])
+        high_water = max(ids, default=-1) + 1
+
+        # Slotlar tek bir tampon halinde yazılır (eski içerik tamamen silinir)
+        empty = self._pack_slot(0, False, 0.0, 0.0, [])
+        buffer = bytearray(empty * high_water)
+        for index, (station_id, lat, lon) in enumerate(rows):
+            neighbors = [(ids[other], distance_km) for other, distance_km in grid.nearest(lat, lon, self.k, exclude=index)]
+            start = station_id * self.slot_size
+            buffer[start:start + self.slot_size] = self._pack_slot(0, True, lat, lon, neighbors)
+        os.pwrite(self._fd, bytes(buffer), HEADER_SIZE)
+        os.pwrite(self._fd, bytes(len(empty) * (self.capacity - high_water)), HEADER_SIZE + len(buffer))
+        self._write_header(1, high_water)
+
+        logger.info(f"İstasyon mesafe deposu kuruldu: {len(rows)} istasyon, "
+                    f"{(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def add(self, station_id: int, lat: float, lon: float) -> None:
+        """
+        Yeni istasyonu ekler; komşu listesi ve yeni istasyonun girdiği
+        diğer istasyonların listeleri güncellenir.
+
+        Args:
+            station_id: İstasyon ID'si
+            lat, lon: İstasyonun konumu
+        """
+        if not self._in_range(station_id, lat, lon):
+            return
+        with self._file_lock():
+            if not self.is_built():
+                return  # Kurulumda zaten okunacak
+            ids, latitudes, longitudes = self._present_stations()
+            distances = []
+            for index, other_id in enumerate(ids):
+                if other_id == station_id:
+                    continue
+                distance_km = simple_distance(lat, lon, latitudes[index], longitudes[index])
+                distances.append((distance_km, other_id))
+
+                slot = self._read_slot(other_id)
+                other_neighbors = [n for n in slot[2] if n[0] != station_id]
+                if len(other_neighbors) < self.k or distance_km < other_neighbors[-1][1]:
+                    other_neighbors.append((station_id, distance_km))
+                    other_neighbors.sort(key=lambda n: n[1])
+                    self._write_slot(other_id, True, slot[0], slot[1], other_neighbors)
+
+            distances.sort()
+            self._write_slot(station_id, True, lat, lon,
+                             [(other_id, distance_km) for distance_km, other_id in distances[:self.k]])
+            self._write_header(1, max(self._header()[5], station_id + 1))
+
+    def remove(self, station_id: int) -> None:
+        """
+        İstasyonu siler; onu komşu listesinde tutan istasyonların listeleri yeniden hesaplanır.
+
+        Args:
+            station_id: İstasyon ID'si
+        """
+        if not 0 <= station_id < self.capacity:
+            return
+        with self._file_lock():
+            if not self.is_built():
+                return
+            self._write_slot(station_id, False)
+            ids, latitudes, longitudes = self._present_stations()
+            affected = [index for index, other_id in enumerate(ids)
+                        if any(n[0] == station_id for n in self.neighbors(other_id))]
+            if affected:
+                grid = StationGrid(latitudes, longitudes)
+                for index in affected:
+                    neighbors = [(ids[other], distance_km) for other, distance_km in
+                                 grid.nearest(latitudes[index], longitudes[index], self.k, exclude=index)]
+                    self._write_slot(ids[index], True, latitudes[index], longitudes[index], neighbors)
+            self._write_header(1, self._header()[5])
+
+    def close(self) -> None:
+        """Eşlemeyi ve dosyayı kapatır"""
+        self._mm.close()
+        os.close(self._fd)
+
+
+def benchmark_distance_store(path: str, stations: int = 10000, lookups: int = 100000, k: int = 16) -> dict:
+    """
+    Deponun kurulum, açılış, okuma ve artımlı güncelleme sürelerini ölçer.
+
+    Args:
+        path: Geçici depo dosyası
+        stations: Sentetik istasyon sayısı
+        lookups: Komşu okuma sayısı
+        k: Komşu sayısı
+
+    Returns:
+        Ölçüm sözlüğü (ms / µs)
+    """
+    import random
+    rng = random.Random(11)
+    rows = [(station_id, rng.uniform(36, 42), rng.uniform(26, 45)) for station_id in range(1, stations + 1)]
+
+    if os.path.exists(path):
+        os.remove(path)
+    store = StationDistanceStore(path, capacity=stations + 2, k=k)
+    start = time.perf_counter()
+    store.build(rows)
+    build_ms = (time.perf_counter() - start) * 1000
+    store.close()
+
+    start = time.perf_counter()
+    store = StationDistanceStore(path, capacity=stations + 2, k=k)
+    open_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(lookups):
+        store.neighbors(rng.randint(1, stations))
+    lookup_us = (time.perf_counter() - start) / lookups * 1e6
+
+    start = time.perf_counter()
+    store.add(stations + 1, 39.0, 35.0)
+    add_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    store.remove(stations + 1)
+    remove_ms = (time.perf_counter() - start) * 1000
+
+    store.close()
+    os.remove(path)
+    return {"build_ms": build_ms, "open_ms": open_ms, "lookup_us": lookup_us, "add_ms": add_ms, "remove_ms": remove_ms}
+
+
+if __name__ == "__main__":
+    # Örnek: python -m services.station_distances
+    import tempfile
+    stats = benchmark_distance_store(os.path.join(tempfile.gettempdir(), "voltrix_distances.bench"))
+    print(f"kurulum {stats['build_ms']:.0f} ms  açılış {stats['open_ms']:.2f} ms  "
+          f"okuma {stats['lookup_us']:.1f} µs  ekleme {stats['add_ms']:.1f} ms  silme {stats['remove_ms']:.1f} ms")
@@ -0,0 +1,178 @@
+"""
+İstasyon uzamsal ızgarası modülü.
+
+Bu modül, istasyonları enlem/boylam derecesine göre sabit boyutlu hücrelere
+yerleştiren bir ızgara ve bu ızgara üzerinde rota koridoru araması içerir.
+Koridor araması yalnızca rotanın geçtiği hücrelere baktığı için maliyeti
+toplam istasyon sayısıyla değil rota uzunluğuyla orantılıdır.
+"""
+
+import logging
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from services.geo import simple_distance
+
+logger = logging.getLogger(__name__)
+
+KM_PER_DEGREE_LAT = 111.32  # Bir enlem derecesinin yaklaşık uzunluğu (km)
+
+
+def _closest_point_on_segment(lat: float, lon: float, start: Tuple[float, float],
+                              end: Tuple[float, float]) -> Tuple[float, float]:
+    """Noktanın segment üzerindeki en yakın noktasını (yerel eşdikdörtgen izdüşümle) bulur"""
+    lat1, lon1 = start
+    lat2, lon2 = end
+    scale = math.cos(math.radians((lat1 + lat2) / 2))
+    dx, dy = (lon2 - lon1) * scale, lat2 - lat1
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return start
+    t = ((lon - lon1) * scale * dx + (lat - lat1) * dy) / length_sq
+    t = min(1.0, max(0.0, t))
+    return lat1 + t * (lat2 - lat1), lon1 + t * (lon2 - lon1)
+
+
+class StationGrid:
+    """
+    İstasyon indekslerini ızgara hücrelerinde tutan sınıf.
+    """
+
+    def __init__(self, latitudes: Sequence[float], longitudes: Sequence[float],
+                 cell_deg: float = 0.1, version: int = None):
+        """
+        Izgarayı oluşturur.
+
+        Args:
+            latitudes: İstasyon enlemleri (StationArrays sırasıyla)
+            longitudes: İstasyon boylamları
+            cell_deg: Hücre boyutu (derece)
+            version: Izgaranın oluşturulduğu verinin sürüm damgası
+        """
+        self.cell_deg = cell_deg
+        self.version = version
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for index in range(len(latitudes)):
+            self.cells[self.cell_of(latitudes[index], longitudes[index])].append(index)
+        self.cells = dict(self.cells)
+        rows = [cell[0] for cell in self.cells] or [0]
+        cols = [cell[1] for cell in self.cells] or [0]
+        self.bounds = (min(rows), min(cols), max(rows), max(cols))
+
+    def cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Koordinatın düştüğü hücreyi döndürür"""
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def cells_in_box(self, min_lat: float, min_lon: float,
+                     max_lat: float, max_lon: float) -> Iterable[Tuple[int, int]]:
+        """Sınır kutusuyla kesişen (ve istasyon içeren) hücreleri döndürür"""
+        row_min, col_min = self.cell_of(min_lat, min_lon)
+        row_max, col_max = self.cell_of(max_lat, max_lon)
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                if (row, col) in self.cells:
+                    yield row, col
+
+    def nearest(self, lat: float, lon: float, k: int, exclude: int = None) -> List[Tuple[int, float]]:
+        """
+        Koordinata en yakın k istasyonu halka halka genişleyen hücre aramasıyla bulur.
+
+        Args:
+            lat, lon: Sorgu noktası
+            k: İstenen komşu sayısı
+            exclude: Sonuçlara alınmayacak istasyon indeksi (ör. sorgunun kendisi)
+
+        Returns:
+            Mesafeye göre sıralı (istasyon_indeksi, mesafe_km) çiftleri
+        """
+        if k <= 0 or not self.cells:
+            return []
+        center_row, center_col = self.cell_of(lat, lon)
+        min_row, min_col, max_row, max_col = self.bounds
+        max_ring = max(abs(center_row - min_row), abs(center_row - max_row),
+                       abs(center_col - min_col), abs(center_col - max_col))
+        # Halka r'nin dışındaki her nokta en az r hücre kenarı uzaktadır
+        cos_lat = max(0.01, math.cos(math.radians(min(89.0, abs(lat) + (max_ring + 1) * self.cell_deg))))
+        min_cell_km = self.cell_deg * KM_PER_DEGREE_LAT * cos_lat
+
+        found: List[Tuple[float, int]] = []
+        for ring in range(max_ring + 1):
+            for row in range(center_row - ring, center_row + ring + 1):
+                on_edge = row in (center_row - ring, center_row + ring)
+                step = 1 if on_edge else 2 * ring
+                for col in range(center_col - ring, center_col + ring + 1, max(1, step)):
+                    for index in self.cells.get((row, col), ()):
+                        if index != exclude:
+                            found.append((simple_distance(lat, lon, self.latitudes[index],
+                                                          self.longitudes[index]), index))
+            if len(found) >= k:
+                found.sort()
+                del found[k:]
+                if found[-1][0] <= ring * min_cell_km:
+                    break
+
+        found.sort()
+        return [(index, distance_km) for distance_km, index in found[:k]]
+
+    def corridor(self, route: Sequence[Tuple[float, float]], buffer_km: float) -> List[Tuple[int, float, float]]:
+        """
+        Rota koridorundaki istasyonları rota boyunca mesafeye göre sıralı döndürür.
+
+        Args:
+            route: Rotanın (enlem, boylam) noktaları
+            buffer_km: Rotadan en fazla uzaklık (km)
+
+        Returns:
+            (istasyon_indeksi, rotaya_uzaklık_km, rota_boyunca_mesafe_km) demetleri
+        """
+        if not route:
+            return []
+        if len(route) == 1:
+            route = [route[0], route[0]]
+
+        # Her hücreye yakınından geçen segmentleri kaydet; uzun segmentler
+        # hücre boyunda parçalara bölünerek yalnızca geçtikleri hücrelere yazılır
+        cell_km = self.cell_deg * KM_PER_DEGREE_LAT
+        buffer_lat = buffer_km / KM_PER_DEGREE_LAT
+        segments_by_cell: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        offsets = [0.0]
+
+        for segment in range(len(route) - 1):
+            (lat1, lon1), (lat2, lon2) = route[segment], route[segment + 1]
+            length_km = simple_distance(lat1, lon1, lat2, lon2)
+            offsets.append(offsets[-1] + length_km)
+
+            pieces = max(1, math.ceil(length_km / cell_km))
+            for piece in range(pieces):
+                a, b = piece / pieces, (piece + 1) / pieces
+                plat1, plon1 = lat1 + a * (lat2 - lat1), lon1 + a * (lon2 - lon1)
+                plat2, plon2 = lat1 + b * (lat2 - lat1), lon1 + b * (lon2 - lon1)
+                cos_lat = max(0.01, math.cos(math.radians(max(abs(plat1), abs(plat2)) + buffer_lat)))
+                buffer_lon = buffer_lat / cos_lat
+                for cell in self.cells_in_box(min(plat1, plat2) - buffer_lat, min(plon1, plon2) - buffer_lon,
+                                              max(plat1, plat2) + buffer_lat, max(plon1, plon2) + buffer_lon):
+                    cell_segments = segments_by_cell[cell]
+                    if not cell_segments or cell_segments[-1] != segment:
+                        cell_segments.append(segment)
+
+        best: Dict[int, Tuple[float, float]] = {}
+        for cell, segments in segments_by_cell.items():
+            for index in self.cells[cell]:
+                lat, lon = self.latitudes[index], self.longitudes[index]
+                for segment in segments:
+                    start = route[segment]
+                    closest = _closest_point_on_segment(lat, lon, start, route[segment + 1])
+                    distance_km = simple_distance(lat, lon, closest[0], closest[1])
+                    if distance_km > buffer_km:
+                        continue
+                    along_km = offsets[segment] + simple_distance(start[0], start[1], closest[0], closest[1])
+                    current = best.get(index)
+                    if current is None or distance_km < current[0]:
+                        best[index] = (distance_km, along_km)
+
+        results = [(index, distance_km, along_km) for index, (distance_km, along_km) in best.items()]
+        results.sort(key=lambda item: (item[2], item[1]))
+        return results
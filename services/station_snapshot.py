@@ -0,0 +1,253 @@
+"""
+İkili istasyon anlık görüntüsü (snapshot) modülü.
+
+Bu modül, mobil uygulamanın çevrimdışı önbelleği için tüm istasyonları
+küçük, sabit genişlikli bir ikili biçimde kodlar ve iki sürüm arasındaki
+farkı (delta) ayrı bir yama olarak üretir. Biçim (tüm sayılar little-endian):
+
+    Başlık:   magic (4s) | biçim sürümü (H) | veri sürümü (Q) |
+              kayıt sayısı (I) | silinen sayısı (I) | dizge sayısı (I)
+    Delta başlığı ek olarak: temel sürüm (Q) | temel CRC32 (I)
+    Kayıtlar: id (I) | enlem*1e7 (i) | boylam*1e7 (i) | durum dizge indeksi (H) |
+              güç*10 kW (H, 0xFFFF = bilinmiyor) | ad dizge indeksi (I)
+    Silinen ID'ler (yalnızca delta): id (I)
+    Dizge tablosu: uzunluk (H) | UTF-8 bayt
+    Son: önceki tüm baytların CRC32 değeri (I)
+
+Bir anlık görüntünün etiketi "<veri sürümü>-<crc32>" biçimindedir; istemci
+elindeki etiketi göndererek yalnızca yamayı indirebilir.
+"""
+
+import logging
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"VSNP"
+DELTA_MAGIC = b"VDLT"
+FORMAT_VERSION = 1
+
+COORDINATE_SCALE = 10_000_000   # 1e-7 derece (~1 cm)
+POWER_SCALE = 10                # 0.1 kW
+POWER_UNKNOWN = 0xFFFF
+
+_HEADER = struct.Struct("<4sHQIII")
+_DELTA_BASE = struct.Struct("<QI")
+_RECORD = struct.Struct("<IiiHHI")
+_ID = struct.Struct("<I")
+_LENGTH = struct.Struct("<H")
+_CRC = struct.Struct("<I")
+
+# id -> (enlem_e7, boylam_e7, durum, güç_0.1kW, ad)
+Record = Tuple[int, int, str, int, str]
+
+
+def make_record(latitude: float, longitude: float, status: Optional[str],
+                power_kw: Optional[float], name: Optional[str]) -> Record:
+    """İstasyon alanlarını ikili biçimdeki sabit genişlikli değerlere yuvarlar"""
+    if power_kw is None:
+        power = POWER_UNKNOWN
+    else:
+        power = max(0, min(POWER_UNKNOWN - 1, int(round(power_kw * POWER_SCALE))))
+    return (int(round(latitude * COORDINATE_SCALE)), int(round(longitude * COORDINATE_SCALE)),
+            status or "", power, name or "")
+
+
+def _encode(magic: bytes, version: int, records: Dict[int, Record],
+            deleted: Sequence[int] = (), base: bytes = b"") -> bytes:
+    strings: Dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    body = bytearray()
+    for station_id in sorted(records):
+        lat, lon, status, power, name = records[station_id]
+        body += _RECORD.pack(station_id, lat, lon, intern(status), power, intern(name))
+    for station_id in sorted(deleted):
+        body += _ID.pack(station_id)
+    for text in strings:  # Ekleme sırası = indeks sırası
+        encoded = text.encode("utf-8")[:0xFFFF]
+        body += _LENGTH.pack(len(encoded)) + encoded
+
+    data = _HEADER.pack(magic, FORMAT_VERSION, version, len(records), len(deleted), len(strings)) + base + body
+    return data + _CRC.pack(zlib.crc32(data))
+
+
+def _decode(data: bytes, magic: bytes) -> Tuple[int, bytes, Dict[int, Record], list]:
+    if len(data) < _HEADER.size + _CRC.size or zlib.crc32(data[:-_CRC.size]) != _CRC.unpack_from(data, len(data) - _CRC.size)[0]:
+        raise ValueError("Bozuk anlık görüntü verisi")
+    found, format_version, version, record_count, deleted_count, string_count = _HEADER.unpack_from(data, 0)
+    if found != magic or format_version != FORMAT_VERSION:
+        raise ValueError("Desteklenmeyen anlık görüntü biçimi")
+
+    offset = _HEADER.size
+    base = b""
+    if magic == DELTA_MAGIC:
+        base = data[offset:offset + _DELTA_BASE.size]
+        offset += _DELTA_BASE.size
+    raw_records = [_RECORD.unpack_from(data, offset + i * _RECORD.size) for i in range(record_count)]
+    offset += record_count * _RECORD.size
+    deleted = [_ID.unpack_from(data, offset + i * _ID.size)[0] for i in range(deleted_count)]
+    offset += deleted_count * _ID.size
+    strings = []
+    for _ in range(string_count):
+        length = _LENGTH.unpack_from(data, offset)[0]
+        offset += _LENGTH.size
+        strings.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+
+    records = {station_id: (lat, lon, strings[status], power, strings[name])
+               for station_id, lat, lon, status, power, name in raw_records}
+    return version, base, records, deleted
+
+
+def encode_snapshot(version: int, records: Dict[int, Record]) -> bytes:
+    """Tüm istasyonların anlık görüntüsünü kodlar"""
+    return _encode(SNAPSHOT_MAGIC, version, records)
+
+
+def decode_snapshot(data: bytes) -> Tuple[int, Dict[int, Record]]:
+    """
+    Anlık görüntüyü çözer (istemcinin uyması gereken başvuru uygulaması).
+
+    Returns:
+        (veri sürümü, kayıtlar)
+
+    Raises:
+        ValueError: Veri bozuksa veya biçim desteklenmiyorsa
+    """
+    version, _, records, _ = _decode(data, SNAPSHOT_MAGIC)
+    return version, records
+
+
+def encode_delta(base: "Snapshot", target: "Snapshot") -> bytes:
+    """İki anlık görüntü arasındaki yamayı (değişen/eklenen kayıtlar ve silinen ID'ler) kodlar"""
+    changed = {station_id: record for station_id, record in target.records.items()
+               if base.records.get(station_id) != record}
+    deleted = [station_id for station_id in base.records if station_id not in target.records]
+    return _encode(DELTA_MAGIC, target.version, changed, deleted,
+                   base=_DELTA_BASE.pack(base.version, base.crc))
+
+
+def apply_delta(base: "Snapshot", data: bytes) -> Tuple[int, Dict[int, Record]]:
+    """
+    Yamayı anlık görüntüye uygular (istemcinin uyması gereken başvuru uygulaması).
+
+    Returns:
+        (yeni veri sürümü, yeni kayıtlar)
+
+    Raises:
+        ValueError: Yama bozuksa veya başka bir anlık görüntü için üretilmişse
+    """
+    version, base_header, changed, deleted = _decode(data, DELTA_MAGIC)
+    if _DELTA_BASE.unpack(base_header) != (base.version, base.crc):
+        raise ValueError("Yama bu anlık görüntü için üretilmemiş")
+    records = dict(base.records)
+    for station_id in deleted:
+        records.pop(station_id, None)
+    records.update(changed)
+    return version, records
+
+
+class Snapshot:
+    """Kodlanmış bir anlık görüntü ve kayıtları"""
+    __slots__ = ("version", "records", "data", "crc", "tag")
+
+    def __init__(self, version: int, records: Dict[int, Record]):
+        self.version = version
+        self.records = records
+        self.data = encode_snapshot(version, records)
+        self.crc = _CRC.unpack_from(self.data, len(self.data) - _CRC.size)[0]
+        # CRC etikete katıldığı için sürüm sayacı sıfırlansa bile eski etiketler yanlış eşleşmez
+        self.tag = f"{version}-{self.crc:08x}"
+
+
+class SnapshotStore:
+    """
+    Son anlık görüntüleri ve aralarındaki yamaları saklayan sınıf.
+    """
+
+    def __init__(self, history: int = 8, max_delta_ratio: float = 0.5):
+        """
+        SnapshotStore sınıfını başlatır.
+
+        Args:
+            history: Yama üretilebilecek en fazla eski anlık görüntü sayısı
+            max_delta_ratio: Yama tam görüntünün bu oranından büyükse tam görüntü gönderilir
+        """
+        self.history = history
+        self.max_delta_ratio = max_delta_ratio
+        self._snapshots: "OrderedDict[str, Snapshot]" = OrderedDict()
+        self._deltas: Dict[Tuple[str, str], Optional[bytes]] = {}
+        self._current: Optional[Snapshot] = None
+        self._current_version = None
+        self._lock = threading.Lock()
+
+    def current(self, version: int, ids: Sequence[int], latitudes: Sequence[float],
+                longitudes: Sequence[float], statuses: Sequence[str],
+                powers: Sequence[Optional[float]], names: Sequence[str]) -> Snapshot:
+        """
+        Verilen sürümün anlık görüntüsünü döndürür (içerik değiştiyse yeniden kodlar).
+
+        Args:
+            version: Verinin sürüm damgası
+            ids, latitudes, longitudes, statuses, powers, names: İstasyon kolonları
+
+        Returns:
+            Snapshot
+        """
+        snapshot = self._current
+        if snapshot is not None and self._current_version == version:
+            return snapshot
+
+        records = {ids[i]: make_record(latitudes[i], longitudes[i], statuses[i], powers[i], names[i])
+                   for i in range(len(ids))}
+        with self._lock:
+            snapshot = self._current
+            if snapshot is not None and self._current_version == version:
+                return snapshot
+            self._current_version = version
+            if snapshot is not None and snapshot.records == records:
+                # İçerik aynı (ör. yalnızca rezervasyon değişti); istemciler etiketlerini korur
+                return snapshot
+            snapshot = Snapshot(version, records)
+            self._snapshots[snapshot.tag] = snapshot
+            self._snapshots.move_to_end(snapshot.tag)
+            while len(self._snapshots) > self.history + 1:
+                old_tag, _ = self._snapshots.popitem(last=False)
+                for key in [key for key in self._deltas if key[0] == old_tag]:
+                    del self._deltas[key]
+            self._current = snapshot
+        return snapshot
+
+    def delta(self, since_tag: str, target: Snapshot) -> Optional[bytes]:
+        """
+        Etiketi verilen anlık görüntüden hedefe yamayı döndürür.
+
+        Returns:
+            Yama baytları; temel görüntü artık tutulmuyorsa veya yama
+            tam görüntüden kayda değer ölçüde küçük değilse None
+        """
+        key = (since_tag, target.tag)
+        with self._lock:
+            if key in self._deltas:
+                return self._deltas[key]
+            base = self._snapshots.get(since_tag)
+        if base is None:
+            return None
+
+        data = encode_delta(base, target)
+        if len(data) > len(target.data) * self.max_delta_ratio:
+            data = None
+        with self._lock:
+            if since_tag in self._snapshots:
+                self._deltas[key] = data
+        return data
@@ -0,0 +1,316 @@
+"""
+Paylaşımlı istasyon durum önbelleği modülü.
+
+Bu modül, istasyon durumlarını bellek eşlemli (memory-mapped) bir dosyada
+istasyon ID'si ile indekslenen sabit genişlikli bir dizi olarak tutar.
+Aynı dosyayı eşleyen tüm Flask işçi süreçleri durumları veritabanına
+gitmeden O(1) sürede okuyabilir.
+
+Dosya süreç yeniden başlatmalarından sonra da kalır; uygulama dışında
+yapılan değişiklikler (tohum verileri, doğrudan veritabanı düzenlemeleri)
+bu yüzden her süreçte ilk kullanımda ve sonra belirli aralıklarla
+veritabanıyla uzlaştırılır. Başlıktaki parmak izi, son uzlaştırmada
+görülen istasyon satırlarını özetler; durum dışındaki kolonlar değiştiğinde
+de sürüm damgası artırılır ve türetilmiş önbellekler yeniden oluşturulur.
+Uzlaştırma yalnızca şimdiye kadar yazılmış en büyük istasyon ID'sine kadar
+olan slotları tarar; bu sınırın ötesindeki slotlar hiç yazılmamıştır ve
+ısınmış önbellekte istasyonun olmadığını gösterir.
+
+Dosya düzeni:
+    Başlık (64 bayt): sihirli değer, düzen sürümü, slot boyutu, kapasite,
+                      ısınma bayrağı, genel sürüm damgası, başka önbelleklerin
+                      kullanabileceği paylaşımlı sayaçlar, kullanılan slot
+                      sınırı (en büyük yazılmış ID + 1) ve veritabanı parmak izi
+    Slotlar (32 bayt): sıra sayacı (seqlock), durum uzunluğu, durum metni
+"""
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok, yalnızca süreç içi kilit
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VXSC"
+LAYOUT_VERSION = 2  # 2: kullanılan slot sınırı
+HEADER = struct.Struct("<4sHHIIQ")  # magic, layout, slot_size, capacity, warm, version
+HEADER_SIZE = 64
+VERSION_OFFSET = 16
+WARM_OFFSET = 12
+COUNTERS_OFFSET = 24
+COUNTER_SLOTS = 3  # Başlıktaki paylaşımlı sayaç sayısı (her biri 8 bayt)
+HIGH_WATER_OFFSET = 48
+FINGERPRINT_OFFSET = 56
+
+# Uzlaştırma eşzamanlı bir yazma yüzünden yapılamazsa bu kadar sonra (saniye) yeniden denenir
+RECONCILE_RETRY_DELAY = 1.0
+
+SLOT = struct.Struct("<IB20s")  # seq, length, status
+SLOT_SIZE = 32
+STATUS_WIDTH = 20
+
+EMPTY = 0x00      # Slot hiç yazılmadı (bilinmiyor, veritabanına bakılmalı)
+ABSENT = 0xFF     # İstasyon yok (silinmiş veya hiç eklenmemiş)
+
+MISSING = object()  # İstasyonun olmadığını belirten dönüş değeri
+
+
+class StationStatusCache:
+    """
+    İstasyon durumlarını süreçler arası paylaşılan bir dosyada tutan sınıf.
+    """
+
+    def __init__(self, path: str, capacity: int = 65536, reconcile_interval: float = 60.0):
+        """
+        StationStatusCache sınıfını başlatır ve dosyayı eşler.
+
+        Args:
+            path: Önbellek dosyasının yolu
+            capacity: En büyük istasyon ID'si + 1 (slot sayısı)
+            reconcile_interval: Veritabanı ile uzlaştırma aralığı (saniye)
+        """
+        self.path = path
+        self.capacity = capacity
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._next_reconcile: Optional[float] = None  # Süreç içi: her süreç başlangıçta uzlaştırır
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        size = HEADER_SIZE + capacity * SLOT_SIZE
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        with self._file_lock():
+            if os.fstat(self._fd).st_size != size or not self._has_valid_header():
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                os.write(self._fd, HEADER.pack(MAGIC, LAYOUT_VERSION, SLOT_SIZE, capacity, 0, 0))
+                logger.info(f"İstasyon durum önbelleği oluşturuldu: {path} ({capacity} slot)")
+            self._mm = mmap.mmap(self._fd, size)
+
+    def _has_valid_header(self) -> bool:
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        data = os.read(self._fd, HEADER.size)
+        if len(data) != HEADER.size:
+            return False
+        magic, layout, slot_size, capacity, _, _ = HEADER.unpack(data)
+        return magic == MAGIC and layout == LAYOUT_VERSION and slot_size == SLOT_SIZE and capacity == self.capacity
+
+    @contextmanager
+    def _file_lock(self):
+        """Süreç içi ve (destekleniyorsa) süreçler arası yazma kilidi"""
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @property
+    def version(self) -> int:
+        """Her yazmada artan genel sürüm damgası"""
+        return struct.unpack_from("<Q", self._mm, VERSION_OFFSET)[0]
+
+    def counter(self, index: int) -> int:
+        """
+        Başlıktaki paylaşımlı sayacın değerini döndürür.
+
+        Args:
+            index: Sayaç numarası (0 <= index < COUNTER_SLOTS)
+
+        Returns:
+            Sayacın güncel değeri
+        """
+        if not 0 <= index < COUNTER_SLOTS:
+            raise IndexError(f"Geçersiz sayaç numarası: {index}")
+        return struct.unpack_from("<Q", self._mm, COUNTERS_OFFSET + index * 8)[0]
+
+    def bump_counter(self, index: int) -> int:
+        """
+        Paylaşımlı sayacı tüm süreçler için artırır.
+
+        Args:
+            index: Sayaç numarası (0 <= index < COUNTER_SLOTS)
+
+        Returns:
+            Sayacın yeni değeri
+        """
+        with self._file_lock():
+            value = self.counter(index) + 1
+            struct.pack_into("<Q", self._mm, COUNTERS_OFFSET + index * 8, value)
+        return value
+
+    @property
+    def high_water(self) -> int:
+        """Şimdiye kadar yazılmış en büyük istasyon ID'si + 1 (uzlaştırmanın taradığı slot sayısı)"""
+        return struct.unpack_from("<Q", self._mm, HIGH_WATER_OFFSET)[0]
+
+    def is_warm(self) -> bool:
+        """Önbelleğin veritabanından doldurulup doldurulmadığını döndürür"""
+        return struct.unpack_from("<I", self._mm, WARM_OFFSET)[0] == 1
+
+    def get(self, station_id: int):
+        """
+        İstasyonun durumunu döndürür.
+
+        Args:
+            station_id: İstasyon ID'si
+
+        Returns:
+            Durum metni, istasyon yoksa MISSING, bilinmiyorsa None
+        """
+        if not 0 <= station_id < self.capacity:
+            return None
+        mm = self._mm
+        offset = HEADER_SIZE + station_id * SLOT_SIZE
+        for _ in range(8):
+            seq, length, raw = SLOT.unpack_from(mm, offset)
+            if seq & 1:
+                continue  # Yazma sürüyor
+            if SLOT.unpack_from(mm, offset)[0] != seq:
+                continue
+            if length == EMPTY:
+                # Sınırın ötesindeki slotlar hiç yazılmadı: ısınmış önbellekte istasyon yok demektir
+                if station_id >= self.high_water and self.is_warm():
+                    return MISSING
+                return None
+            if length == ABSENT:
+                return MISSING
+            return raw[:length].decode("utf-8")
+        return None
+
+    @staticmethod
+    def _encode(status: Optional[str]) -> Tuple[int, bytes]:
+        if status is None:
+            return ABSENT, b""
+        raw = status.encode("utf-8")
+        if 0 < len(raw) <= STATUS_WIDTH:
+            return len(raw), raw
+        return EMPTY, b""
+
+    def _write_slot(self, station_id: int, status: Optional[str]) -> None:
+        # Çağıran _file_lock içinde olmalıdır
+        mm = self._mm
+        if station_id >= self.high_water:
+            # Sınır slottan önce yazılır; okuyucu yeni istasyonu MISSING görmez
+            struct.pack_into("<Q", mm, HIGH_WATER_OFFSET, station_id + 1)
+        offset = HEADER_SIZE + station_id * SLOT_SIZE
+        seq = struct.unpack_from("<I", mm, offset)[0]
+        length, raw = self._encode(status)
+        struct.pack_into("<I", mm, offset, (seq + 1) & 0xFFFFFFFF)
+        struct.pack_into("<B20s", mm, offset + 4, length, raw)
+        struct.pack_into("<I", mm, offset, (seq + 2) & 0xFFFFFFFF)
+
+    def _bump_version(self) -> None:
+        struct.pack_into("<Q", self._mm, VERSION_OFFSET, self.version + 1)
+
+    def set(self, station_id: int, status: Optional[str]) -> None:
+        """
+        İstasyonun durumunu yazar (None: istasyon silindi).
+
+        Args:
+            station_id: İstasyon ID'si
+            status: Yeni durum veya None
+        """
+        in_range = 0 <= station_id < self.capacity
+        if not in_range:
+            logger.warning(f"İstasyon ID'si önbellek kapasitesini aşıyor: {station_id}")
+        with self._file_lock():
+            if in_range:
+                self._write_slot(station_id, status)
+            # Sürüm, türetilmiş önbellekler için her durumda artırılır
+            self._bump_version()
+
+    @staticmethod
+    def fingerprint(rows: Iterable[Sequence[Any]]) -> int:
+        """
+        İstasyon satırlarının parmak izini hesaplar (satır sayısı ve içerik özeti).
+
+        Args:
+            rows: ID sırasıyla istasyon satırları
+
+        Returns:
+            64 bitlik parmak izi
+        """
+        count, crc = 0, 0
+        for row in rows:
+            crc = zlib.crc32(repr(tuple(row)).encode("utf-8"), crc)
+            count += 1
+        return (count << 32) | crc
+
+    def needs_reconcile(self) -> bool:
+        """
+        Önbelleğin veritabanıyla uzlaştırılması gerekip gerekmediğini döndürür.
+
+        Returns:
+            Bu süreçte henüz uzlaştırılmadıysa veya uzlaştırma aralığı geçtiyse True
+        """
+        next_reconcile = self._next_reconcile
+        return next_reconcile is None or time.monotonic() >= next_reconcile
+
+    def reconcile(self, rows: Iterable[Tuple[int, str]], expected_version: int,
+                  fingerprint: Optional[int] = None) -> Optional[int]:
+        """
+        Önbelleği veritabanından okunan durumlarla uzlaştırır.
+
+        Yalnızca kullanılan slot sınırına ve satırlardaki en büyük ID'ye kadar
+        olan slotlar taranır ve farklı olanlar yazılır. Bir slot değiştiyse veya
+        parmak izi başlıktakinden farklıysa sürüm damgası artırılır.
+        Okuma sırasında başka bir süreç durum yazdıysa (sürüm değiştiyse)
+        eski veriyle üzerine yazmamak için uzlaştırma yapılmaz ve
+        RECONCILE_RETRY_DELAY saniye sonra yeniden denenir.
+
+        Args:
+            rows: (istasyon_id, durum) çiftleri
+            expected_version: Satırlar okunmadan önceki sürüm damgası
+            fingerprint: Satırların parmak izi (bkz. fingerprint)
+
+        Returns:
+            Düzeltilen slot sayısı; uzlaştırma yapılmadıysa None
+        """
+        statuses = dict(rows)
+        with self._file_lock():
+            if self.version != expected_version:
+                self._next_reconcile = time.monotonic() + min(RECONCILE_RETRY_DELAY, self.reconcile_interval)
+                return None
+            mm = self._mm
+            was_warm = self.is_warm()
+            changed = 0
+            limit = max(self.high_water, max((station_id + 1 for station_id in statuses
+                                              if station_id < self.capacity), default=0))
+            for station_id in range(limit):
+                _, length, raw = SLOT.unpack_from(mm, HEADER_SIZE + station_id * SLOT_SIZE)
+                expected_length, expected_raw = self._encode(statuses.get(station_id))
+                if length != expected_length or raw != expected_raw.ljust(STATUS_WIDTH, b"\0"):
+                    self._write_slot(station_id, statuses.get(station_id))
+                    changed += 1
+            stale = fingerprint is not None and struct.unpack_from("<Q", mm, FINGERPRINT_OFFSET)[0] != fingerprint
+            if fingerprint is not None:
+                struct.pack_into("<Q", mm, FINGERPRINT_OFFSET, fingerprint)
+            struct.pack_into("<I", mm, WARM_OFFSET, 1)
+            if changed or stale:
+                self._bump_version()
+            self._next_reconcile = time.monotonic() + self.reconcile_interval
+
+        if not was_warm:
+            logger.info(f"İstasyon durum önbelleği dolduruldu: {len(statuses)} istasyon")
+        elif changed or stale:
+            logger.warning(f"İstasyon durum önbelleği veritabanıyla uzlaştırıldı: {changed} slot düzeltildi")
+        return changed
+
+    def close(self) -> None:
+        """Eşlemeyi ve dosyayı kapatır"""
+        self._mm.close()
+        os.close(self._fd)
@@ -0,0 +1,171 @@
+"""
+Araç kataloğu önbellek modülü.
+
+Bu modül, neredeyse hiç değişmeyen araç kataloğunu süreç içinde değişmez
+(immutable) bir anlık görüntü olarak tutan sınıfları içerir. Katalog ilk
+erişimde yüklenir ve yalnızca sürüm artırıldığında yeniden okunur.
+Birden fazla işçi süreci varsa sürüm, süreçler arası paylaşılan bir
+sayaçtan okunur; bir işçideki güncelleme diğerlerinin de kataloğu
+yeniden yüklemesini sağlar.
+"""
+
+import logging
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class VehicleRecord(NamedTuple):
+    """Katalogdaki tek bir araç (değişmez kayıt)"""
+    id: int
+    brand: str
+    model: str
+    year: int
+    battery_capacity_kWh: float
+    charge_power_kW: float
+    latitude: Optional[float]
+    longitude: Optional[float]
+    current_soc: Optional[float]
+
+
+# Veritabanından okunacak kolonlar (VehicleRecord alan sırasıyla)
+VEHICLE_CATALOG_FIELDS = VehicleRecord._fields
+
+
+class CatalogSnapshot(NamedTuple):
+    """Belirli bir sürüme ait değişmez katalog görüntüsü"""
+    version: int
+    records: Tuple[VehicleRecord, ...]
+    by_id: Mapping[int, VehicleRecord]
+    by_key: Mapping[Tuple[str, str, int], VehicleRecord]
+
+    @classmethod
+    def build(cls, rows: Iterable[Sequence[Any]], version: int) -> "CatalogSnapshot":
+        """
+        Satırlardan indeksli bir katalog görüntüsü oluşturur.
+
+        Args:
+            rows: VEHICLE_CATALOG_FIELDS sırasıyla araç satırları
+            version: Görüntünün sürüm numarası
+
+        Returns:
+            Yeni katalog görüntüsü
+        """
+        records = tuple(VehicleRecord._make(row) for row in rows)
+        by_id = {record.id: record for record in records}
+        by_key = {}
+        for record in records:
+            # Aynı marka/model/yıl birden fazla ise ilk kayıt geçerli olur
+            by_key.setdefault((record.brand, record.model, record.year), record)
+        return cls(version, records, MappingProxyType(by_id), MappingProxyType(by_key))
+
+
+class VehicleCatalog:
+    """
+    Araç kataloğunu bellekte tutan ve sürüm değiştikçe yenileyen sınıf.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[Sequence[Any]]],
+                 version_source: Optional[Callable[[], int]] = None,
+                 version_bump: Optional[Callable[[], int]] = None):
+        """
+        VehicleCatalog sınıfını başlatır.
+
+        Args:
+            loader: Katalog satırlarını (VEHICLE_CATALOG_FIELDS sırasıyla) döndüren fonksiyon
+            version_source: Paylaşımlı sürümü döndüren fonksiyon (verilmezse sürüm süreç içinde tutulur)
+            version_bump: Paylaşımlı sürümü artırıp yeni değeri döndüren fonksiyon
+        """
+        if (version_source is None) != (version_bump is None):
+            raise ValueError("version_source ve version_bump birlikte verilmeli")
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._version = 0
+        self._version_source = version_source
+        self._version_bump = version_bump
+        self._snapshot: Optional[CatalogSnapshot] = None
+
+    @property
+    def version(self) -> int:
+        """Kataloğun hedef sürüm numarası"""
+        if self._version_source is not None:
+            return self._version_source()
+        return self._version
+
+    def bump_version(self) -> int:
+        """
+        Katalog sürümünü artırır; bir sonraki erişimde katalog yeniden yüklenir.
+
+        Returns:
+            Yeni sürüm numarası
+        """
+        if self._version_bump is not None:
+            return self._version_bump()
+        with self._lock:
+            self._version += 1
+            return self._version
+
+    def snapshot(self) -> CatalogSnapshot:
+        """
+        Güncel katalog görüntüsünü döndürür, gerekirse yeniden yükler.
+
+        Returns:
+            Değişmez katalog görüntüsü
+        """
+        version = self.version
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version:
+                snapshot = CatalogSnapshot.build(self._loader(), version)
+                self._snapshot = snapshot
+                logger.info(f"Araç kataloğu yüklendi: {len(snapshot.records)} araç (sürüm {snapshot.version})")
+            return snapshot
+
+    def get(self, vehicle_id) -> Optional[VehicleRecord]:
+        """
+        ID ile araç kaydını döndürür.
+
+        Args:
+            vehicle_id: Araç ID'si (int veya sayısal string)
+
+        Returns:
+            Araç kaydı veya None (bulunamazsa)
+        """
+        try:
+            vehicle_id = int(vehicle_id)
+        except (TypeError, ValueError):
+            return None
+        return self.snapshot().by_id.get(vehicle_id)
+
+    def find(self, brand: str, model: str, year) -> Optional[VehicleRecord]:
+        """
+        Marka, model ve yıl ile araç kaydını döndürür.
+
+        Args:
+            brand: Araç markası
+            model: Araç modeli
+            year: Model yılı
+
+        Returns:
+            Araç kaydı veya None (bulunamazsa)
+        """
+        try:
+            year = int(year)
+        except (TypeError, ValueError):
+            return None
+        return self.snapshot().by_key.get((brand, model, year))
+
+    def all(self) -> Tuple[VehicleRecord, ...]:
+        """
+        Katalogdaki tüm araçları döndürür.
+
+        Returns:
+            Araç kayıtlarının değişmez listesi
+        """
+        return self.snapshot().records
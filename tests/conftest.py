@@ -0,0 +1,31 @@
+"""
+Testler için ortak fixture'lar.
+
+Uygulama modülü içe aktarılırken veritabanı ve önbellek dosyalarını
+instance klasöründe açtığından, içe aktarmadan önce geçici bir instance
+klasörü verilir; gerçek instance/users.db hiç açılmaz.
+"""
+
+import importlib
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def voltrix(tmp_path_factory):
+    """Geçici SQLite veritabanıyla hazırlanmış uygulama modülü"""
+    os.environ["VOLTRIX_INSTANCE_PATH"] = str(tmp_path_factory.mktemp("instance"))
+    os.environ["VOLTRIX_AUTOMATA_WATCH_INTERVAL"] = "0"
+
+    module = importlib.import_module("app")
+    with module.app.app_context():
+        module.db.create_all()
+        module.upgrade_schema()
+        module.seed_vehicles()
+    return module
+
+
+@pytest.fixture
+def client(voltrix):
+    return voltrix.app.test_client()
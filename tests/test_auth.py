@@ -0,0 +1,56 @@
+"""Giriş ve oturum jetonu testleri."""
+
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def account(client):
+    """Kayıtlı bir kullanıcı ve girişte aldığı oturum jetonu"""
+    email = f"{uuid.uuid4().hex}@example.com"
+    assert client.post('/register', json={"name": "Test", "email": email, "password": "gizli"}).status_code == 201
+    response = client.post('/login', json={"email": email, "password": "gizli"})
+    assert response.status_code == 200
+    body = response.get_json()
+    return {"email": email, "user_id": body["user_id"], "token": body["token"]}
+
+
+def test_login_requires_credentials_even_with_token(client, account):
+    headers = {"Authorization": f"Bearer {account['token']}"}
+
+    wrong_password = client.post('/login', json={"email": account["email"], "password": "yanlış"}, headers=headers)
+    assert wrong_password.status_code == 401
+
+    other_email = client.post('/login', json={"email": "yok@example.com", "password": "gizli"}, headers=headers)
+    assert other_email.status_code == 401
+
+
+def test_token_identifies_user_on_user_routes(client, account):
+    headers = {"Authorization": f"Bearer {account['token']}"}
+
+    response = client.get('/reservations/active', headers=headers)
+    assert response.status_code == 200
+
+    mismatch = client.get(f"/reservations/active?user_id={account['user_id'] + 1}", headers=headers)
+    assert mismatch.status_code == 403
+
+    invalid = client.get('/reservations/active', headers={"Authorization": "Bearer bozuk"})
+    assert invalid.status_code == 401
+
+
+def test_user_vehicle_is_added_for_token_user(voltrix, client, account):
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    vehicle = {"vehicle_id": 1, "brand": "Tesla", "model": "Model 3", "year": 2022,
+               "battery_capacity_kWh": 82, "charge_power_kW": 250}
+
+    assert client.post('/user-vehicles', json=vehicle, headers=headers).status_code == 201
+
+    listed = client.get('/user-vehicles', headers=headers).get_json()
+    assert [(item["brand"], item["model"]) for item in listed] == [("Tesla", "Model 3")]
+
+    with voltrix.app.app_context():
+        vehicle_id = voltrix.UserVehicle.query.filter_by(user_id=account["user_id"]).first().id
+    other = {"Authorization": f"Bearer {voltrix.session_tokens.issue(account['user_id'] + 1)}"}
+    assert client.delete(f'/user-vehicles/{vehicle_id}', headers=other).status_code == 403
+    assert client.delete(f'/user-vehicles/{vehicle_id}', headers=headers).status_code == 200
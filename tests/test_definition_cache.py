@@ -0,0 +1,24 @@
+import logging
+import os
+
+from automata.automata_loader import AutomataLoader
+
+XML_PATH = os.path.join("automata", "dfa", "charge_station_dfa.xml")
+
+
+def test_cached_load_restores_report_without_reanalysis(tmp_path, caplog):
+    cache_path = str(tmp_path / "automata_definitions.cache")
+    first = AutomataLoader(cache_path=cache_path, minimize=True)
+    parsed = first.load_automata(XML_PATH)
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="automata.automata_loader"):
+        second = AutomataLoader(cache_path=cache_path, minimize=True)
+        cached = second.load_automata(XML_PATH)
+
+    assert second.definition_cache.hits == 1
+    assert second.definition_cache.misses == 0
+    assert not caplog.records
+    assert cached == parsed
+    automata_id = parsed["id"]
+    assert second.reports[automata_id].as_dict() == first.reports[automata_id].as_dict()
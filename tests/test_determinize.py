@@ -0,0 +1,81 @@
+"""NFA -> DFA dönüştürme (alt küme yapısı) testleri."""
+
+import pytest
+
+from automata.compiled import CompiledAutomata
+from automata.determinize import determinize, find_counterexample
+
+
+def _nfa(states, transitions, initial):
+    return {
+        "id": "test_nfa",
+        "name": "Test NFA",
+        "type": "nfa",
+        "initial_state": initial,
+        "states": {state_id: {"id": state_id, "name": state_id, "initial": state_id == initial}
+                   for state_id in states},
+        "transitions": [dict(zip(("from", "event", "to"), transition)) for transition in transitions],
+    }
+
+
+def _nth_from_last_nfa(n):
+    """
+    "Sondan n. olay A" dilinin NFA'sı: START --ε--> Q0, Q0 her olayda kendine
+    döner ve A ile Q1'e de geçebilir (tahmin), Qi her olayla Qi+1'e ilerler.
+
+    Bu NFA n + 2 durumludur; DFA'da son n olayın her bileşimi ayrı bir durumdur
+    (2^n durum) ve epsilon kapanışı nedeniyle başlangıç kümesi de ayrıdır.
+    """
+    states = ["START"] + [f"Q{i}" for i in range(n + 1)]
+    transitions = [("START", None, "Q0"), ("Q0", "A", "Q0"), ("Q0", "B", "Q0"), ("Q0", "A", "Q1")]
+    for i in range(1, n):
+        transitions += [(f"Q{i}", "A", f"Q{i + 1}"), (f"Q{i}", "B", f"Q{i + 1}")]
+    return _nfa(states, transitions, "START")
+
+
+@pytest.mark.parametrize("n", [1, 3, 5])
+def test_subset_construction_blow_up_is_language_equivalent(n):
+    nfa = _nth_from_last_nfa(n)
+    dfa = determinize(nfa)
+
+    assert dfa["type"] == "dfa"
+    assert len(dfa["states"]) == 2 ** n + 1
+    assert dfa["state_sets"][dfa["initial_state"]] == ("START", "Q0")
+    assert find_counterexample(nfa, dfa) is None
+
+    # Her (durum, olay) için en fazla bir geçiş
+    moves = [(transition["from"], transition["event"]) for transition in dfa["transitions"]]
+    assert len(moves) == len(set(moves))
+
+
+def test_epsilon_chain_is_followed_after_each_move():
+    nfa = _nfa(
+        ["S", "A", "B", "C", "D"],
+        [("S", "GO", "A"), ("S", "GO", "B"), ("A", None, "C"), ("C", None, "D"),
+         ("B", "STOP", "S"), ("D", "STOP", "S"), ("D", "NEXT", "D")],
+        "S")
+    dfa = determinize(nfa)
+
+    target = next(t["to"] for t in dfa["transitions"] if t["from"] == "S" and t["event"] == "GO")
+    assert set(dfa["state_sets"][target]) == {"A", "B", "C", "D"}
+    assert find_counterexample(nfa, dfa) is None
+
+
+def test_counterexample_reports_shortest_divergence():
+    nfa = _nth_from_last_nfa(3)
+    dfa = determinize(nfa)
+
+    # Başlangıçtan B ile gidilen durumun geçişini bozarak diller ayrıştırılır
+    start = dfa["initial_state"]
+    after_b = next(t["to"] for t in dfa["transitions"] if t["from"] == start and t["event"] == "B")
+    dfa["transitions"] = [t for t in dfa["transitions"] if not (t["from"] == after_b and t["event"] == "A")]
+
+    assert find_counterexample(nfa, dfa) == ["B", "A"]
+
+
+def test_compiled_nfa_reports_original_states():
+    nfa = _nth_from_last_nfa(2)
+    compiled = CompiledAutomata(nfa)
+
+    assert len(compiled.states) == 5
+    assert compiled.state_set(compiled.initial_states[0]) == ("START", "Q0")
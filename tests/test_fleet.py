@@ -0,0 +1,96 @@
+"""Dizi tabanlı filo otomatasının örnek başına AutomataEngine ile karşılaştırma testleri."""
+
+import os
+import random
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from automata.analysis import referenced_handlers
+from automata.automata_loader import AutomataLoader
+from automata.compiled import CompiledAutomata
+from automata.engine import AutomataEngine
+from automata.fleet import FleetAutomata
+
+XML_PATH = os.path.join("automata", "dfa", "charge_station_dfa.xml")
+SIZE = 40
+
+
+@pytest.fixture(scope="module")
+def definition():
+    return AutomataLoader().load_automata(XML_PATH)
+
+
+def _reference_apply(engines, event, selected):
+    """Olayı seçili motorlara tek tek uygular; geçiş yapan indeksleri döndürür"""
+    moved = []
+    for index in sorted(set(selected)):
+        engine = engines[index]
+        transitions = engine.compiled.transitions_for(engine.get_current_state(), event)
+        if transitions:
+            assert engine._apply_transition(transitions[0], {"index": index})
+            moved.append(index)
+    return moved
+
+
+def test_apply_matches_per_instance_engines(definition):
+    compiled = CompiledAutomata(definition)
+    fleet = FleetAutomata(compiled, SIZE)
+    engines = [AutomataEngine(definition, history_size=16) for _ in range(SIZE)]
+
+    fleet_calls, engine_calls = [], []
+    for action in referenced_handlers(definition)[0]:
+        fleet.register_action_handler(
+            action, lambda indices, context, action=action: fleet_calls.append((action, indices.tolist())))
+        for engine in engines:
+            engine.register_action_handler(
+                action, lambda context, action=action: engine_calls.append((action, context["index"])))
+
+    rng = random.Random(46)
+    total_moved = total_calls = 0
+    for step in range(300):
+        event = rng.choice(compiled.events)
+        kind = step % 3
+        if kind == 0:
+            selection, selected = None, range(SIZE)
+        elif kind == 1:
+            # Tekrarlanan indeksler her örneğe bir kez uygulanmalı
+            selected = [rng.randrange(SIZE) for _ in range(SIZE // 2)]
+            selection = np.array(selected + selected[:5])
+        else:
+            mask = np.array([rng.random() < 0.5 for _ in range(SIZE)])
+            selection, selected = mask, np.flatnonzero(mask).tolist()
+
+        fleet_calls.clear()
+        engine_calls.clear()
+        moved = fleet.apply(event, selection)
+        expected = _reference_apply(engines, event, selected)
+
+        assert moved.tolist() == expected
+        total_moved += len(expected)
+        total_calls += len(engine_calls)
+        assert [fleet.state_of(index) for index in range(SIZE)] == [engine.get_current_state() for engine in engines]
+        assert fleet.counts() == {state_id: Counter(engine.get_current_state() for engine in engines)[state_id]
+                                  for state_id in compiled.states}
+        assert Counter((action, index) for action, indices in fleet_calls for index in indices) == \
+            Counter(engine_calls)
+        for _, indices in fleet_calls:
+            assert indices == sorted(set(indices))
+
+    assert total_moved > SIZE and total_calls > SIZE  # Karşılaştırma boş geçmedi
+
+
+def test_resize_keeps_existing_states(definition):
+    fleet = FleetAutomata(CompiledAutomata(definition), 4)
+    initial = fleet.state_of(0)
+    other = next(state_id for state_id in fleet.state_names if state_id != initial)
+    fleet.set_states([1, 3], other)
+
+    fleet.resize(6)
+    assert [fleet.state_of(index) for index in range(6)] == [initial, other, initial, other, initial, initial]
+
+    fleet.resize(2)
+    assert len(fleet) == 2
+    assert fleet.counts()[other] == 1
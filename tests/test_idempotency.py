@@ -0,0 +1,81 @@
+"""Idempotency-Key başlıklı POST isteklerinin testleri."""
+
+import time
+import uuid
+
+import pytest
+
+from services.idempotency import PENDING_STATUS
+
+
+@pytest.fixture
+def reservation_request(voltrix):
+    """Müsait bir istasyon için rezervasyon gövdesi; istasyon testten sonra silinir"""
+    with voltrix.app.app_context():
+        station = voltrix.ChargingStation(name="Idempotency İstasyonu", latitude=0.0, longitude=0.0,
+                                          status='available')
+        voltrix.db.session.add(station)
+        voltrix.db.session.commit()
+        station_id = station.id
+        voltrix.apply_station_status_change(station_id, None, 'available')
+        vehicle_id = voltrix.vehicle_catalog.all()[0].id
+
+    yield {
+        "user_id": 7,
+        "station_id": station_id,
+        "vehicle_id": vehicle_id,
+        "current_battery_percent": 20,
+        "target_battery_percent": 21
+    }
+
+    with voltrix.app.app_context():
+        voltrix.Reservation.query.filter_by(station_id=station_id).delete()
+        station = voltrix.ChargingStation.query.get(station_id)
+        old_status = station.status
+        voltrix.db.session.delete(station)
+        voltrix.db.session.commit()
+        voltrix.apply_station_status_change(station_id, old_status, None)
+
+
+def _reservation_count(voltrix, station_id):
+    with voltrix.app.app_context():
+        return voltrix.Reservation.query.filter_by(station_id=station_id).count()
+
+
+def test_retry_on_another_worker_replays_stored_response(voltrix, client, reservation_request):
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    first = client.post('/reservations', json=reservation_request, headers=headers)
+    assert first.status_code == 201
+
+    # Başka bir işçinin belleğinde kayıt yoktur; yanıt veritabanından gelmelidir
+    voltrix.idempotency_store._entries.clear()
+    retry = client.post('/reservations', json=reservation_request, headers=headers)
+
+    assert retry.status_code == 201
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json() == first.get_json()
+    assert _reservation_count(voltrix, reservation_request["station_id"]) == 1
+
+
+def test_key_claimed_by_another_worker_is_not_processed_twice(voltrix, client, reservation_request):
+    key = uuid.uuid4().hex
+    with voltrix.app.test_request_context('/reservations', method='POST', json=reservation_request):
+        request_hash = voltrix._request_fingerprint()
+    # Aynı istek başka bir işçide işleniyor: anahtar veritabanında sahiplenilmiş
+    with voltrix.app.app_context():
+        assert voltrix._claim_idempotency_key(f"reservations:{key}", voltrix.StoredResponse(
+            PENDING_STATUS, b"", "", time.time() + 60, request_hash))
+
+    response = client.post('/reservations', json=reservation_request, headers={"Idempotency-Key": key})
+    assert response.status_code == 409
+    assert _reservation_count(voltrix, reservation_request["station_id"]) == 0
+
+
+def test_key_reused_with_different_body_is_rejected(voltrix, client, reservation_request):
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    assert client.post('/reservations', json=reservation_request, headers=headers).status_code == 201
+
+    changed = dict(reservation_request, target_battery_percent=90)
+    response = client.post('/reservations', json=changed, headers=headers)
+    assert response.status_code == 422
+    assert _reservation_count(voltrix, reservation_request["station_id"]) == 1
@@ -0,0 +1,59 @@
+"""İzokron önbelleğinin istasyon durumu değişikliklerinden etkilenmediğinin testleri."""
+
+import pytest
+
+
+@pytest.fixture
+def station_id(voltrix):
+    """Testten sonra silinen, müsait durumda bir istasyon"""
+    with voltrix.app.app_context():
+        station = voltrix.ChargingStation(name="İzokron Testi İstasyonu", latitude=41.0, longitude=29.0,
+                                          status='available')
+        voltrix.db.session.add(station)
+        voltrix.db.session.commit()
+        station_id = station.id
+        voltrix.apply_station_status_change(station_id, None, 'available')
+
+    yield station_id
+
+    with voltrix.app.app_context():
+        station = voltrix.ChargingStation.query.get(station_id)
+        old_status = station.status
+        voltrix.db.session.delete(station)
+        voltrix.db.session.commit()
+        voltrix.apply_station_status_change(station_id, old_status, None)
+
+
+def _isochrone_cache(voltrix):
+    with voltrix.app.app_context():
+        arrays = voltrix.get_station_arrays()
+        return arrays, voltrix.get_isochrone_cache(arrays)
+
+
+def test_cached_isochrone_survives_status_change(voltrix, client, station_id):
+    arrays, cache = _isochrone_cache(voltrix)
+    isochrone = cache.get("model", 5.0, 50, 41.0, 29.0)
+    assert station_id in isochrone.sure
+
+    response = client.put(f'/stations/{station_id}/status', json={"status": "unavailable"})
+    assert response.status_code == 200
+
+    new_arrays, new_cache = _isochrone_cache(voltrix)
+    assert new_arrays.version != arrays.version
+    assert new_cache is cache
+    hits = cache.hits
+    assert new_cache.get("model", 5.0, 50, 41.0, 29.0) is isochrone
+    assert cache.hits == hits + 1
+
+
+def test_moved_station_rebuilds_isochrones(voltrix, client, station_id):
+    arrays, cache = _isochrone_cache(voltrix)
+
+    with voltrix.app.app_context():
+        voltrix.ChargingStation.query.get(station_id).latitude = 41.5
+        voltrix.db.session.commit()
+    assert client.put(f'/stations/{station_id}/status', json={"status": "unavailable"}).status_code == 200
+
+    new_arrays, new_cache = _isochrone_cache(voltrix)
+    assert new_arrays.positions_key != arrays.positions_key
+    assert new_cache is not cache
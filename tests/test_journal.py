@@ -0,0 +1,145 @@
+import glob
+import os
+import subprocess
+import sys
+
+import pytest
+
+from automata.journal import AutomataJournal, JournalLockedError, fcntl
+
+needs_fcntl = pytest.mark.skipif(fcntl is None, reason="fcntl yok; süreçler arası kilit alınmaz")
+
+# Kayıtları yazar, diske yazılmasını bekler ve kapanmadan (anlık görüntü almadan) çöker
+CRASHING_WRITER = """
+import os, sys
+from automata.journal import AutomataJournal
+journal = AutomataJournal(sys.argv[1], "station", snapshot_every=int(sys.argv[2]), fsync=False)
+for index in range(10):
+    journal.record(f"s{index % 3}", "A", "B" if index % 2 else "C", "GO")
+journal.end("s2")
+journal.flush(timeout=10)
+os._exit(0)
+"""
+
+
+def _crash_after_writing(directory, snapshot_every=1000):
+    result = subprocess.run([sys.executable, "-c", CRASHING_WRITER, str(directory), str(snapshot_every)],
+                            timeout=60)
+    assert result.returncode == 0
+
+
+def _segments(directory):
+    return sorted(glob.glob(os.path.join(str(directory), "station.*.log")))
+
+
+def test_recovery_replays_log_after_crash_and_drops_torn_tail(tmp_path):
+    _crash_after_writing(tmp_path)
+    segment = _segments(tmp_path)[-1]
+    valid_size = os.path.getsize(segment)
+    with open(segment, "ab") as torn:
+        torn.write(b"\x20\x00\x00\x00\xde\xad\xbe\xef" + "yarım çerçeve".encode("utf-8"))
+
+    journal = AutomataJournal(str(tmp_path), "station", fsync=False)
+    try:
+        # s0: 0,3,6,9 -> son kayıt 9 (B); s1: 1,4,7 -> 7 (B); s2 end() ile kapandı
+        assert journal.sessions() == {"s0": "B", "s1": "B"}
+        assert journal.recovered_entries == 11
+        assert os.path.getsize(segment) == valid_size
+    finally:
+        journal.close(snapshot=False)
+
+
+def test_recovery_drops_frame_with_bad_crc(tmp_path):
+    journal = AutomataJournal(str(tmp_path), "station", fsync=False)
+    journal.record("s0", "A", "B", "GO")
+    journal.flush(timeout=10)
+    segment = _segments(tmp_path)[-1]
+    valid_size = os.path.getsize(segment)
+    journal.record("s1", "A", "C", "GO")
+    journal.flush(timeout=10)
+    journal.close(snapshot=False)
+
+    # Son çerçevenin son baytı bozulur; CRC tutmaz
+    with open(segment, "r+b") as corrupt:
+        corrupt.seek(-1, os.SEEK_END)
+        last = corrupt.read(1)
+        corrupt.seek(-1, os.SEEK_END)
+        corrupt.write(bytes([last[0] ^ 0xFF]))
+
+    recovered = AutomataJournal(str(tmp_path), "station", fsync=False)
+    try:
+        assert recovered.sessions() == {"s0": "B"}
+        assert recovered.recovered_entries == 1
+        assert os.path.getsize(segment) == valid_size
+    finally:
+        recovered.close(snapshot=False)
+
+
+def test_recovery_uses_snapshot_plus_log_tail(tmp_path):
+    journal = AutomataJournal(str(tmp_path), "station", snapshot_every=4, fsync=False)
+    for index in range(4):
+        journal.record("s0", "A", f"S{index}", "GO")
+        journal.flush(timeout=10)
+    assert os.path.exists(journal.snapshot_path)
+    # Anlık görüntüden sonra yalnızca güncel parça kalır
+    assert len(_segments(tmp_path)) == 1
+    journal.record("s1", "A", "B", "GO")
+    journal.flush(timeout=10)
+    journal.close(snapshot=False)
+
+    recovered = AutomataJournal(str(tmp_path), "station", fsync=False)
+    try:
+        assert recovered.sessions() == {"s0": "S3", "s1": "B"}
+        assert recovered.recovered_entries == 1  # Yalnızca anlık görüntü sonrası kuyruk oynatıldı
+    finally:
+        recovered.close()
+
+
+def test_snapshot_removes_old_segments_and_ended_sessions(tmp_path):
+    journal = AutomataJournal(str(tmp_path), "station", fsync=False)
+    journal.record("s0", "A", "B", "GO")
+    journal.record("s1", "A", "C", "GO")
+    journal.end("s0")
+    assert journal.state_of("s0") is None
+    journal.close()  # Düzgün kapanışta anlık görüntü alınır
+
+    recovered = AutomataJournal(str(tmp_path), "station", fsync=False)
+    try:
+        assert recovered.sessions() == {"s1": "C"}
+        assert recovered.recovered_entries == 0
+        assert len(_segments(tmp_path)) == 1
+    finally:
+        recovered.close()
+
+
+@needs_fcntl
+def test_second_writer_is_rejected_until_close(tmp_path):
+    journal = AutomataJournal(str(tmp_path), "station", fsync=False)
+    try:
+        with pytest.raises(JournalLockedError):
+            AutomataJournal(str(tmp_path), "station", fsync=False)
+        journal.record("s1", "A", "B", "GO")
+    finally:
+        journal.close()
+
+    reopened = AutomataJournal(str(tmp_path), "station", fsync=False)
+    try:
+        assert reopened.state_of("s1") == "B"
+    finally:
+        reopened.close()
+
+
+@needs_fcntl
+def test_writer_in_another_process_is_rejected(tmp_path):
+    journal = AutomataJournal(str(tmp_path), "station", fsync=False)
+    script = ("import sys\n"
+              "from automata.journal import AutomataJournal, JournalLockedError\n"
+              "try:\n"
+              "    AutomataJournal(sys.argv[1], 'station', fsync=False)\n"
+              "except JournalLockedError:\n"
+              "    sys.exit(3)\n")
+    try:
+        result = subprocess.run([sys.executable, "-c", script, str(tmp_path)], timeout=60)
+    finally:
+        journal.close()
+    assert result.returncode == 3
@@ -0,0 +1,87 @@
+"""Aynı istasyona eşzamanlı rezervasyon isteklerinin testleri."""
+
+import threading
+
+import pytest
+
+
+class _DaemonTimer(threading.Timer):
+    """İstasyonu serbest bırakan zamanlayıcılar test sürecini açık tutmasın"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.daemon = True
+
+
+@pytest.fixture
+def station_id(voltrix):
+    """Testten sonra silinen, müsait durumda bir istasyon"""
+    with voltrix.app.app_context():
+        station = voltrix.ChargingStation(name="Stres Testi İstasyonu", latitude=0.0, longitude=0.0,
+                                          status='available')
+        voltrix.db.session.add(station)
+        voltrix.db.session.commit()
+        station_id = station.id
+        voltrix.apply_station_status_change(station_id, None, 'available')
+
+    yield station_id
+
+    with voltrix.app.app_context():
+        voltrix.Reservation.query.filter_by(station_id=station_id).delete()
+        station = voltrix.ChargingStation.query.get(station_id)
+        old_status = station.status
+        voltrix.db.session.delete(station)
+        voltrix.db.session.commit()
+        voltrix.apply_station_status_change(station_id, old_status, None)
+
+
+def test_concurrent_reservations_book_station_once(voltrix, station_id, monkeypatch):
+    monkeypatch.setattr(threading, "Timer", _DaemonTimer)
+    with voltrix.app.app_context():
+        vehicle_id = voltrix.vehicle_catalog.all()[0].id
+
+    attempts = 200
+    barrier = threading.Barrier(attempts)
+    status_codes = []
+
+    def reserve():
+        client = voltrix.app.test_client()
+        barrier.wait()
+        response = client.post('/reservations', json={
+            "user_id": 0,
+            "station_id": station_id,
+            "vehicle_id": vehicle_id,
+            "current_battery_percent": 20,
+            "target_battery_percent": 21
+        })
+        status_codes.append(response.status_code)
+
+    threads = [threading.Thread(target=reserve) for _ in range(attempts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert status_codes.count(201) == 1
+    assert status_codes.count(409) == attempts - 1
+
+    with voltrix.app.app_context():
+        assert voltrix.Reservation.query.filter_by(station_id=station_id).count() == 1
+        assert voltrix.ChargingStation.query.get(station_id).status == 'Reserved'
+
+
+def test_reservation_conflicts_when_station_is_not_available(voltrix, station_id, client):
+    with voltrix.app.app_context():
+        station = voltrix.ChargingStation.query.get(station_id)
+        voltrix.set_station_status(station, 'faulted')
+        voltrix.db.session.commit()
+        vehicle_id = voltrix.vehicle_catalog.all()[0].id
+
+    response = client.post('/reservations', json={
+        "user_id": 0,
+        "station_id": station_id,
+        "vehicle_id": vehicle_id,
+        "current_battery_percent": 20,
+        "target_battery_percent": 21
+    })
+    assert response.status_code == 409
@@ -0,0 +1,46 @@
+"""Paylaşımlı istasyon durum önbelleğinin uzlaştırma testleri."""
+
+import time
+
+import pytest
+
+from services import station_status_cache as status_cache_module
+from services.station_status_cache import MISSING, StationStatusCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = StationStatusCache(str(tmp_path / "station_status.cache"), reconcile_interval=60.0)
+    yield cache
+    cache.close()
+
+
+def test_reconcile_scans_only_used_slots(cache):
+    rows = [(1, 'available'), (2, 'reserved'), (5, 'faulted')]
+    assert cache.reconcile(rows, cache.version) == 6  # 0..5: üç istasyon, üç boş slot
+    assert cache.high_water == 6
+    assert cache.get(2) == 'reserved'
+    assert cache.get(3) is MISSING
+    assert cache.get(40000) is MISSING
+    assert not cache.needs_reconcile()
+
+    assert cache.reconcile(rows, cache.version) == 0
+
+    cache.set(900, 'available')
+    assert cache.high_water == 901
+    assert cache.get(900) == 'available'
+    assert cache.get(899) is None  # Sınırın içinde ama henüz uzlaştırılmadı
+    assert cache.reconcile(rows, cache.version) == 895  # 6..899 istasyon yok, 900 silindi
+    assert cache.get(899) is MISSING
+    assert cache.get(900) is MISSING
+
+
+def test_version_conflict_delays_next_attempt(cache, monkeypatch):
+    monkeypatch.setattr(status_cache_module, "RECONCILE_RETRY_DELAY", 0.05)
+    stale_version = cache.version
+    cache.set(1, 'available')
+
+    assert cache.reconcile([(1, 'available')], stale_version) is None
+    assert not cache.needs_reconcile()
+    time.sleep(0.06)
+    assert cache.needs_reconcile()